@@ -0,0 +1,143 @@
+"""
+Compara os últimos comentários de várias tarefas buscados tarefa a tarefa
+(`GET /api/tarefas/<id>/comentarios/`, como um quadro fazia) com a busca em
+lote (`GET /api/tarefas/comentarios/?ids=...`).
+
+Uso, a partir de backend/:
+
+    python benchmarks/comentarios_recentes.py [--tarefas 50] [--comentarios 200]
+        [--limite 5] [--repeticoes 5]
+
+Os dados são criados dentro de uma transação desfeita ao final, então pode
+rodar contra o banco configurado sem deixar dados para trás. Sem rede: mede
+o custo do Django, das views e do banco.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pontetech.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.test import Client  # noqa: E402
+from rest_framework_simplejwt.tokens import AccessToken  # noqa: E402
+
+from tarefas.models import Comentario, Tarefa  # noqa: E402
+
+
+class Desfazer(Exception):
+    pass
+
+
+def medir(nome, funcao, repeticoes):
+    # Cada requisição limpa o log de consultas; contamos na execução
+    consultas = []
+
+    def contar(execute, sql, params, many, context):
+        consultas.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(contar):
+        resultado = funcao()
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    melhor = min(tempos)
+    print(
+        f"{nome:<12} {melhor * 1000:9.1f} ms  {len(consultas):5d} consultas"
+        f"  {resultado[0]:4d} requisições"
+    )
+    return melhor, resultado[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tarefas", type=int, default=50)
+    parser.add_argument("--comentarios", type=int, default=200)
+    parser.add_argument("--limite", type=int, default=5)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    try:
+        with transaction.atomic():
+            usuario = User.objects.create_user(username="benchmark-comentarios")
+            tarefas = Tarefa.objects.bulk_create(
+                [
+                    Tarefa(
+                        usuario=usuario,
+                        titulo=f"Tarefa {i}",
+                        descricao="Descrição usada no benchmark de comentários.",
+                    )
+                    for i in range(args.tarefas)
+                ]
+            )
+            if tarefas[0].pk is None:
+                tarefas = list(Tarefa.objects.filter(usuario=usuario))
+            Comentario.objects.bulk_create(
+                [
+                    Comentario(
+                        tarefa=tarefa,
+                        usuario=usuario,
+                        texto=f"Comentário {i} do benchmark.",
+                    )
+                    for tarefa in tarefas
+                    for i in range(args.comentarios)
+                ],
+                batch_size=1000,
+            )
+
+            cliente = Client(
+                headers={"Authorization": f"Bearer {AccessToken.for_user(usuario)}"}
+            )
+            # Menor tamanho de página aceito que cobre o limite (máximo 20)
+            page_size = next(t for t in (5, 10, 50) if t >= args.limite)
+
+            def por_tarefa():
+                resultado = {}
+                for tarefa in tarefas:
+                    response = cliente.get(
+                        f"/api/tarefas/{tarefa.pk}/comentarios/",
+                        {"page_size": page_size},
+                    )
+                    assert response.status_code == 200, response.status_code
+                    resultado[str(tarefa.pk)] = response.json()["results"][
+                        : args.limite
+                    ]
+                return len(tarefas), resultado
+
+            def em_lote():
+                response = cliente.get(
+                    "/api/tarefas/comentarios/",
+                    {
+                        "ids": ",".join(str(tarefa.pk) for tarefa in tarefas),
+                        "limite": args.limite,
+                    },
+                )
+                assert response.status_code == 200, response.status_code
+                return 1, response.json()
+
+            print(
+                f"{args.tarefas} tarefas x {args.comentarios} comentários, "
+                f"últimos {args.limite} de cada"
+            )
+            individual, esperado = medir("por tarefa", por_tarefa, args.repeticoes)
+            lote, obtido = medir("em lote", em_lote, args.repeticoes)
+            assert obtido == esperado, "respostas diferentes"
+            print(f"em lote: {individual / lote:.1f}x mais rápido")
+            raise Desfazer()
+    except Desfazer:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Compara a vazão de requisições concorrentes aos endpoints de leitura
+(listagem, dashboard, /me) servidos pelo handler WSGI e pelo ASGI do Django.
+
+Uso, a partir de backend/:
+
+    python benchmarks/concorrencia_asgi.py [--requisicoes 400] [--concorrencia 20]
+
+WSGI: um pool de `--concorrencia` threads, como um servidor com threads.
+ASGI: `--concorrencia` requisições simultâneas em um único event loop, como
+o uvicorn/daphne. Sem rede: mede o custo do Django, das views e do banco.
+
+Como cada thread usa sua própria conexão, os dados precisam estar
+confirmados: o usuário e as tarefas do benchmark são criados no banco
+configurado e removidos ao final. Use um banco real (MySQL ou SQLite em
+arquivo); o SQLite em memória não é compartilhado entre conexões.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pontetech.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connections  # noqa: E402
+from django.test import AsyncClient, Client  # noqa: E402
+from rest_framework_simplejwt.tokens import AccessToken  # noqa: E402
+
+from tarefas.contadores import reconstruir_contadores  # noqa: E402
+from tarefas.models import Tarefa, UsuarioPerfil  # noqa: E402
+
+URLS = ("/api/tarefas/", "/api/dashboard/", "/api/auth/me/")
+
+
+def resumo(nome, total, tempos):
+    tempos = sorted(tempos)
+    p95 = tempos[int(len(tempos) * 0.95) - 1]
+    print(
+        f"{nome:<6} {len(tempos) / total:9.0f} req/s"
+        f"  p50 {statistics.median(tempos) * 1000:7.1f} ms"
+        f"  p95 {p95 * 1000:7.1f} ms"
+    )
+    return len(tempos) / total
+
+
+def medir_wsgi(url, headers, requisicoes, concorrencia):
+    local = threading.local()
+
+    def requisitar(_):
+        if not hasattr(local, "cliente"):
+            local.cliente = Client(headers=headers)
+        inicio = time.perf_counter()
+        response = local.cliente.get(url)
+        assert response.status_code == 200, response.status_code
+        return time.perf_counter() - inicio
+
+    with ThreadPoolExecutor(concorrencia) as pool:
+        inicio = time.perf_counter()
+        tempos = list(pool.map(requisitar, range(requisicoes)))
+        total = time.perf_counter() - inicio
+    return total, tempos
+
+
+async def medir_asgi(url, headers, requisicoes, concorrencia):
+    cliente = AsyncClient()
+    limite = asyncio.Semaphore(concorrencia)
+
+    async def requisitar():
+        async with limite:
+            inicio = time.perf_counter()
+            response = await cliente.get(url, headers=headers)
+            assert response.status_code == 200, response.status_code
+            return time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    tempos = await asyncio.gather(*(requisitar() for _ in range(requisicoes)))
+    return time.perf_counter() - inicio, tempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requisicoes", type=int, default=400)
+    parser.add_argument("--concorrencia", type=int, default=20)
+    parser.add_argument("--tarefas", type=int, default=200)
+    args = parser.parse_args()
+
+    usuario = User.objects.create_user(username=f"benchmark-{uuid.uuid4().hex}")
+    try:
+        UsuarioPerfil.objects.create(user=usuario, nome="Benchmark")
+        Tarefa.objects.bulk_create(
+            [
+                Tarefa(
+                    usuario=usuario,
+                    titulo=f"Tarefa {i}",
+                    descricao="Descrição usada no benchmark de concorrência.",
+                )
+                for i in range(args.tarefas)
+            ],
+            batch_size=1000,
+        )
+        reconstruir_contadores()
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(usuario)}"}
+        connections.close_all()
+
+        for url in URLS:
+            print(f"{url} ({args.requisicoes} req, concorrência {args.concorrencia})")
+            wsgi = resumo(
+                "WSGI",
+                *medir_wsgi(url, headers, args.requisicoes, args.concorrencia),
+            )
+            asgi = resumo(
+                "ASGI",
+                *asyncio.run(
+                    medir_asgi(url, headers, args.requisicoes, args.concorrencia)
+                ),
+            )
+            print(f"ASGI/WSGI: {asgi / wsgi:.2f}x\n")
+    finally:
+        usuario.delete()
+
+
+if __name__ == "__main__":
+    main()
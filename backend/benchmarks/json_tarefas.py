@@ -0,0 +1,120 @@
+"""
+Compara o renderer/parser JSON padrão do DRF com os de `stratasec`
+(orjson quando instalado) em respostas da listagem de tarefas.
+
+Uso, a partir de backend/:
+
+    python benchmarks/json_tarefas.py [--linhas 2000] [--repeticoes 20]
+
+Cria as tarefas dentro de uma transação que é desfeita ao final, então pode
+rodar contra o banco configurado sem deixar dados para trás.
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pontetech.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import transaction  # noqa: E402
+from rest_framework import parsers, renderers  # noqa: E402
+from rest_framework.test import APIRequestFactory, force_authenticate  # noqa: E402
+
+from stratasec.parsers import JSONParser  # noqa: E402
+from stratasec.renderers import JSONRenderer, orjson  # noqa: E402
+from tarefas.models import Tarefa  # noqa: E402
+from tarefas.views import TarefaViewSet  # noqa: E402
+
+
+class Desfazer(Exception):
+    pass
+
+
+def medir(nome, funcao, repeticoes, tamanho):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    melhor = min(tempos)
+    print(f"{nome:<34} {melhor * 1000:8.2f} ms  {tamanho / melhor / 2**20:8.1f} MiB/s")
+    return melhor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, default=2000)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"orjson: {'sim' if orjson else 'não instalado (fallback json)'}")
+
+    try:
+        with transaction.atomic():
+            usuario = User.objects.create_user(username="benchmark-json")
+            Tarefa.objects.bulk_create(
+                [
+                    Tarefa(
+                        usuario=usuario,
+                        titulo=f"Tarefa {i} – revisão",
+                        descricao="Descrição com acentuação usada no benchmark de JSON.",
+                    )
+                    for i in range(args.linhas)
+                ],
+                batch_size=1000,
+            )
+
+            # Resposta real da listagem (página de 50 e a lista inteira)
+            request = APIRequestFactory().get("/api/tarefas/", {"page_size": 50})
+            force_authenticate(request, user=usuario)
+            pagina = TarefaViewSet.as_view({"get": "list"})(request).data
+            todas = {"results": pagina["results"] * (args.linhas // 50)}
+
+            for rotulo, dados in (("página de 50", pagina), ("lista inteira", todas)):
+                padrao = renderers.JSONRenderer().render(dados)
+                assert JSONRenderer().render(dados) == padrao, "Saídas diferentes"
+                print(f"\nrender {rotulo} ({len(padrao):,} bytes)")
+                antes = medir(
+                    "rest_framework JSONRenderer",
+                    lambda: renderers.JSONRenderer().render(dados),
+                    args.repeticoes,
+                    len(padrao),
+                )
+                depois = medir(
+                    "stratasec JSONRenderer",
+                    lambda: JSONRenderer().render(dados),
+                    args.repeticoes,
+                    len(padrao),
+                )
+                print(f"ganho: {antes / depois:.1f}x")
+
+            corpo = renderers.JSONRenderer().render(todas)
+            print(f"\nparse lista inteira ({len(corpo):,} bytes)")
+            antes = medir(
+                "rest_framework JSONParser",
+                lambda: parsers.JSONParser().parse(io.BytesIO(corpo)),
+                args.repeticoes,
+                len(corpo),
+            )
+            depois = medir(
+                "stratasec JSONParser",
+                lambda: JSONParser().parse(io.BytesIO(corpo)),
+                args.repeticoes,
+                len(corpo),
+            )
+            print(f"ganho: {antes / depois:.1f}x")
+            raise Desfazer
+    except Desfazer:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Compara a serialização da listagem de tarefas pelo `TarefaSerializer`
+(instâncias de model) com a leitura rápida (`values()` + conversores).
+
+Uso, a partir de backend/:
+
+    python benchmarks/serializacao_tarefas.py [--linhas 5000] [--repeticoes 5]
+
+Cria as tarefas dentro de uma transação que é desfeita ao final, então pode
+rodar contra o banco configurado sem deixar dados para trás.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pontetech.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import transaction  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from tarefas.leitura import leitura_tarefa  # noqa: E402
+from tarefas.models import Tarefa  # noqa: E402
+from tarefas.serializers import TarefaSerializer  # noqa: E402
+
+
+class Desfazer(Exception):
+    pass
+
+
+def medir(nome, funcao, linhas, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    melhor = min(tempos)
+    print(f"{nome:<28} {melhor * 1000:9.1f} ms  {linhas / melhor:12,.0f} linhas/s")
+    return melhor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, default=5000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    try:
+        with transaction.atomic():
+            usuario = User.objects.create_user(username="benchmark-serializacao")
+            Tarefa.objects.bulk_create(
+                [
+                    Tarefa(
+                        usuario=usuario,
+                        titulo=f"Tarefa {i}",
+                        descricao="Descrição usada no benchmark de serialização.",
+                    )
+                    for i in range(args.linhas)
+                ],
+                batch_size=1000,
+            )
+            queryset = Tarefa.objects.filter(usuario=usuario).order_by("-criado_em")
+
+            def serializer():
+                return TarefaSerializer(list(queryset), many=True).data
+
+            def rapida():
+                return leitura_tarefa.serializar(
+                    list(leitura_tarefa.consultar(queryset))
+                )
+
+            assert JSONRenderer().render(serializer()) == JSONRenderer().render(
+                rapida()
+            ), "Saídas diferentes"
+
+            antes = medir("TarefaSerializer", serializer, args.linhas, args.repeticoes)
+            depois = medir("leitura rápida", rapida, args.linhas, args.repeticoes)
+            print(f"ganho: {antes / depois:.1f}x")
+            raise Desfazer
+    except Desfazer:
+        pass
+
+
+if __name__ == "__main__":
+    main()
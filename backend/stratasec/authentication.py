@@ -0,0 +1,180 @@
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import router
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import authentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+class JWTAuthentication(authentication.JWTAuthentication):
+  """
+  JWTAuthentication do simplejwt com uma variante assincrona
+  (`aauthenticate`), usada pelas views de `stratasec.views`: a busca do
+  usuario usa o ORM assincrono em vez de bloquear o event loop.
+  """
+
+  async def aauthenticate(self, request):
+    header = self.get_header(request)
+    if header is None:
+      return None
+
+    raw_token = self.get_raw_token(header)
+    if raw_token is None:
+      return None
+
+    validated_token = self.get_validated_token(raw_token)
+    return await self.aget_user(validated_token), validated_token
+
+  async def aget_user(self, validated_token):
+    # Mesmas regras (e mensagens traduzidas) de `get_user`, com `aget`
+    try:
+      user_id = validated_token[api_settings.USER_ID_CLAIM]
+    except KeyError:
+      raise InvalidToken(_("Token contained no recognizable user identification"))
+
+    try:
+      user = await self.user_model.objects.aget(
+        **{api_settings.USER_ID_FIELD: user_id}
+      )
+    except self.user_model.DoesNotExist:
+      raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+    if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+      raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+    if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+      api_settings.REVOKE_TOKEN_CLAIM
+    ) != get_md5_hash_password(user.password):
+      raise AuthenticationFailed(
+        _("The user's password has been changed."), code="password_changed"
+      )
+
+    return user
+
+
+CACHE_ATIVO_PADRAO_SEGUNDOS = 60
+CACHE_ATIVO_MAXIMO = 10000
+
+# usuario_id -> (is_active, expira_em); por processo
+_cache_ativo = {}
+
+
+def limpar_cache_ativo(usuario_id=None):
+  if usuario_id is None:
+    _cache_ativo.clear()
+  else:
+    _cache_ativo.pop(usuario_id, None)
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def _invalidar_cache_ativo(sender, instance, **kwargs):
+  # Desativar/excluir o usuario vale na hora, ao menos neste processo
+  limpar_cache_ativo(instance.pk)
+
+
+def _ttl():
+  return getattr(
+    settings, "JWT_CACHE_ATIVO_SEGUNDOS", CACHE_ATIVO_PADRAO_SEGUNDOS
+  )
+
+
+def _ler_cache(usuario_id):
+  entrada = _cache_ativo.get(usuario_id)
+  if entrada is None or entrada[1] < time.monotonic():
+    return None
+  return entrada[0]
+
+
+def _gravar_cache(usuario_id, ativo):
+  if len(_cache_ativo) >= CACHE_ATIVO_MAXIMO:
+    _cache_ativo.clear()
+  _cache_ativo[usuario_id] = (ativo, time.monotonic() + _ttl())
+
+
+class JWTUsuarioLeveAuthentication(JWTAuthentication):
+  """
+  Autentica pelo JWT sem carregar o usuario a cada requisicao. O
+  `request.user` e uma instancia de User montada so com o id do token e o
+  `is_active`, com os demais campos adiados: filtros e FKs
+  (`usuario=request.user`) funcionam sem consulta, e o primeiro acesso a um
+  campo adiado (ex.: `email`, `username`) carrega o campo do banco, sempre
+  atual.
+
+  O `is_active` vem de um cache por processo com TTL
+  (`JWT_CACHE_ATIVO_SEGUNDOS`, padrao 60); so quando expira ha um SELECT,
+  de uma coluna. Com `CHECK_REVOKE_TOKEN` (precisa do hash da senha) volta
+  ao carregamento completo.
+  """
+
+  def get_user(self, validated_token):
+    if api_settings.CHECK_REVOKE_TOKEN:
+      return super().get_user(validated_token)
+
+    usuario_id = self._usuario_id(validated_token)
+    ativo = _ler_cache(usuario_id)
+    if ativo is None:
+      ativo = self._consultar_ativo(usuario_id)
+    return self._montar_usuario(validated_token, usuario_id, ativo)
+
+  async def aget_user(self, validated_token):
+    if api_settings.CHECK_REVOKE_TOKEN:
+      return await super().aget_user(validated_token)
+
+    usuario_id = self._usuario_id(validated_token)
+    ativo = _ler_cache(usuario_id)
+    if ativo is None:
+      ativo = await sync_to_async(self._consultar_ativo)(usuario_id)
+    return self._montar_usuario(validated_token, usuario_id, ativo)
+
+  def _usuario_id(self, validated_token):
+    try:
+      valor = validated_token[api_settings.USER_ID_CLAIM]
+    except KeyError:
+      raise InvalidToken(_("Token contained no recognizable user identification"))
+
+    # O simplejwt grava o id como texto; o User montado precisa do tipo real
+    campo = self.user_model._meta.get_field(api_settings.USER_ID_FIELD)
+    try:
+      return campo.to_python(valor)
+    except ValidationError:
+      raise InvalidToken(_("Token contained no recognizable user identification"))
+
+  def _consultar_ativo(self, usuario_id):
+    ativo = (
+      self.user_model.objects.filter(**{api_settings.USER_ID_FIELD: usuario_id})
+      .values_list("is_active", flat=True)
+      .first()
+    )
+    if ativo is None:
+      raise AuthenticationFailed(_("User not found"), code="user_not_found")
+    _gravar_cache(usuario_id, ativo)
+    return ativo
+
+  def _montar_usuario(self, validated_token, usuario_id, ativo):
+    if api_settings.CHECK_USER_IS_ACTIVE and not ativo:
+      raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+    # So id e is_active: claims como o e-mail podem estar desatualizados
+    # (o token vive dias) e, marcados como carregados, um save() os gravaria
+    # de volta no banco
+    campos = {api_settings.USER_ID_FIELD: usuario_id, "is_active": ativo}
+
+    # from_db marca os campos ausentes como adiados (carregados sob demanda)
+    # e espera os valores na ordem dos campos do model
+    nomes = [
+      campo.attname
+      for campo in self.user_model._meta.concrete_fields
+      if campo.attname in campos
+    ]
+    return self.user_model.from_db(
+      router.db_for_read(self.user_model), nomes, [campos[n] for n in nomes]
+    )
@@ -1,4 +1,44 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+import json
+
+from django.core.paginator import InvalidPage
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+TAMANHOS_PAGINA = (5, 10, 50)
+
+
+def tamanho_pagina(request, query_param, padrao):
+  """
+  Respeita apenas tamanhos de pagina permitidos (5, 10, 50).
+  Caso contrario, usa o padrao.
+  """
+  try:
+    size = int(request.query_params.get(query_param, padrao))
+  except (TypeError, ValueError):
+    return padrao
+
+  return size if size in TAMANHOS_PAGINA else padrao
+
+
+def filtrar_apos(queryset, campo, valor, pk, descendente):
+  """
+  Restringe o queryset aos registros estritamente depois de (valor, pk)
+  na ordem (campo, id). A comparacao e feita como um intervalo sobre
+  `campo` mais uma exclusao do empate, para que o banco consiga usar o
+  indice composto em vez de avaliar um OR linha a linha.
+  """
+  if descendente:
+    return queryset.filter(**{f"{campo}__lte": valor}).exclude(
+      **{campo: valor, "id__gte": pk}
+    )
+  return queryset.filter(**{f"{campo}__gte": valor}).exclude(
+    **{campo: valor, "id__lte": pk}
+  )
 
 
 class DefaultPagination(PageNumberPagination):
@@ -7,16 +47,186 @@ class DefaultPagination(PageNumberPagination):
   max_page_size = 50
 
   def get_page_size(self, request):
+    return tamanho_pagina(request, self.page_size_query_param, self.page_size)
+
+  async def apaginate_queryset(self, queryset, request, view=None):
     """
-    Respeita apenas tamanhos de pagina permitidos (5, 10, 50).
-    Caso contrario, usa o padrao (10).
+    `paginate_queryset` com o COUNT e a pagina lidos pelo ORM assincrono.
     """
+    self.request = request
+    page_size = self.get_page_size(request)
+    if not page_size:
+      return None
+
+    paginator = self.django_paginator_class(queryset, page_size)
+    # `count` e um cached_property: ja preenchido, o Paginator nao consulta
+    paginator.count = await queryset.acount()
+    page_number = self.get_page_number(request, paginator)
+
     try:
-      size = int(
-        request.query_params.get(self.page_size_query_param, self.page_size)
+      self.page = paginator.page(page_number)
+    except InvalidPage as exc:
+      msg = self.invalid_page_message.format(
+        page_number=page_number, message=str(exc)
+      )
+      raise NotFound(msg)
+
+    if paginator.num_pages > 1 and self.template is not None:
+      self.display_page_controls = True
+
+    self.page.object_list = [item async for item in self.page.object_list]
+    return self.page.object_list
+
+
+class KeysetPagination(BasePagination):
+  """
+  Paginacao por cursor (keyset) sobre (criado_em, id).
+
+  Cada pagina e uma unica consulta `WHERE (criado_em, id) < cursor
+  ORDER BY criado_em, id LIMIT n`, sem OFFSET e sem COUNT(*). O total so
+  e calculado quando o cliente envia `count=true`.
+  """
+
+  page_size = 10
+  page_size_query_param = "page_size"
+  cursor_query_param = "cursor"
+  count_query_param = "count"
+  mode_query_param = "pagination"
+  ordering_param = "ordering"
+  ordering_field = "criado_em"
+  default_descending = True
+  invalid_cursor_message = "Cursor inválido."
+
+  @classmethod
+  def is_requested(cls, request):
+    params = request.query_params
+    return params.get(cls.mode_query_param) == "cursor" or bool(
+      params.get(cls.cursor_query_param)
+    )
+
+  def get_page_size(self, request):
+    return tamanho_pagina(request, self.page_size_query_param, self.page_size)
+
+  def paginate_queryset(self, queryset, request, view=None):
+    pagina = self._preparar(queryset, request)
+    self.count = queryset.count() if self.count_requested(request) else None
+    return self._concluir(list(pagina))
+
+  async def apaginate_queryset(self, queryset, request, view=None):
+    pagina = self._preparar(queryset, request)
+    if self.count_requested(request):
+      self.count = await queryset.acount()
+    else:
+      self.count = None
+    return self._concluir([item async for item in pagina])
+
+  def _preparar(self, queryset, request):
+    """Le cursor e parametros e devolve a consulta (lazy) da pagina."""
+    self.request = request
+    self.base_url = request.build_absolute_uri()
+    self.page_size = self.get_page_size(request)
+
+    cursor = self.decode_cursor(request)
+    if cursor is None:
+      self.descending = self.get_descending(request)
+      self._posicao, self._reverso = None, False
+    else:
+      self.descending, self._posicao, self._reverso = cursor
+
+    # Paginas "anteriores" sao lidas na ordem inversa e reordenadas depois.
+    descendente = self.descending != self._reverso
+    campo = self.ordering_field
+    prefixo = "-" if descendente else ""
+    queryset = queryset.order_by(f"{prefixo}{campo}", f"{prefixo}id")
+    if self._posicao is not None:
+      queryset = filtrar_apos(
+        queryset, campo, self._posicao[0], self._posicao[1], descendente
       )
-    except (TypeError, ValueError):
-      return self.page_size
+    return queryset[: self.page_size + 1]
+
+  def _concluir(self, itens):
+    tem_mais = len(itens) > self.page_size
+    itens = itens[: self.page_size]
+
+    if self._reverso:
+      itens.reverse()
+      self.has_next = True
+      self.has_previous = tem_mais
+    else:
+      self.has_next = tem_mais
+      self.has_previous = self._posicao is not None
+
+    self.page = itens
+    return itens
+
+  def get_paginated_response(self, data):
+    payload = {}
+    if self.count is not None:
+      payload["count"] = self.count
+    payload["next"] = self.get_next_link()
+    payload["previous"] = self.get_previous_link()
+    payload["results"] = data
+    return Response(payload)
+
+  def get_next_link(self):
+    if not self.has_next or not self.page:
+      return None
+    return self.encode_cursor(self.get_position(self.page[-1]), reverso=False)
+
+  def get_previous_link(self):
+    if not self.has_previous or not self.page:
+      return None
+    return self.encode_cursor(self.get_position(self.page[0]), reverso=True)
+
+  def get_descending(self, request):
+    if self.ordering_param:
+      ordering = request.query_params.get(self.ordering_param)
+      if ordering == self.ordering_field:
+        return False
+      if ordering == f"-{self.ordering_field}":
+        return True
+    return self.default_descending
+
+  def count_requested(self, request):
+    valor = request.query_params.get(self.count_query_param, "")
+    return valor.lower() in ("1", "true")
+
+  def get_position(self, item):
+    # Aceita instancias de model ou linhas de `values()`
+    if isinstance(item, dict):
+      return item[self.ordering_field], item["id"]
+    return getattr(item, self.ordering_field), item.pk
+
+  def encode_cursor(self, posicao, reverso):
+    valor, pk = posicao
+    token = json.dumps(
+      {
+        "v": valor.isoformat(),
+        "i": pk,
+        "d": int(self.descending),
+        "r": int(reverso),
+      },
+      separators=(",", ":"),
+    )
+    encoded = base64.urlsafe_b64encode(token.encode("ascii")).decode("ascii")
+    url = remove_query_param(self.base_url, self.mode_query_param)
+    return replace_query_param(url, self.cursor_query_param, encoded)
+
+  def decode_cursor(self, request):
+    encoded = request.query_params.get(self.cursor_query_param)
+    if not encoded:
+      return None
+
+    try:
+      token = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+      valor = parse_datetime(token["v"])
+      pk = int(token["i"])
+      descendente = bool(int(token["d"]))
+      reverso = bool(int(token["r"]))
+    except (TypeError, ValueError, KeyError, UnicodeEncodeError, binascii.Error):
+      raise NotFound(self.invalid_cursor_message)
 
-    return size if size in (5, 10, 50) else self.page_size
+    if valor is None:
+      raise NotFound(self.invalid_cursor_message)
 
+    return descendente, (valor, pk), reverso
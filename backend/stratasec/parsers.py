@@ -0,0 +1,48 @@
+try:
+  import orjson
+except ImportError:  # orjson é opcional: sem ele, vale o json da stdlib
+  orjson = None
+
+from django.conf import settings
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+from rest_framework.utils import json
+
+from .renderers import JSONRenderer
+
+# Inteiros que podem não caber em 64 bits: o orjson os leria como float (ou
+# recusaria), então corpos com 19+ dígitos seguidos vão direto para o `json`
+# da stdlib. translate + find roda em C, bem mais rápido que uma regex.
+DIGITOS_COMO_ZERO = bytes.maketrans(b"123456789", b"000000000")
+NUMERO_LONGO = b"0" * 19
+
+
+class JSONParser(parsers.JSONParser):
+  """
+  JSONParser do DRF com leitura via orjson quando instalado. Corpos com
+  inteiros longos ou que o orjson recusa são lidos pela biblioteca padrão,
+  então o resultado e o conjunto aceito não mudam.
+  """
+
+  renderer_class = JSONRenderer
+
+  def parse(self, stream, media_type=None, parser_context=None):
+    if orjson is None:
+      return super().parse(stream, media_type, parser_context)
+
+    parser_context = parser_context or {}
+    encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+
+    try:
+      corpo = stream.read()
+      if encoding.lower().replace("-", "") != "utf8":
+        corpo = corpo.decode(encoding).encode("utf-8")
+      if NUMERO_LONGO not in corpo.translate(DIGITOS_COMO_ZERO):
+        try:
+          return orjson.loads(corpo)
+        except orjson.JSONDecodeError:
+          pass
+      parse_constant = json.strict_constant if self.strict else None
+      return json.loads(corpo, parse_constant=parse_constant)
+    except ValueError as exc:
+      raise ParseError("JSON parse error - %s" % str(exc))
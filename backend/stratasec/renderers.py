@@ -0,0 +1,78 @@
+import math
+from decimal import Decimal
+
+try:
+  import orjson
+except ImportError:  # orjson é opcional: sem ele, vale o json da stdlib
+  orjson = None
+
+from rest_framework import renderers
+
+OPCOES_ORJSON = (
+  (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+)
+
+
+def _tem_nao_finito(dados):
+  """True se houver float/Decimal NaN ou infinito em algum ponto de `dados`."""
+  pendentes = [dados]
+  while pendentes:
+    valor = pendentes.pop()
+    if isinstance(valor, float):
+      if not math.isfinite(valor):
+        return True
+    elif isinstance(valor, Decimal):
+      if not valor.is_finite():
+        return True
+    elif isinstance(valor, dict):
+      pendentes.extend(valor.values())
+    elif isinstance(valor, (list, tuple)):
+      pendentes.extend(valor)
+  return False
+
+
+class JSONRenderer(renderers.JSONRenderer):
+  """
+  JSONRenderer do DRF com serialização via orjson quando instalado.
+
+  A saída é a mesma do renderer padrão (compacto, UTF-8, `\\u2028`/`\\u2029`
+  escapados). Datas passam pelo mesmo encoder do DRF, e qualquer caso que o
+  orjson não cubra (indentação, ASCII, inteiros acima de 64 bits) cai no
+  `json` da biblioteca padrão.
+
+  NaN e infinito: o orjson os escreveria como `null`, mas o renderer padrão
+  (`allow_nan=False`) levanta ValueError. Como só podem ter virado `null`,
+  a saída com `null` é conferida e, havendo valor não finito, o render passa
+  ao `json` da stdlib, que levanta o mesmo erro.
+  """
+
+  def render(self, data, accepted_media_type=None, renderer_context=None):
+    if data is None:
+      return b""
+
+    if (
+      orjson is None
+      or not self.compact
+      or self.ensure_ascii
+      or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+    ):
+      return super().render(data, accepted_media_type, renderer_context)
+
+    try:
+      ret = orjson.dumps(
+        data, default=self.encoder_class().default, option=OPCOES_ORJSON
+      )
+    except orjson.JSONEncodeError:
+      return super().render(data, accepted_media_type, renderer_context)
+
+    if b"null" in ret and _tem_nao_finito(data):
+      return super().render(data, accepted_media_type, renderer_context)
+
+    # Mesmo tratamento do renderer padrão: U+2028/U+2029 são válidos em JSON,
+    # mas quebram JavaScript embutido em <script>.
+    if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+      ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+        b"\xe2\x80\xa9", b"\\u2029"
+      )
+    return ret
+
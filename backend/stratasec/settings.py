@@ -41,6 +41,8 @@ INSTALLED_APPS = [
     'corsheaders',
     'rest_framework',
     'tarefas.apps.TarefasConfig',
+    'usuarios.apps.UsuariosConfig',
+    'treinamentos.apps.TreinamentosConfig',
 ]
 
 MIDDLEWARE = [
@@ -142,13 +144,24 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Django REST Framework / SimpleJWT
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # JWT sem SELECT do usuario por requisicao (e com variante assincrona)
+        'stratasec.authentication.JWTUsuarioLeveAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
     'DEFAULT_PAGINATION_CLASS': 'stratasec.pagination.DefaultPagination',
+    # JSON via orjson quando instalado (mesma saída e erros do renderer padrão)
+    'DEFAULT_RENDERER_CLASSES': (
+        'stratasec.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'stratasec.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 from datetime import timedelta
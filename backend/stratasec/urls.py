@@ -10,11 +10,23 @@ from rest_framework_simplejwt.views import (
 from tarefas.views import (
     ComentarioListCreateView,
     DashboardView,
+    EventosView,
     LoginView,
     MeView,
+    ProvisionamentoUsuariosView,
     RegisterView,
     TarefaViewSet,
 )
+from treinamentos.views import (
+    MatriculaViewSet,
+    MeusRecursosViewSet,
+    MinhasTurmasViewSet,
+    PainelView,
+    RecursoViewSet,
+    TreinamentoViewSet,
+    TurmaViewSet,
+)
+from usuarios.views import AlunoViewSet
 
 
 def root_redirect(_request):
@@ -27,6 +39,14 @@ def root_redirect(_request):
 
 router = DefaultRouter()
 router.register(r"tarefas", TarefaViewSet, basename="tarefa")
+router.register(r"alunos", AlunoViewSet, basename="aluno")
+router.register(r"treinamentos", TreinamentoViewSet, basename="treinamento")
+router.register(r"turmas", TurmaViewSet, basename="turma")
+router.register(r"recursos", RecursoViewSet, basename="recurso")
+router.register(r"matriculas", MatriculaViewSet, basename="matricula")
+# Painel do aluno
+router.register(r"painel/turmas", MinhasTurmasViewSet, basename="painel_turma")
+router.register(r"painel/recursos", MeusRecursosViewSet, basename="painel_recurso")
 
 urlpatterns = [
     path("", root_redirect, name="root_redirect"),
@@ -43,7 +63,14 @@ urlpatterns = [
     path("api/auth/me/", MeView.as_view(), name="auth_me"),
     path("api/auth/register/", RegisterView.as_view(), name="auth_register"),
     path("api/auth/login/", LoginView.as_view(), name="auth_login"),
+    path(
+        "api/usuarios/provisionar/",
+        ProvisionamentoUsuariosView.as_view(),
+        name="usuarios_provisionar",
+    ),
     path("api/dashboard/", DashboardView.as_view(), name="dashboard"),
+    path("api/painel/", PainelView.as_view(), name="painel"),
+    path("api/eventos/", EventosView.as_view(), name="eventos"),
     path(
         "api/tarefas/<int:tarefa_pk>/comentarios/",
         ComentarioListCreateView.as_view(),
@@ -0,0 +1,86 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.utils.functional import classproperty
+from rest_framework.exceptions import APIException
+
+
+async def autenticar(request):
+  """
+  Equivalente assincrono de `Request._authenticate`: autenticadores com
+  `aauthenticate` rodam no event loop; os demais (ex.: sessao), em thread.
+  """
+  for autenticador in request.authenticators:
+    if hasattr(autenticador, "aauthenticate"):
+      autenticar_com = autenticador.aauthenticate
+    else:
+      autenticar_com = sync_to_async(autenticador.authenticate)
+
+    try:
+      resultado = await autenticar_com(request)
+    except APIException:
+      request._not_authenticated()
+      raise
+
+    if resultado is not None:
+      request._authenticator = autenticador
+      request.user, request.auth = resultado
+      return
+
+  request._not_authenticated()
+
+
+class AsyncAPIViewMixin:
+  """
+  `dispatch` assincrono para APIView/ViewSet do DRF, que so tem views
+  sincronas. Handlers `async def` (ex.: `list`, `get`) rodam direto no event
+  loop com o ORM assincrono; os sincronos (escritas, actions) continuam
+  iguais e rodam em thread via `sync_to_async`.
+
+  Sob ASGI a requisicao so ocupa uma thread durante as consultas, nao do
+  inicio ao fim; sob WSGI o Django executa a view com `async_to_sync`.
+  """
+
+  @classproperty
+  def view_is_async(cls):
+    return True
+
+  @classmethod
+  def as_view(cls, *args, **kwargs):
+    view = super().as_view(*args, **kwargs)
+    # O `view` dos ViewSets nao passa pelo View.as_view do Django
+    return view if iscoroutinefunction(view) else markcoroutinefunction(view)
+
+  async def dispatch(self, request, *args, **kwargs):
+    self.args = args
+    self.kwargs = kwargs
+    request = self.initialize_request(request, *args, **kwargs)
+    self.request = request
+    self.headers = self.default_response_headers
+
+    try:
+      # Com o usuario ja resolvido, `initial` nao autentica de novo
+      await autenticar(request)
+      self.initial(request, *args, **kwargs)
+
+      if request.method.lower() in self.http_method_names:
+        handler = getattr(
+          self, request.method.lower(), self.http_method_not_allowed
+        )
+      else:
+        handler = self.http_method_not_allowed
+
+      if iscoroutinefunction(handler):
+        response = await handler(request, *args, **kwargs)
+      else:
+        response = await sync_to_async(handler)(request, *args, **kwargs)
+
+    except Exception as exc:
+      response = self.handle_exception(exc)
+
+    self.response = self.finalize_response(request, response, *args, **kwargs)
+    return self.response
+
+  async def apaginate_queryset(self, queryset):
+    paginator = getattr(self, "paginator", None)
+    if paginator is None:
+      return None
+    return await paginator.apaginate_queryset(queryset, self.request, view=self)
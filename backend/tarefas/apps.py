@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TarefasConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "tarefas"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,76 @@
+import hashlib
+import time
+
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, urlencode
+
+
+def etag_fraco(*partes):
+    return 'W/"%s"' % "-".join(str(p) for p in partes)
+
+
+def assinatura_parametros(request):
+    """
+    Resumo estável da query string (status, prioridade, search, ordering,
+    page, cursor...), para que cada variação da listagem tenha seu ETag.
+    """
+    parametros = sorted(
+        (chave, valor)
+        for chave, valores in request.query_params.lists()
+        for valor in valores
+    )
+    return hashlib.md5(
+        urlencode(parametros).encode(), usedforsecurity=False
+    ).hexdigest()[:16]
+
+
+def _segundos(ultima_modificacao):
+    """
+    Last-Modified só tem resolução de segundos: enquanto o segundo da última
+    alteração não termina, outra escrita pode acontecer com o mesmo valor, e
+    um If-Modified-Since com ele daria 304 com conteúdo velho. Nesse caso
+    (ou sem alteração registrada) devolve None, e vale só o ETag.
+    """
+    if ultima_modificacao is None:
+        return None
+    timestamp = int(ultima_modificacao.timestamp())
+    return timestamp if timestamp < int(time.time()) else None
+
+
+def responder_condicional(request, etag, ultima_modificacao, gerar_resposta):
+    """
+    Devolve 304 quando If-None-Match/If-Modified-Since batem com o estado
+    atual, sem chamar `gerar_resposta` (queryset e serializer). Caso
+    contrário, gera a resposta normal e anexa ETag/Last-Modified.
+    """
+    timestamp = _segundos(ultima_modificacao)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=timestamp
+    )
+    if response is None:
+        response = gerar_resposta()
+    return _anotar_cache(response, etag, timestamp)
+
+
+async def responder_condicional_async(
+    request, etag, ultima_modificacao, gerar_resposta
+):
+    """Como `responder_condicional`, para um `gerar_resposta` assíncrono."""
+    timestamp = _segundos(ultima_modificacao)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=timestamp
+    )
+    if response is None:
+        response = await gerar_resposta()
+    return _anotar_cache(response, etag, timestamp)
+
+
+def _anotar_cache(response, etag, timestamp):
+    if response.status_code in (200, 304):
+        response.headers.setdefault("ETag", etag)
+        if timestamp is not None:
+            response.headers.setdefault("Last-Modified", http_date(timestamp))
+        # Cache apenas no cliente e sempre revalidado
+        response.headers.setdefault("Cache-Control", "private, no-cache")
+        patch_vary_headers(response, ("Authorization",))
+    return response
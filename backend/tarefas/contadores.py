@@ -0,0 +1,134 @@
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import ContadorStatus, Tarefa, VersaoTarefas
+
+# Ajustes pendentes de um `contabilizacao_em_lote` ativo: (deltas, usuarios)
+_pendentes = ContextVar("tarefas_contabilizacao_pendente", default=None)
+
+
+@contextmanager
+def contabilizacao_em_lote():
+    """
+    Agrupa os ajustes de contadores e versões feitos dentro do bloco (inclusive
+    pelos signals) e os aplica uma única vez ao final, em vez de um UPDATE por
+    tarefa. Use dentro da mesma transação das alterações.
+    """
+    if _pendentes.get() is not None:
+        yield
+        return
+
+    deltas, usuarios = Counter(), set()
+    token = _pendentes.set((deltas, usuarios))
+    try:
+        yield
+    finally:
+        _pendentes.reset(token)
+    ajustar_contadores(deltas)
+    incrementar_versoes(usuarios)
+
+
+def ajustar_contadores(deltas):
+    """
+    Aplica variações {(usuario_id, status): delta} em ContadorStatus com
+    UPDATE atômico (total = total + delta). Deve ser chamada dentro da
+    transação que alterou as tarefas.
+    """
+    pendentes = _pendentes.get()
+    if pendentes is not None:
+        pendentes[0].update(deltas)
+        return
+
+    for (usuario_id, status), delta in deltas.items():
+        if not delta:
+            continue
+
+        atualizados = ContadorStatus.objects.filter(
+            usuario_id=usuario_id, status=status
+        ).update(total=F("total") + delta)
+        if atualizados or delta < 0:
+            continue
+
+        try:
+            with transaction.atomic():
+                ContadorStatus.objects.create(
+                    usuario_id=usuario_id, status=status, total=delta
+                )
+        except IntegrityError:
+            # Outra transação criou a linha entre o UPDATE e o INSERT
+            ContadorStatus.objects.filter(
+                usuario_id=usuario_id, status=status
+            ).update(total=F("total") + delta)
+
+
+def incrementar_versoes(usuario_ids):
+    """
+    Incrementa a versão das tarefas de cada usuário informado. Assim como
+    `ajustar_contadores`, deve rodar na transação que alterou as tarefas.
+    """
+    pendentes = _pendentes.get()
+    if pendentes is not None:
+        pendentes[1].update(usuario_ids)
+        return
+
+    agora = timezone.now()
+    for usuario_id in set(usuario_ids):
+        atualizados = VersaoTarefas.objects.filter(usuario_id=usuario_id).update(
+            versao=F("versao") + 1, atualizado_em=agora
+        )
+        if atualizados:
+            continue
+
+        try:
+            with transaction.atomic():
+                VersaoTarefas.objects.create(
+                    usuario_id=usuario_id, versao=1, atualizado_em=agora
+                )
+        except IntegrityError:
+            VersaoTarefas.objects.filter(usuario_id=usuario_id).update(
+                versao=F("versao") + 1, atualizado_em=agora
+            )
+
+
+def contagem_real():
+    """Contagem (usuario_id, status) -> total calculada na tabela de tarefas."""
+    linhas = (
+        Tarefa.objects.order_by()
+        .values_list("usuario_id", "status")
+        .annotate(total=Count("id"))
+    )
+    return Counter({(usuario_id, status): total for usuario_id, status, total in linhas})
+
+
+def contagem_armazenada():
+    linhas = ContadorStatus.objects.filter(total__gt=0).values_list(
+        "usuario_id", "status", "total"
+    )
+    return Counter({(usuario_id, status): total for usuario_id, status, total in linhas})
+
+
+def divergencias():
+    real = contagem_real()
+    armazenada = contagem_armazenada()
+    return {
+        chave: (armazenada.get(chave, 0), real.get(chave, 0))
+        for chave in real.keys() | armazenada.keys()
+        if armazenada.get(chave, 0) != real.get(chave, 0)
+    }
+
+
+def reconstruir_contadores():
+    with transaction.atomic():
+        ContadorStatus.objects.all().delete()
+        ContadorStatus.objects.bulk_create(
+            [
+                ContadorStatus(usuario_id=usuario_id, status=status, total=total)
+                for (usuario_id, status), total in contagem_real().items()
+            ],
+            batch_size=1000,
+        )
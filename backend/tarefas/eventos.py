@@ -0,0 +1,146 @@
+import asyncio
+import itertools
+import json
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+
+FILA_MAXIMA = 100
+HEARTBEAT_PADRAO_SEGUNDOS = 15
+RECONEXAO_MS = 5000
+
+# Marcador entregue no lugar dos eventos quando a fila de um assinante lota:
+# o cliente deve se ressincronizar via /api/tarefas/changes/.
+RESSINCRONIZAR = {"tipo": "ressincronizar"}
+
+
+class Assinatura:
+    """Fila de eventos de um cliente conectado, presa ao event loop dele."""
+
+    def __init__(self, usuario_id, loop, capacidade):
+        self.usuario_id = usuario_id
+        self.loop = loop
+        self.fila = asyncio.Queue(maxsize=capacidade)
+
+    def _entregar(self, evento):
+        # Roda sempre no loop do assinante (via call_soon_threadsafe)
+        try:
+            self.fila.put_nowait(evento)
+        except asyncio.QueueFull:
+            # Cliente lento: em vez de crescer sem limite ou travar quem
+            # publica, descarta o acumulado e pede ressincronização.
+            while not self.fila.empty():
+                self.fila.get_nowait()
+            self.fila.put_nowait(RESSINCRONIZAR)
+
+    async def proximo(self, timeout):
+        """Próximo evento, ou None se nada chegar em `timeout` segundos."""
+        try:
+            return await asyncio.wait_for(self.fila.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class Broker:
+    """
+    Pub/sub em memória, por processo. Quem publica pode estar em qualquer
+    thread (views síncronas, signals); cada entrega é agendada no event loop
+    do assinante. Com vários processos/servidores, cada um só enxerga as
+    alterações feitas nele.
+    """
+
+    def __init__(self, capacidade=FILA_MAXIMA):
+        self.capacidade = capacidade
+        self._assinaturas = defaultdict(set)
+        self._lock = threading.Lock()
+        self._sequencia = itertools.count(1)
+
+    def assinar(self, usuario_id):
+        assinatura = Assinatura(
+            usuario_id, asyncio.get_running_loop(), self.capacidade
+        )
+        with self._lock:
+            self._assinaturas[usuario_id].add(assinatura)
+        return assinatura
+
+    def cancelar(self, assinatura):
+        with self._lock:
+            assinaturas = self._assinaturas.get(assinatura.usuario_id)
+            if assinaturas is not None:
+                assinaturas.discard(assinatura)
+                if not assinaturas:
+                    del self._assinaturas[assinatura.usuario_id]
+
+    def publicar(self, usuario_id, evento):
+        with self._lock:
+            assinaturas = list(self._assinaturas.get(usuario_id, ()))
+            if not assinaturas:
+                return
+            evento = {"seq": next(self._sequencia), **evento}
+
+        for assinatura in assinaturas:
+            try:
+                assinatura.loop.call_soon_threadsafe(assinatura._entregar, evento)
+            except RuntimeError:
+                # Loop já encerrado: a conexão caiu sem cancelar a assinatura
+                self.cancelar(assinatura)
+
+
+broker = Broker()
+
+
+def notificar(usuario_id, evento):
+    """Publica `evento` para o usuário quando (e se) a transação confirmar."""
+    transaction.on_commit(lambda: broker.publicar(usuario_id, evento))
+
+
+def notificar_tarefas(usuario_id, acao, ids):
+    for tarefa_id in ids:
+        notificar(usuario_id, {"tipo": "tarefa", "acao": acao, "id": tarefa_id})
+
+
+def notificar_comentario(comentario, acao, usuario_id):
+    notificar(
+        usuario_id,
+        {
+            "tipo": "comentario",
+            "acao": acao,
+            "id": comentario.pk,
+            "tarefa": comentario.tarefa_id,
+        },
+    )
+
+
+def formatar_sse(evento):
+    linhas = []
+    if "seq" in evento:
+        linhas.append(f"id: {evento['seq']}")
+    linhas.append(f"event: {evento['tipo']}")
+    linhas.append("data: " + json.dumps(evento, separators=(",", ":")))
+    return "\n".join(linhas) + "\n\n"
+
+
+async def fluxo_eventos(usuario_id, heartbeat=None):
+    """
+    Gerador assíncrono do corpo text/event-stream. Sem eventos, envia um
+    comentário SSE a cada `heartbeat` segundos, o que mantém proxies com a
+    conexão aberta e faz o servidor perceber clientes que já caíram.
+    """
+    if heartbeat is None:
+        heartbeat = getattr(
+            settings, "TAREFAS_EVENTOS_HEARTBEAT", HEARTBEAT_PADRAO_SEGUNDOS
+        )
+
+    # A assinatura nasce com o primeiro byte da resposta, não na view: uma
+    # resposta que nunca chega a ser enviada não deixa fila pendurada.
+    canal = broker
+    assinatura = canal.assinar(usuario_id)
+    try:
+        yield f"retry: {RECONEXAO_MS}\n\n"
+        while True:
+            evento = await assinatura.proximo(heartbeat)
+            yield ": ping\n\n" if evento is None else formatar_sse(evento)
+    finally:
+        canal.cancelar(assinatura)
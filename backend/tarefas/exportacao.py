@@ -0,0 +1,89 @@
+import csv
+
+from asgiref.sync import sync_to_async
+
+from stratasec.pagination import filtrar_apos
+from stratasec.renderers import JSONRenderer
+
+from .leitura import leitura_tarefa
+
+LOTE_EXPORTACAO = 1000
+
+FORMATOS = {
+    "ndjson": ("application/x-ndjson", "tarefas.ndjson"),
+    "csv": ("text/csv; charset=utf-8", "tarefas.csv"),
+}
+
+
+def tarefas_em_lotes(queryset, descendente, tamanho=None):
+    """
+    Percorre o queryset em lotes por keyset (criado_em, id), devolvendo os
+    registros já no formato da API. Cada lote é uma consulta limitada lida
+    com `iterator(chunk_size=...)`: a memória depende do tamanho do lote, não
+    do total de tarefas. O keyset é o que garante isso no MySQL, onde o
+    driver carrega o resultado inteiro de uma consulta no cliente.
+    """
+    tamanho = tamanho or LOTE_EXPORTACAO
+    prefixo = "-" if descendente else ""
+    queryset = leitura_tarefa.consultar(
+        queryset.order_by(f"{prefixo}criado_em", f"{prefixo}id")
+    )
+
+    posicao = None
+    while True:
+        lote = queryset
+        if posicao is not None:
+            lote = filtrar_apos(queryset, "criado_em", *posicao, descendente)
+        linhas = list(lote[:tamanho].iterator(chunk_size=tamanho))
+        if not linhas:
+            return
+
+        yield leitura_tarefa.serializar(linhas)
+        if len(linhas) < tamanho:
+            return
+        posicao = (linhas[-1]["criado_em"], linhas[-1]["id"])
+
+
+def gerar_ndjson(lotes):
+    renderer = JSONRenderer()
+    for lote in lotes:
+        yield b"".join(renderer.render(registro) + b"\n" for registro in lote)
+
+
+class _Eco:
+    """Arquivo falso para o csv.writer: devolve a linha em vez de guardá-la."""
+
+    def write(self, valor):
+        return valor
+
+
+def gerar_csv(lotes):
+    campos = [nome for nome, _ in leitura_tarefa.campos]
+    writer = csv.writer(_Eco())
+    yield writer.writerow(campos).encode("utf-8")
+    for lote in lotes:
+        yield "".join(
+            writer.writerow([registro[campo] for campo in campos])
+            for registro in lote
+        ).encode("utf-8")
+
+
+GERADORES = {"ndjson": gerar_ndjson, "csv": gerar_csv}
+
+_FIM = object()
+
+
+async def em_fluxo_assincrono(partes):
+    """
+    Iterador assíncrono sobre um gerador síncrono de exportação, para o
+    ASGI: com um `streaming_content` síncrono, o Django o consome inteiro
+    (`sync_to_async(list)`) antes de enviar o primeiro byte. Cada `next`
+    (um lote: consulta e formatação) roda na thread das consultas.
+    """
+    proximo = sync_to_async(next)
+    try:
+        while (parte := await proximo(partes, _FIM)) is not _FIM:
+            yield parte
+    finally:
+        # Cliente desconectado no meio: fecha o gerador na mesma thread
+        await sync_to_async(partes.close)()
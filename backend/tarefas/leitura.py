@@ -0,0 +1,215 @@
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import connection
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value, Window
+from django.db.models.functions import Coalesce, RowNumber
+from rest_framework import ISO_8601, serializers
+from rest_framework.fields import ReadOnlyField
+from rest_framework.settings import api_settings
+
+from .models import Comentario
+from .serializers import ComentarioSerializer, TarefaSerializer
+
+# Campos cuja representação é o próprio valor vindo do banco
+CAMPOS_IDENTIDADE = (
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+    ReadOnlyField,
+)
+
+
+class LeituraRapida:
+    """
+    Caminho somente leitura para listagem/detalhe: busca só as colunas que o
+    serializer expõe (via `values()`) e monta os dicts com conversores
+    compilados uma única vez a partir dos campos do próprio serializer, sem
+    instanciar models nem passar pelo `to_representation` de cada campo.
+
+    A saída é idêntica à do serializer. Se ele ganhar um campo que não
+    sabemos converter, a falha acontece já na importação.
+    """
+
+    def __init__(self, serializer_class):
+        self.campos = []  # (nome, coluna)
+        self.datas = []  # (nome, campo DRF)
+
+        serializer = serializer_class()
+        model = serializer.Meta.model
+        for nome, campo in serializer.fields.items():
+            if campo.write_only:
+                continue
+            coluna = self._coluna(model, campo)
+            suportado = isinstance(
+                campo, (serializers.DateTimeField, *CAMPOS_IDENTIDADE)
+            ) or (
+                # FK exposta como id: o valor da coluna `<fk>_id` já é a saída
+                isinstance(campo, serializers.PrimaryKeyRelatedField)
+                and campo.pk_field is None
+            )
+            if coluna is None or not suportado:
+                raise ImproperlyConfigured(
+                    f"LeituraRapida não sabe converter o campo {nome!r} "
+                    f"de {serializer_class.__name__}."
+                )
+
+            self.campos.append((nome, coluna))
+            if isinstance(campo, serializers.DateTimeField):
+                self.datas.append((nome, campo))
+
+        self.colunas = list(dict.fromkeys(coluna for _, coluna in self.campos))
+
+    @staticmethod
+    def _coluna(model, campo):
+        atributos = campo.source.split(".")
+        try:
+            campo_model = model._meta.get_field(atributos[0])
+        except FieldDoesNotExist:
+            return None
+
+        if len(atributos) == 1:
+            return campo_model.attname
+        # `usuario.id`: a FK já guarda o id, não precisa do JOIN
+        if (
+            len(atributos) == 2
+            and campo_model.many_to_one
+            and atributos[1] in ("id", "pk", campo_model.target_field.attname)
+        ):
+            return campo_model.attname
+        return None
+
+    def _conversor_data(self, campo):
+        formato = getattr(campo, "format", api_settings.DATETIME_FORMAT)
+        fuso = (
+            campo.timezone if hasattr(campo, "timezone") else campo.default_timezone()
+        )
+        if formato is None or formato.lower() != ISO_8601 or fuso is None:
+            return campo.to_representation
+
+        def converter(valor):
+            if not valor:
+                return None
+            texto = valor.astimezone(fuso).isoformat()
+            if texto.endswith("+00:00"):
+                texto = texto[:-6] + "Z"
+            return texto
+
+        return converter
+
+    def consultar(self, queryset):
+        """Queryset de dicts com apenas as colunas necessárias."""
+        return queryset.values(*self.colunas)
+
+    def serializar(self, linhas):
+        campos = self.campos
+        # O fuso atual é resolvido uma vez por página, não por valor
+        conversores = [
+            (nome, self._conversor_data(campo)) for nome, campo in self.datas
+        ]
+
+        resultado = []
+        for linha in linhas:
+            registro = {nome: linha[coluna] for nome, coluna in campos}
+            for nome, converter in conversores:
+                registro[nome] = converter(registro[nome])
+            resultado.append(registro)
+        return resultado
+
+
+leitura_tarefa = LeituraRapida(TarefaSerializer)
+leitura_comentario = LeituraRapida(ComentarioSerializer)
+
+
+def resumo_comentarios(tarefa_ids):
+    """
+    Uma linha por tarefa com comentários: o comentário mais recente, no
+    formato de `leitura_comentario`, e o total da tarefa em
+    `comentarios_count`. Uma única consulta com funções de janela para a
+    página inteira, em vez de uma contagem + uma busca por tarefa.
+    """
+    por_tarefa = [F("tarefa_id")]
+    return (
+        Comentario.objects.filter(tarefa_id__in=tarefa_ids)
+        .annotate(
+            comentarios_count=Window(Count("id"), partition_by=por_tarefa),
+            posicao=Window(
+                RowNumber(),
+                partition_by=por_tarefa,
+                order_by=[F("criado_em").desc(), F("id").desc()],
+            ),
+        )
+        .filter(posicao=1)
+        .order_by()
+        .values(*leitura_comentario.colunas, "comentarios_count")
+    )
+
+
+async def anexar_comentarios(registros):
+    """Acrescenta `comentarios_count` e `ultimo_comentario` às tarefas."""
+    if not registros:
+        return registros
+    linhas = [
+        linha async for linha in resumo_comentarios([r["id"] for r in registros])
+    ]
+    resumo = {
+        linha["tarefa_id"]: (linha["comentarios_count"], comentario)
+        for linha, comentario in zip(linhas, leitura_comentario.serializar(linhas))
+    }
+    for registro in registros:
+        registro["comentarios_count"], registro["ultimo_comentario"] = resumo.get(
+            registro["id"], (0, None)
+        )
+    return registros
+
+
+def comentarios_recentes(usuario_id, tarefa_ids, limite):
+    """
+    Os `limite` comentários mais recentes de cada tarefa de `tarefa_ids` que
+    pertence ao usuário, em uma única consulta: as linhas vêm agrupadas por
+    tarefa e, dentro dela, das mais novas para as mais antigas.
+
+    Com funções de janela, cada comentário é numerado dentro da sua tarefa
+    (ROW_NUMBER) e ficam os primeiros. Sem elas, a posição é a contagem de
+    comentários mais novos da mesma tarefa, por uma subconsulta correlata
+    que usa o índice (tarefa, criado_em).
+    """
+    comentarios = Comentario.objects.filter(
+        tarefa_id__in=tarefa_ids, tarefa__usuario_id=usuario_id
+    )
+    if connection.features.supports_over_clause:
+        posicao = Window(
+            RowNumber(),
+            partition_by=[F("tarefa_id")],
+            order_by=[F("criado_em").desc(), F("id").desc()],
+        )
+    else:
+        mais_novos = (
+            Comentario.objects.filter(tarefa_id=OuterRef("tarefa_id"))
+            .filter(
+                Q(criado_em__gt=OuterRef("criado_em"))
+                | Q(criado_em=OuterRef("criado_em"), id__gt=OuterRef("id"))
+            )
+            .order_by()
+            .values("tarefa_id")
+            .annotate(total=Count("id"))
+            .values("total")
+        )
+        posicao = Coalesce(Subquery(mais_novos), Value(0)) + 1
+
+    return (
+        comentarios.annotate(posicao=posicao)
+        .filter(posicao__lte=limite)
+        .order_by("tarefa_id", "-criado_em", "-id")
+        .values(*leitura_comentario.colunas)
+    )
+
+
+async def agrupar_comentarios_recentes(usuario_id, tarefa_ids, limite):
+    """{tarefa_id: [comentários]} no formato de `leitura_comentario`."""
+    linhas = [
+        linha
+        async for linha in comentarios_recentes(usuario_id, tarefa_ids, limite)
+    ]
+    agrupados = {}
+    for linha, comentario in zip(linhas, leitura_comentario.serializar(linhas)):
+        agrupados.setdefault(linha["tarefa_id"], []).append(comentario)
+    return agrupados
@@ -0,0 +1,231 @@
+from collections import Counter
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .contadores import ajustar_contadores, contabilizacao_em_lote, incrementar_versoes
+from .eventos import notificar_tarefas
+from .models import Tarefa
+from .search import get_search_backend
+from .serializers import TarefaSerializer
+
+ACOES = ("criar", "atualizar", "excluir")
+MODOS = ("atomico", "parcial")
+LOTE_MAXIMO = 1000
+TAMANHO_LOTE_SQL = 500
+
+CAMPOS_TEXTO = {"titulo", "descricao"}
+
+
+def validar_envelope(dados):
+    """Valida o corpo do lote; devolve (modo, operacoes, erros)."""
+    if not isinstance(dados, dict):
+        return None, None, {"detail": "Corpo da requisição deve ser um objeto."}
+
+    modo = dados.get("modo", "atomico")
+    if modo not in MODOS:
+        return None, None, {"modo": f"Modo inválido. Use: {', '.join(MODOS)}."}
+
+    operacoes = dados.get("operacoes")
+    if not isinstance(operacoes, list) or not operacoes:
+        return None, None, {"operacoes": "Informe uma lista não vazia de operações."}
+    if len(operacoes) > LOTE_MAXIMO:
+        return None, None, {
+            "operacoes": f"O lote aceita no máximo {LOTE_MAXIMO} operações."
+        }
+
+    return modo, operacoes, None
+
+
+def _erro(indice, acao, erros, status=400):
+    return {"indice": indice, "acao": acao, "status": status, "erros": erros}
+
+
+def _id_da_operacao(operacao):
+    try:
+        return int(operacao.get("id"))
+    except (TypeError, ValueError):
+        return None
+
+
+def processar_lote(usuario, operacoes, atomico):
+    """
+    Valida cada operação com as regras do `TarefaSerializer` e aplica as
+    válidas com bulk_create/bulk_update/DELETE em uma única transação.
+
+    No modo atômico, qualquer erro cancela o lote inteiro. No modo parcial,
+    as operações inválidas são apenas reportadas.
+
+    Retorna (aplicado, resultados), com um resultado por operação, na ordem
+    recebida.
+    """
+    ids = {
+        _id_da_operacao(op)
+        for op in operacoes
+        if isinstance(op, dict) and op.get("acao") in ("atualizar", "excluir")
+    }
+    ids.discard(None)
+
+    with transaction.atomic():
+        existentes = {
+            tarefa.pk: tarefa
+            for tarefa in Tarefa.objects.select_for_update().filter(
+                usuario=usuario, pk__in=ids
+            )
+        }
+        # Evita um SELECT por item ao serializar `usuario` na resposta
+        for tarefa in existentes.values():
+            tarefa.usuario = usuario
+
+        resultados = [None] * len(operacoes)
+        criar, atualizar, excluir = [], [], []
+        vistos = set()
+
+        for indice, operacao in enumerate(operacoes):
+            acao = operacao.get("acao") if isinstance(operacao, dict) else None
+            if acao not in ACOES:
+                resultados[indice] = _erro(
+                    indice,
+                    acao,
+                    {"acao": f"Ação inválida. Use: {', '.join(ACOES)}."},
+                )
+                continue
+
+            if acao != "criar":
+                tarefa_id = _id_da_operacao(operacao)
+                if tarefa_id is None:
+                    resultados[indice] = _erro(
+                        indice, acao, {"id": "Este campo é obrigatório."}
+                    )
+                    continue
+                if tarefa_id in vistos:
+                    resultados[indice] = _erro(
+                        indice, acao, {"id": "Tarefa repetida no lote."}
+                    )
+                    continue
+                vistos.add(tarefa_id)
+                tarefa = existentes.get(tarefa_id)
+                if tarefa is None:
+                    resultados[indice] = _erro(
+                        indice, acao, {"detail": "Não encontrado."}, status=404
+                    )
+                    continue
+
+            if acao == "excluir":
+                excluir.append((indice, tarefa))
+                continue
+
+            dados = operacao.get("dados")
+            if not isinstance(dados, dict):
+                resultados[indice] = _erro(
+                    indice, acao, {"dados": "Informe um objeto com os campos."}
+                )
+                continue
+
+            if acao == "criar":
+                serializer = TarefaSerializer(data=dados)
+            else:
+                serializer = TarefaSerializer(tarefa, data=dados, partial=True)
+            if not serializer.is_valid():
+                resultados[indice] = _erro(indice, acao, serializer.errors)
+                continue
+
+            if acao == "criar":
+                criar.append(
+                    (indice, Tarefa(usuario=usuario, **serializer.validated_data))
+                )
+            else:
+                atualizar.append((indice, tarefa, serializer.validated_data))
+
+        houve_erro = any(resultado is not None for resultado in resultados)
+        if atomico and houve_erro:
+            for indice, resultado in enumerate(resultados):
+                if resultado is None:
+                    resultados[indice] = _erro(
+                        indice,
+                        operacoes[indice]["acao"],
+                        {"detail": "Operação não aplicada: o lote contém erros."},
+                        status=424,
+                    )
+            return False, resultados
+
+        if criar or atualizar or excluir:
+            with contabilizacao_em_lote():
+                _aplicar(usuario, criar, atualizar, excluir)
+
+    for indice, tarefa in criar:
+        resultados[indice] = {
+            "indice": indice,
+            "acao": "criar",
+            "status": 201,
+            "tarefa": TarefaSerializer(tarefa).data,
+        }
+    for indice, tarefa, _ in atualizar:
+        resultados[indice] = {
+            "indice": indice,
+            "acao": "atualizar",
+            "status": 200,
+            "tarefa": TarefaSerializer(tarefa).data,
+        }
+    for indice, tarefa in excluir:
+        resultados[indice] = {
+            "indice": indice,
+            "acao": "excluir",
+            "status": 204,
+            "id": tarefa.pk,
+        }
+    return True, resultados
+
+
+def _aplicar(usuario, criar, atualizar, excluir):
+    # bulk_create/bulk_update não disparam signals: contadores, versão,
+    # índice de busca e eventos são tratados aqui, de uma vez para o lote todo.
+    deltas = Counter()
+    reindexar = []
+
+    novas = [tarefa for _, tarefa in criar]
+    if novas:
+        if connection.features.can_return_rows_from_bulk_insert:
+            Tarefa.objects.bulk_create(novas, batch_size=TAMANHO_LOTE_SQL)
+            for tarefa in novas:
+                deltas[(usuario.id, tarefa.status)] += 1
+            reindexar.extend(novas)
+            notificar_tarefas(usuario.id, "salva", [tarefa.pk for tarefa in novas])
+        else:
+            # MySQL não devolve os ids de um INSERT em lote; os signals de
+            # cada save() são agrupados pelo `contabilizacao_em_lote`.
+            for tarefa in novas:
+                tarefa.save(force_insert=True)
+
+    if atualizar:
+        agora = timezone.now()
+        campos = {"atualizado_em"}
+        for _, tarefa, dados in atualizar:
+            if "status" in dados and dados["status"] != tarefa.status:
+                deltas[(usuario.id, tarefa.status)] -= 1
+                deltas[(usuario.id, dados["status"])] += 1
+            if CAMPOS_TEXTO & dados.keys():
+                reindexar.append(tarefa)
+            for campo, valor in dados.items():
+                setattr(tarefa, campo, valor)
+            tarefa.atualizado_em = agora
+            campos.update(dados)
+
+        Tarefa.objects.bulk_update(
+            [tarefa for _, tarefa, _ in atualizar],
+            sorted(campos),
+            batch_size=TAMANHO_LOTE_SQL,
+        )
+        notificar_tarefas(
+            usuario.id, "salva", [tarefa.pk for _, tarefa, _ in atualizar]
+        )
+
+    if excluir:
+        # O DELETE em massa ainda dispara post_delete por tarefa, mas os
+        # ajustes dos signals são agrupados pelo `contabilizacao_em_lote`.
+        Tarefa.objects.filter(pk__in=[tarefa.pk for _, tarefa in excluir]).delete()
+
+    if reindexar:
+        get_search_backend().indexar(reindexar)
+    ajustar_contadores(deltas)
+    incrementar_versoes([usuario.id])
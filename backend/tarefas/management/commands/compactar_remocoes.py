@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from tarefas.sincronizacao import compactar_remocoes, retencao
+
+
+class Command(BaseCommand):
+    help = (
+        "Apaga as lapides de tarefas removidas mais antigas que a janela de "
+        "retencao da sincronizacao (TAREFAS_SYNC_RETENCAO_DIAS)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lote",
+            type=int,
+            default=1000,
+            help="Quantidade de lapides apagadas por DELETE.",
+        )
+
+    def handle(self, *args, **options):
+        total = compactar_remocoes(lote=options["lote"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{total} lapide(s) anterior(es) a {retencao().days} dia(s) apagada(s)."
+            )
+        )
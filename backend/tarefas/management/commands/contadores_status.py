@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tarefas.contadores import divergencias, reconstruir_contadores
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstroi os contadores de tarefas por usuario/status a partir da "
+        "tabela de tarefas, ou apenas verifica divergencias (--verificar)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verificar",
+            action="store_true",
+            help="Apenas compara os contadores com a tabela de tarefas.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["verificar"]:
+            reconstruir_contadores()
+            self.stdout.write(self.style.SUCCESS("Contadores reconstruidos."))
+            return
+
+        diferencas = divergencias()
+        if not diferencas:
+            self.stdout.write(self.style.SUCCESS("Contadores consistentes."))
+            return
+
+        for (usuario_id, status), (armazenado, real) in sorted(diferencas.items()):
+            self.stdout.write(
+                f"usuario={usuario_id} status={status}: contador={armazenado} real={real}"
+            )
+        raise CommandError(
+            f"{len(diferencas)} contador(es) divergente(s). "
+            "Rode o comando sem --verificar para reconstruir."
+        )
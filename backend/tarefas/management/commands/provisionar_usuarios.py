@@ -0,0 +1,72 @@
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ParseError
+
+from tarefas.provisionamento import (
+    LEITORES,
+    PROVISIONAMENTO_MAXIMO,
+    pool_de_hash,
+    provisionar_usuarios,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Cria usuarios (e perfis) em lote a partir de um arquivo CSV ou NDJSON "
+        "com os campos nome, email e password. Linhas invalidas sao "
+        "reportadas e nao impedem as demais."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("arquivo", help="Caminho do arquivo .csv ou .ndjson.")
+        parser.add_argument(
+            "--formato",
+            choices=sorted(LEITORES),
+            help="Formato do arquivo (padrao: pela extensao).",
+        )
+        parser.add_argument(
+            "--lote",
+            type=int,
+            default=PROVISIONAMENTO_MAXIMO,
+            help="Registros gravados por transacao.",
+        )
+        parser.add_argument(
+            "--processos",
+            type=int,
+            help="Processos para o hash das senhas (padrao: o numero de CPUs).",
+        )
+
+    def handle(self, *args, **options):
+        arquivo = options["arquivo"]
+        formato = options["formato"] or arquivo.rsplit(".", 1)[-1].lower()
+        if formato not in LEITORES:
+            raise CommandError(
+                "Formato nao reconhecido; informe --formato "
+                f"({', '.join(sorted(LEITORES))})."
+            )
+
+        criados = erros = 0
+        try:
+            with open(arquivo, encoding="utf-8-sig", newline="") as linhas:
+                registros = LEITORES[formato](linhas)
+                with pool_de_hash(options["processos"]) as pool:
+                    while lote := list(islice(registros, options["lote"])):
+                        novos, resultados = provisionar_usuarios(lote, pool)
+                        criados += novos
+                        for resultado in resultados:
+                            if resultado["status"] != 201:
+                                erros += 1
+                                self.stderr.write(
+                                    f"linha {resultado['linha']}: {resultado['erros']}"
+                                )
+        except OSError as exc:
+            raise CommandError(f"Nao foi possivel ler {arquivo}: {exc}")
+        except ParseError as exc:
+            raise CommandError(str(exc.detail))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{criados} usuario(s) criado(s), {erros} linha(s) com erro."
+            )
+        )
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from tarefas.models import Tarefa
+from tarefas.search import IndiceInvertidoBackend, get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Reconstroi o indice invertido da busca textual de tarefas."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lote",
+            type=int,
+            default=1000,
+            help="Quantidade de tarefas reindexadas por vez (padrao: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        if not isinstance(backend, IndiceInvertidoBackend):
+            self.stdout.write(
+                self.style.NOTICE(
+                    f"Backend {type(backend).__name__} nao usa indice proprio; nada a fazer."
+                )
+            )
+            return
+
+        tamanho_lote = options["lote"]
+        total = 0
+        ultimo_id = 0
+
+        # Percorre por id (keyset) para manter o uso de memoria constante
+        while True:
+            lote = list(
+                Tarefa.objects.filter(id__gt=ultimo_id)
+                .order_by("id")
+                .only("id", "usuario_id", "titulo", "descricao")[:tamanho_lote]
+            )
+            if not lote:
+                break
+            backend.indexar(lote)
+            total += len(lote)
+            ultimo_id = lote[-1].id
+
+        self.stdout.write(self.style.SUCCESS(f"{total} tarefas reindexadas."))
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tarefas", "0002_comentario"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="tarefa",
+            index=models.Index(
+                fields=["usuario", "criado_em"],
+                name="tarefa_usuario_criado_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tarefa",
+            index=models.Index(
+                fields=["usuario", "status", "criado_em"],
+                name="tarefa_usr_status_criado_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tarefa",
+            index=models.Index(
+                fields=["usuario", "prioridade", "criado_em"],
+                name="tarefa_usr_prior_criado_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tarefa",
+            index=models.Index(
+                fields=["usuario", "status", "prioridade", "criado_em"],
+                name="tarefa_usr_st_pr_criado_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,156 @@
+import re
+import unicodedata
+from collections import Counter
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Cópia congelada do tokenizador de `tarefas.search` na época desta migração:
+# migrações não importam código do app, que pode mudar depois. Se o
+# tokenizador mudar, o índice existente é refeito por uma migração nova.
+STOPWORDS = frozenset(
+    """
+    a ao aos as com da das de do dos e em na nas no nos o os ou para pela
+    pelas pelo pelos por pra que se sem um uma umas uns
+    """.split()
+)
+SUFIXOS_PLURAL = (
+    ("oes", "ao"),
+    ("aes", "ao"),
+    ("ais", "al"),
+    ("eis", "el"),
+    ("ois", "ol"),
+    ("res", "r"),
+    ("zes", "z"),
+    ("les", "l"),
+    ("ns", "m"),
+)
+
+
+def radical(termo):
+    if len(termo) <= 4 or not termo.endswith("s"):
+        return termo
+    for sufixo, troca in SUFIXOS_PLURAL:
+        if termo.endswith(sufixo):
+            return termo[: -len(sufixo)] + troca
+    return termo[:-1]
+
+
+def tokenizar(texto):
+    decomposto = unicodedata.normalize("NFKD", texto or "")
+    texto = "".join(c for c in decomposto if not unicodedata.combining(c))
+    termos = []
+    for palavra in re.findall(r"\w+", texto.casefold()):
+        if palavra in STOPWORDS or (len(palavra) < 2 and not palavra.isdigit()):
+            continue
+        termos.append(radical(palavra)[:64])
+    return termos
+
+
+def termos_da_tarefa(titulo, descricao):
+    pesos = Counter()
+    for termo in tokenizar(titulo):
+        pesos[termo] += 3
+    for termo in tokenizar(descricao):
+        pesos[termo] += 1
+    return dict(pesos)
+
+
+def criar_indice_busca(apps, schema_editor):
+    """
+    No MySQL a busca usa FULLTEXT direto na tabela `tarefa`; nos demais
+    bancos, popula o índice invertido com as tarefas já existentes.
+    """
+    if schema_editor.connection.vendor == "mysql":
+        schema_editor.execute(
+            "ALTER TABLE tarefa ADD FULLTEXT INDEX tarefa_busca_ft (titulo, descricao)"
+        )
+        return
+
+    Tarefa = apps.get_model("tarefas", "Tarefa")
+    TermoTarefa = apps.get_model("tarefas", "TermoTarefa")
+    db_alias = schema_editor.connection.alias
+
+    lote = []
+    tarefas = Tarefa.objects.using(db_alias).values_list(
+        "id", "usuario_id", "titulo", "descricao"
+    )
+    for tarefa_id, usuario_id, titulo, descricao in tarefas.iterator(chunk_size=2000):
+        for termo, peso in termos_da_tarefa(titulo, descricao).items():
+            lote.append(
+                TermoTarefa(
+                    tarefa_id=tarefa_id,
+                    usuario_id=usuario_id,
+                    termo=termo,
+                    peso=peso,
+                )
+            )
+        if len(lote) >= 5000:
+            TermoTarefa.objects.using(db_alias).bulk_create(lote)
+            lote = []
+    TermoTarefa.objects.using(db_alias).bulk_create(lote)
+
+
+def remover_indice_busca(apps, schema_editor):
+    if schema_editor.connection.vendor == "mysql":
+        schema_editor.execute("ALTER TABLE tarefa DROP INDEX tarefa_busca_ft")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tarefas", "0003_indices_tarefa"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TermoTarefa",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("termo", models.CharField(max_length=64)),
+                ("peso", models.PositiveIntegerField()),
+                (
+                    "tarefa",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="termos",
+                        to="tarefas.tarefa",
+                    ),
+                ),
+                (
+                    "usuario",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "tarefa_termo",
+                "indexes": [
+                    models.Index(
+                        fields=["usuario", "termo"],
+                        name="tarefa_termo_usr_termo_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("tarefa", "termo"),
+                        name="tarefa_termo_unico",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(criar_indice_busca, remover_indice_busca),
+    ]
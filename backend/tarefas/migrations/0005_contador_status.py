@@ -0,0 +1,80 @@
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def popular_contadores(apps, schema_editor):
+    Tarefa = apps.get_model("tarefas", "Tarefa")
+    ContadorStatus = apps.get_model("tarefas", "ContadorStatus")
+    db_alias = schema_editor.connection.alias
+
+    linhas = (
+        Tarefa.objects.using(db_alias)
+        .order_by()
+        .values_list("usuario_id", "status")
+        .annotate(total=Count("id"))
+    )
+    ContadorStatus.objects.using(db_alias).bulk_create(
+        [
+            ContadorStatus(usuario_id=usuario_id, status=status, total=total)
+            for usuario_id, status, total in linhas
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tarefas", "0004_busca_textual"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContadorStatus",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("PENDENTE", "Pendente"),
+                            ("EM_ANDAMENTO", "Em andamento"),
+                            ("CONCLUIDA", "Concluída"),
+                            ("CANCELADA", "Cancelada"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("total", models.IntegerField(default=0)),
+                (
+                    "usuario",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "tarefa_contador_status",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("usuario", "status"),
+                        name="tarefa_contador_usr_status_uniq",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(popular_contadores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tarefas", "0006_versao_tarefas"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="tarefa",
+            index=models.Index(
+                fields=["usuario", "atualizado_em"],
+                name="tarefa_usuario_atualizado_idx",
+            ),
+        ),
+        migrations.CreateModel(
+            name="TarefaRemovida",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("tarefa_id", models.BigIntegerField()),
+                (
+                    "motivo",
+                    models.CharField(
+                        choices=[
+                            ("EXCLUIDA", "Excluída"),
+                            ("ATRIBUIDA", "Atribuída a outro usuário"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("removida_em", models.DateTimeField(auto_now_add=True)),
+                (
+                    "usuario",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "tarefa_removida",
+                "indexes": [
+                    models.Index(
+                        fields=["usuario", "removida_em"],
+                        name="tarefa_rem_usr_removida_idx",
+                    ),
+                    models.Index(
+                        fields=["removida_em"], name="tarefa_rem_removida_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
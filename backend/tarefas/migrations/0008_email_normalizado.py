@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def popular_emails(apps, schema_editor):
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+    EmailNormalizado = apps.get_model("tarefas", "EmailNormalizado")
+    db_alias = schema_editor.connection.alias
+
+    # Se dois usuários tiverem o mesmo e-mail com caixas diferentes, o mais
+    # antigo fica com o registro (antes, o login por e-mail falhava).
+    vistos = set()
+    registros = []
+    for usuario_id, email in (
+        User.objects.using(db_alias)
+        .exclude(email="")
+        .order_by("id")
+        .values_list("id", "email")
+        .iterator(chunk_size=1000)
+    ):
+        normalizado = email.strip().lower()
+        if normalizado in vistos:
+            continue
+        vistos.add(normalizado)
+        registros.append(EmailNormalizado(usuario_id=usuario_id, email=normalizado))
+
+    EmailNormalizado.objects.using(db_alias).bulk_create(registros, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tarefas", "0007_sincronizacao"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EmailNormalizado",
+            fields=[
+                (
+                    "usuario",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="email_normalizado",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("email", models.CharField(max_length=254, unique=True)),
+            ],
+            options={
+                "db_table": "usuario_email_normalizado",
+            },
+        ),
+        migrations.RunPython(popular_emails, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tarefas", "0008_email_normalizado"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comentario",
+            index=models.Index(
+                fields=["tarefa", "criado_em"],
+                name="comentario_tarefa_criado_idx",
+            ),
+        ),
+    ]
@@ -1,5 +1,5 @@
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, transaction
 
 
 class UsuarioPerfil(models.Model):
@@ -17,6 +17,33 @@ class UsuarioPerfil(models.Model):
         return self.nome or self.user.get_username()
 
 
+class EmailNormalizado(models.Model):
+    """
+    E-mail do usuário em minúsculas, com índice único, para buscas por
+    igualdade (login, registro, atribuição). O `email__iexact` vira
+    UPPER(email) no SQL e não usa índice. Mantido pelo signal de post_save
+    de User; usuários sem e-mail não têm registro.
+    """
+
+    usuario = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="email_normalizado",
+    )
+    email = models.CharField(max_length=254, unique=True)
+
+    class Meta:
+        db_table = "usuario_email_normalizado"
+
+    def __str__(self):
+        return self.email
+
+    @staticmethod
+    def normalizar(email):
+        return (email or "").strip().lower()
+
+
 class Tarefa(models.Model):
     class Status(models.TextChoices):
         PENDENTE = "PENDENTE", "Pendente"
@@ -52,10 +79,73 @@ class Tarefa(models.Model):
     class Meta:
         db_table = "tarefa"
         ordering = ["-criado_em"]
+        # Índices alinhados aos caminhos de acesso de TarefaViewSet/DashboardView:
+        # sempre filtram por usuário, opcionalmente por status/prioridade, e
+        # ordenam por criado_em (o id entra implicitamente como desempate).
+        indexes = [
+            models.Index(
+                fields=["usuario", "criado_em"],
+                name="tarefa_usuario_criado_idx",
+            ),
+            models.Index(
+                fields=["usuario", "status", "criado_em"],
+                name="tarefa_usr_status_criado_idx",
+            ),
+            models.Index(
+                fields=["usuario", "prioridade", "criado_em"],
+                name="tarefa_usr_prior_criado_idx",
+            ),
+            models.Index(
+                fields=["usuario", "status", "prioridade", "criado_em"],
+                name="tarefa_usr_st_pr_criado_idx",
+            ),
+            # Sincronização incremental: (atualizado_em, id) por usuário
+            models.Index(
+                fields=["usuario", "atualizado_em"],
+                name="tarefa_usuario_atualizado_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.titulo} ({self.get_status_display()})"
 
+    def _travar_estado(self, using):
+        """
+        (usuario, status) atuais da linha, com lock até o fim da transação.
+        O estado de quando a instância foi carregada não serve: duas
+        requisições concorrentes que leram o mesmo status descontariam ambas
+        dele, e os contadores, versões, lápides e eventos derivam daqui.
+        """
+        return (
+            Tarefa.objects.using(using)
+            .select_for_update()
+            .filter(pk=self.pk)
+            .values_list("usuario_id", "status")
+            .first()
+        )
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get("using")
+        with transaction.atomic(using=using):
+            self._estado_salvo = (
+                None if self._state.adding else self._travar_estado(using)
+            )
+            # Os receivers de post_save (contadores, índice de busca) rodam
+            # dentro desta mesma transação.
+            super().save(*args, **kwargs)
+        self._estado_salvo = (self.usuario_id, self.status)
+
+    def delete(self, *args, **kwargs):
+        using = kwargs.get("using")
+        with transaction.atomic(using=using):
+            # Os receivers de post_delete contabilizam o estado gravado, não
+            # o da instância, que pode estar desatualizada
+            estado = self._travar_estado(using)
+            if estado is None:
+                return 0, {}
+            self.usuario_id, self.status = estado
+            return super().delete(*args, **kwargs)
+
 
 class Comentario(models.Model):
     tarefa = models.ForeignKey(
@@ -74,6 +164,138 @@ class Comentario(models.Model):
     class Meta:
         db_table = "comentario"
         ordering = ["-criado_em"]
+        # Listagem paginada dos comentários de uma tarefa por (criado_em, id);
+        # o id entra implicitamente como desempate
+        indexes = [
+            models.Index(
+                fields=["tarefa", "criado_em"],
+                name="comentario_tarefa_criado_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Comentário de {self.usuario_id} na tarefa {self.tarefa_id}"
+
+
+class TermoTarefa(models.Model):
+    """
+    Índice invertido da busca textual: um registro por termo normalizado
+    de cada tarefa, com peso maior para termos do título. O `usuario` é
+    desnormalizado para que a busca seja um lookup em (usuario, termo).
+    """
+
+    tarefa = models.ForeignKey(
+        Tarefa,
+        on_delete=models.CASCADE,
+        related_name="termos",
+    )
+    usuario = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    termo = models.CharField(max_length=64)
+    peso = models.PositiveIntegerField()
+
+    class Meta:
+        db_table = "tarefa_termo"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tarefa", "termo"],
+                name="tarefa_termo_unico",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["usuario", "termo"],
+                name="tarefa_termo_usr_termo_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.termo} ({self.tarefa_id})"
+
+
+class ContadorStatus(models.Model):
+    """
+    Total de tarefas por (usuario, status), mantido incrementalmente na
+    mesma transação de cada alteração de Tarefa. Reconstruído/verificado
+    pelo comando `contadores_status`.
+    """
+
+    usuario = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    status = models.CharField(max_length=20, choices=Tarefa.Status.choices)
+    total = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = "tarefa_contador_status"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["usuario", "status"],
+                name="tarefa_contador_usr_status_uniq",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.usuario_id} {self.status}: {self.total}"
+
+
+class VersaoTarefas(models.Model):
+    """
+    Versão do conjunto de tarefas de um usuário: incrementada a cada
+    alteração que muda o que o usuário enxerga. Base dos ETags da listagem
+    e do dashboard.
+    """
+
+    usuario = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="+",
+    )
+    versao = models.PositiveBigIntegerField(default=0)
+    atualizado_em = models.DateTimeField()
+
+    class Meta:
+        db_table = "tarefa_versao_usuario"
+
+    def __str__(self):
+        return f"{self.usuario_id} v{self.versao}"
+
+
+class TarefaRemovida(models.Model):
+    """
+    Lápide de uma tarefa que saiu do conjunto de um usuário (excluída ou
+    atribuída a outra pessoa), para que a sincronização incremental avise o
+    cliente. Fica disponível pela janela de retenção e depois é compactada.
+    """
+
+    class Motivo(models.TextChoices):
+        EXCLUIDA = "EXCLUIDA", "Excluída"
+        ATRIBUIDA = "ATRIBUIDA", "Atribuída a outro usuário"
+
+    usuario = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    tarefa_id = models.BigIntegerField()
+    motivo = models.CharField(max_length=10, choices=Motivo.choices)
+    removida_em = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "tarefa_removida"
+        indexes = [
+            models.Index(
+                fields=["usuario", "removida_em"],
+                name="tarefa_rem_usr_removida_idx",
+            ),
+            models.Index(fields=["removida_em"], name="tarefa_rem_removida_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.tarefa_id} ({self.get_motivo_display()})"
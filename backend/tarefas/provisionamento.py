@@ -0,0 +1,303 @@
+"""
+Criação de usuários em lote a partir de CSV ou NDJSON (uma linha por
+usuário, com `nome`, `email` e `password`).
+
+Em vez do fluxo do registro repetido por linha (exists + hash + 2 INSERTs),
+o lote valida tudo em memória, descobre os e-mails já cadastrados com uma
+única consulta, calcula os hashes em paralelo em processos separados e grava
+`User`, `UsuarioPerfil` e `EmailNormalizado` com bulk_create. Linhas
+inválidas não impedem as demais: cada uma recebe seu resultado.
+"""
+
+import csv
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import get_context
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.contrib.auth.models import User
+from django.db import IntegrityError, connection, transaction
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+from .models import EmailNormalizado, UsuarioPerfil
+from .serializers import UsuarioProvisionamentoSerializer
+
+PROVISIONAMENTO_MAXIMO = 1000
+TAMANHO_LOTE_SQL = 500
+# Hashes por tarefa enviada a um processo: poucos o bastante para dividir
+# bem o trabalho, muitos o bastante para diluir o custo de comunicação.
+HASHES_POR_ENVIO = 16
+PROCESSOS_REQUISICAO_PADRAO = 2
+
+COLUNAS = ("nome", "email", "password")
+
+
+def ler_csv(linhas):
+    """
+    Lê CSV com cabeçalho. Devolve (linha, dados, erros) por registro, com o
+    número da linha no arquivo (o cabeçalho é a linha 1).
+    """
+    leitor = csv.DictReader(linhas)
+    cabecalho = leitor.fieldnames or ()
+    faltando = [coluna for coluna in COLUNAS if coluna not in cabecalho]
+    if faltando:
+        raise ParseError(f"Cabeçalho sem a(s) coluna(s): {', '.join(faltando)}.")
+
+    for registro in leitor:
+        dados = {coluna: registro.get(coluna) or "" for coluna in COLUNAS}
+        yield leitor.line_num, dados, None
+
+
+def ler_ndjson(linhas):
+    """Lê um objeto JSON por linha, ignorando linhas em branco."""
+    for numero, texto in enumerate(linhas, start=1):
+        if not texto.strip():
+            continue
+        try:
+            dados = json.loads(texto)
+        except ValueError:
+            yield numero, None, {"detail": "JSON inválido."}
+            continue
+        if not isinstance(dados, dict):
+            yield numero, None, {"detail": "Cada linha deve ser um objeto."}
+            continue
+        yield numero, dados, None
+
+
+LEITORES = {"csv": ler_csv, "ndjson": ler_ndjson}
+
+
+class _ParserProvisionamento(BaseParser):
+    formato = None
+    # Subclasses de outros importadores trocam os leitores
+    leitores = LEITORES
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if encoding.lower().replace("-", "") == "utf8":
+            encoding = "utf-8-sig"  # planilhas exportadas costumam ter BOM
+        try:
+            texto = stream.read().decode(encoding)
+        except UnicodeDecodeError as exc:
+            raise ParseError(f"Arquivo com codificação inválida - {exc}")
+        return list(self.leitores[self.formato](texto.splitlines(keepends=True)))
+
+
+class CSVParser(_ParserProvisionamento):
+    media_type = "text/csv"
+    formato = "csv"
+
+
+class NDJSONParser(_ParserProvisionamento):
+    media_type = "application/x-ndjson"
+    formato = "ndjson"
+
+
+def _novo_pool(processos):
+    # `spawn` não herda o estado do servidor (threads, conexões); os
+    # processos só importam `django.contrib.auth.hashers`
+    return ProcessPoolExecutor(processos, mp_context=get_context("spawn"))
+
+
+@contextmanager
+def pool_de_hash(processos=None):
+    """
+    Pool de processos próprio para os hashes de um comando (None com um
+    processo só); padrão: um processo por CPU.
+
+    O bcrypt é CPU puro: em processos, o lote usa todos os núcleos sem
+    disputar o pool de senhas do login.
+    """
+    processos = processos or os.cpu_count() or 1
+    if processos <= 1:
+        yield None
+        return
+    with _novo_pool(processos) as pool:
+        yield pool
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def pool_da_requisicao():
+    """
+    Pool de processos compartilhado pelas requisições do processo web, com
+    `TAREFAS_PROVISIONAMENTO_PROCESSOS` processos (padrão 2), criado na
+    primeira chamada: a API não sobe um pool por requisição nem ocupa todos
+    os núcleos do servidor. None com um processo só (hash na própria thread).
+    """
+    global _pool
+    processos = getattr(
+        settings, "TAREFAS_PROVISIONAMENTO_PROCESSOS", PROCESSOS_REQUISICAO_PADRAO
+    )
+    if processos <= 1:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = _novo_pool(processos)
+    return _pool
+
+
+def gerar_hashes(senhas, pool=None):
+    hasher = get_hasher("default")
+    # O sal vem do processo principal; os processos só executam o `encode`
+    sais = [hasher.salt() for _ in senhas]
+    # Com poucos hashes, subir um processo custa mais que calculá-los aqui.
+    # O executor só inicia processos quando recebe trabalho.
+    if pool is None or len(senhas) <= HASHES_POR_ENVIO:
+        return list(map(hasher.encode, senhas, sais))
+    return list(pool.map(hasher.encode, senhas, sais, chunksize=HASHES_POR_ENVIO))
+
+
+def _erro(linha, erros):
+    return {"linha": linha, "status": 400, "erros": erros}
+
+
+def _ja_cadastrados(normalizados, usernames):
+    """E-mails normalizados e usernames já em uso, em uma única consulta."""
+    emails = EmailNormalizado.objects.filter(email__in=normalizados).values_list(
+        "email", flat=True
+    )
+    nomes = User.objects.filter(username__in=usernames).values_list(
+        "username", flat=True
+    )
+    return set(emails.union(nomes))
+
+
+def provisionar_usuarios(registros, pool=None):
+    """
+    Cria os usuários válidos de `registros` ((linha, dados, erros), como os
+    devolvidos por `ler_csv`/`ler_ndjson`). Retorna (criados, resultados),
+    com um resultado por registro, na ordem recebida.
+    """
+    resultados = []
+    validos = []
+    for linha, dados, erros in registros:
+        if erros is None:
+            serializer = UsuarioProvisionamentoSerializer(data=dados)
+            if serializer.is_valid():
+                resultados.append(None)
+                indice = len(resultados) - 1
+                validos.append((indice, linha, serializer.validated_data))
+                continue
+            erros = serializer.errors
+        resultados.append(_erro(linha, erros))
+
+    for _, _, dados in validos:
+        dados["normalizado"] = EmailNormalizado.normalizar(dados["email"])
+        dados["username"] = User.normalize_username(dados["email"])
+    cadastrados = set()
+    if validos:
+        cadastrados = _ja_cadastrados(
+            [dados["normalizado"] for _, _, dados in validos],
+            [dados["username"] for _, _, dados in validos],
+        )
+
+    novos = []
+    vistos = set()
+    for indice, linha, dados in validos:
+        if dados["normalizado"] in cadastrados or dados["username"] in cadastrados:
+            resultados[indice] = _erro(linha, {"email": ["E-mail já cadastrado."]})
+        elif dados["normalizado"] in vistos:
+            resultados[indice] = _erro(
+                linha, {"email": ["E-mail repetido no arquivo."]}
+            )
+        else:
+            vistos.add(dados["normalizado"])
+            novos.append((indice, linha, dados))
+
+    if novos:
+        hashes = gerar_hashes([dados["password"] for _, _, dados in novos], pool)
+        for (_, _, dados), senha_hash in zip(novos, hashes):
+            dados["hash"] = senha_hash
+        novos = _gravar_sem_conflito(novos, resultados)
+
+    return len(novos), resultados
+
+
+def _gravar_sem_conflito(novos, resultados):
+    """
+    Grava `novos` e preenche seus resultados. Um registro ou outro
+    provisionamento pode cadastrar o mesmo e-mail entre `_ja_cadastrados` e
+    o INSERT: nesse caso o lote é desfeito, só as linhas que colidiram viram
+    400 e as demais são gravadas de novo. Devolve as linhas gravadas.
+    """
+    while novos:
+        usuarios = [
+            User(
+                username=dados["username"],
+                email=User.objects.normalize_email(dados["email"]),
+                password=dados["hash"],
+            )
+            for _, _, dados in novos
+        ]
+        try:
+            _gravar(usuarios, [dados for _, _, dados in novos])
+            break
+        except IntegrityError:
+            cadastrados = _ja_cadastrados(
+                [dados["normalizado"] for _, _, dados in novos],
+                [dados["username"] for _, _, dados in novos],
+            )
+            restantes = []
+            for indice, linha, dados in novos:
+                if (
+                    dados["normalizado"] in cadastrados
+                    or dados["username"] in cadastrados
+                ):
+                    resultados[indice] = _erro(
+                        linha, {"email": ["E-mail já cadastrado."]}
+                    )
+                else:
+                    restantes.append((indice, linha, dados))
+            if len(restantes) == len(novos):
+                raise  # conflito que não é de e-mail: não há o que separar
+            novos = restantes
+
+    for (indice, linha, _), usuario in zip(novos, usuarios):
+        resultados[indice] = {
+            "linha": linha,
+            "status": 201,
+            "id": usuario.pk,
+            "email": usuario.email,
+        }
+    return novos
+
+
+def _gravar(usuarios, dados):
+    # bulk_create não dispara o post_save do User: o EmailNormalizado, que o
+    # signal manteria, é gravado aqui junto com os perfis.
+    with transaction.atomic():
+        User.objects.bulk_create(usuarios, batch_size=TAMANHO_LOTE_SQL)
+        if not connection.features.can_return_rows_from_bulk_insert:
+            # MySQL não devolve os ids de um INSERT em lote
+            ids = dict(
+                User.objects.filter(
+                    username__in=[usuario.username for usuario in usuarios]
+                ).values_list("username", "id")
+            )
+            for usuario in usuarios:
+                usuario.pk = ids[usuario.username]
+
+        UsuarioPerfil.objects.bulk_create(
+            [
+                UsuarioPerfil(user_id=usuario.pk, nome=item["nome"])
+                for usuario, item in zip(usuarios, dados)
+            ],
+            batch_size=TAMANHO_LOTE_SQL,
+        )
+        EmailNormalizado.objects.bulk_create(
+            [
+                EmailNormalizado(usuario_id=usuario.pk, email=item["normalizado"])
+                for usuario, item in zip(usuarios, dados)
+            ],
+            batch_size=TAMANHO_LOTE_SQL,
+        )
@@ -0,0 +1,225 @@
+"""
+Backends da busca textual de tarefas (`search` em TarefaViewSet).
+
+- `MySQLFullTextBackend`: usa o índice FULLTEXT de (titulo, descricao)
+  criado pela migração no MySQL; a collation *_ai_ci já ignora acentos.
+- `IndiceInvertidoBackend`: índice próprio em `TermoTarefa`, mantido a cada
+  save/delete de Tarefa. Funciona em qualquer banco (inclusive SQLite).
+
+Consultas sem nenhum termo indexável (só stopwords ou letras soltas, como
+"de" ou "a") não passam pelo índice: caem no `icontains` em título e
+descrição, como a busca antiga, em vez de devolver todas as tarefas.
+
+O backend é escolhido por `TAREFAS_SEARCH_BACKEND` (caminho pontuado). Sem
+essa configuração, usa FULLTEXT no MySQL e o índice invertido nos demais.
+"""
+
+import re
+import unicodedata
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import OuterRef, Q, Subquery, Sum
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+PESO_TITULO = 3
+PESO_DESCRICAO = 1
+TAMANHO_MAXIMO_TERMO = 64
+
+STOPWORDS = frozenset(
+    """
+    a ao aos as com da das de do dos e em na nas no nos o os ou para pela
+    pelas pelo pelos por pra que se sem um uma umas uns
+    """.split()
+)
+
+# Redução simples de plural em português; aplicada igualmente na indexação
+# e na consulta, então só precisa ser consistente, não perfeita.
+_SUFIXOS_PLURAL = (
+    ("oes", "ao"),
+    ("aes", "ao"),
+    ("ais", "al"),
+    ("eis", "el"),
+    ("ois", "ol"),
+    ("res", "r"),
+    ("zes", "z"),
+    ("les", "l"),
+    ("ns", "m"),
+)
+
+
+def normalizar(texto: str) -> str:
+    """Remove acentos e normaliza caixa ("Ação" -> "acao")."""
+    decomposto = unicodedata.normalize("NFKD", texto)
+    sem_acento = "".join(c for c in decomposto if not unicodedata.combining(c))
+    return sem_acento.casefold()
+
+
+def radical(termo: str) -> str:
+    if len(termo) <= 4 or not termo.endswith("s"):
+        return termo
+    for sufixo, troca in _SUFIXOS_PLURAL:
+        if termo.endswith(sufixo):
+            return termo[: -len(sufixo)] + troca
+    return termo[:-1]
+
+
+def tokenizar(texto: str) -> list[str]:
+    termos = []
+    for palavra in re.findall(r"\w+", normalizar(texto or "")):
+        if palavra in STOPWORDS or (len(palavra) < 2 and not palavra.isdigit()):
+            continue
+        termos.append(radical(palavra)[:TAMANHO_MAXIMO_TERMO])
+    return termos
+
+
+def termos_da_tarefa(titulo: str, descricao: str) -> dict[str, int]:
+    pesos = Counter()
+    for termo in tokenizar(titulo):
+        pesos[termo] += PESO_TITULO
+    for termo in tokenizar(descricao):
+        pesos[termo] += PESO_DESCRICAO
+    return dict(pesos)
+
+
+# Stopwords padrão do InnoDB (INNODB_FT_DEFAULT_STOPWORD) e tamanho mínimo
+# de token (innodb_ft_min_token_size): termos assim não estão no índice
+# FULLTEXT, e um `+termo` com eles não casaria com nada.
+STOPWORDS_FULLTEXT = frozenset(
+    """
+    a about an are as at be by com de en for from how i in is it la of on or
+    that the this to was what when where who will with und www
+    """.split()
+)
+TAMANHO_MINIMO_FULLTEXT = 3
+
+
+def contendo(queryset, consulta):
+    """Filtro da busca antiga: `consulta` contida no título ou na descrição."""
+    return queryset.filter(
+        Q(titulo__icontains=consulta) | Q(descricao__icontains=consulta)
+    )
+
+
+def expressao_fulltext(consulta: str) -> str:
+    """
+    Expressão em modo booleano: todos os termos obrigatórios e o último por
+    prefixo. Termos fora do índice são descartados, exceto o último, que o
+    `*` mantém. Vazia se não sobrar termo indexável.
+    """
+    palavras = re.findall(r"\w+", consulta or "")
+    if not palavras:
+        return ""
+    *anteriores, ultima = palavras
+    termos = [
+        palavra
+        for palavra in anteriores
+        if len(palavra) >= TAMANHO_MINIMO_FULLTEXT
+        and palavra.casefold() not in STOPWORDS_FULLTEXT
+    ]
+    if len(ultima) < TAMANHO_MINIMO_FULLTEXT and not termos:
+        return ""
+    return " ".join(f"+{termo}" for termo in termos + [ultima]) + "*"
+
+
+class BaseSearchBackend:
+    def indexar(self, tarefas):
+        """Atualiza o índice das tarefas informadas (no-op por padrão)."""
+
+    def buscar(self, queryset, consulta, usuario_id):
+        """
+        Filtra `queryset` pelas tarefas que casam com `consulta` e o ordena
+        por relevância (desempate por criado_em mais recente).
+        """
+        raise NotImplementedError
+
+
+class IndiceInvertidoBackend(BaseSearchBackend):
+    def indexar(self, tarefas):
+        from .models import TermoTarefa
+
+        tarefas = [t for t in tarefas if t.pk is not None]
+        if not tarefas:
+            return
+
+        with transaction.atomic():
+            TermoTarefa.objects.filter(
+                tarefa_id__in=[t.pk for t in tarefas]
+            ).delete()
+            TermoTarefa.objects.bulk_create(
+                [
+                    TermoTarefa(
+                        tarefa_id=tarefa.pk,
+                        usuario_id=tarefa.usuario_id,
+                        termo=termo,
+                        peso=peso,
+                    )
+                    for tarefa in tarefas
+                    for termo, peso in termos_da_tarefa(
+                        tarefa.titulo, tarefa.descricao
+                    ).items()
+                ]
+            )
+
+    def buscar(self, queryset, consulta, usuario_id):
+        from .models import TermoTarefa
+
+        termos = list(dict.fromkeys(tokenizar(consulta)))
+        if not termos:
+            return contendo(queryset, consulta)
+
+        # Todos os termos precisam casar; o último também casa por prefixo,
+        # para a busca funcionar enquanto o usuário ainda está digitando.
+        condicoes = []
+        for posicao, termo in enumerate(termos):
+            if posicao == len(termos) - 1:
+                condicao = Q(termo__startswith=termo)
+            else:
+                condicao = Q(termo=termo)
+            condicoes.append(condicao)
+            queryset = queryset.filter(
+                id__in=TermoTarefa.objects.filter(
+                    condicao, usuario_id=usuario_id
+                ).values("tarefa_id")
+            )
+
+        qualquer_termo = Q()
+        for condicao in condicoes:
+            qualquer_termo |= condicao
+
+        relevancia = (
+            TermoTarefa.objects.filter(qualquer_termo, tarefa_id=OuterRef("pk"))
+            .values("tarefa_id")
+            .annotate(total=Sum("peso"))
+            .values("total")
+        )
+        return queryset.annotate(relevancia=Subquery(relevancia)).order_by(
+            "-relevancia", "-criado_em"
+        )
+
+
+class MySQLFullTextBackend(BaseSearchBackend):
+    def buscar(self, queryset, consulta, usuario_id):
+        expressao = expressao_fulltext(consulta)
+        if not expressao:
+            return contendo(queryset, consulta)
+        relevancia = RawSQL(
+            "MATCH (titulo, descricao) AGAINST (%s IN BOOLEAN MODE)",
+            (expressao,),
+        )
+        return (
+            queryset.annotate(relevancia=relevancia)
+            .filter(relevancia__gt=0)
+            .order_by("-relevancia", "-criado_em")
+        )
+
+
+def get_search_backend() -> BaseSearchBackend:
+    caminho = getattr(settings, "TAREFAS_SEARCH_BACKEND", None)
+    if caminho:
+        return import_string(caminho)()
+    if connection.vendor == "mysql":
+        return MySQLFullTextBackend()
+    return IndiceInvertidoBackend()
@@ -0,0 +1,154 @@
+"""
+Hash e verificação de senhas fora da thread da requisição.
+
+O bcrypt é lento de propósito e, sem limite, uma rajada de logins ocupa
+todos os workers com CPU e trava os demais endpoints. Aqui o trabalho vai
+para um pool de tamanho fixo (`TAREFAS_SENHAS_WORKERS`) com uma fila
+limitada (`TAREFAS_SENHAS_FILA_MAXIMA`): quando a fila está cheia, a
+requisição é recusada na hora com 503 + Retry-After em vez de esperar, e
+o mesmo acontece se o pedido passar mais de `TAREFAS_SENHAS_TIMEOUT`
+segundos na fila sem começar.
+O bcrypt libera o GIL, então as threads do pool rodam em paralelo.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import NamedTuple
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    check_password,
+    get_hasher,
+    identify_hasher,
+    make_password,
+)
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+TIMEOUT_PADRAO_SEGUNDOS = 10
+
+
+class SenhasSobrecarregadas(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = (
+        "Muitas requisições de autenticação no momento. "
+        "Tente novamente em instantes."
+    )
+    default_code = "senhas_sobrecarregadas"
+    # O exception handler do DRF envia `wait` como Retry-After
+    wait = 1
+
+
+class Tempo(NamedTuple):
+    espera: float  # na fila do pool
+    duracao: float  # do hash em si
+
+    def server_timing(self):
+        return (
+            f"senha-fila;dur={self.espera * 1000:.1f}, "
+            f"senha;dur={self.duracao * 1000:.1f}"
+        )
+
+
+class PoolSenhas:
+    def __init__(self, workers, fila_maxima):
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="senhas"
+        )
+        # Vagas = em execução + na fila. Um hash em andamento segue ocupando
+        # a vaga mesmo que quem pediu já tenha desistido por timeout.
+        self._vagas = threading.BoundedSemaphore(workers + fila_maxima)
+
+    def submeter(self, funcao, *args):
+        if not self._vagas.acquire(blocking=False):
+            raise SenhasSobrecarregadas()
+        try:
+            futuro = self._executor.submit(
+                self._cronometrar, funcao, args, time.perf_counter()
+            )
+        except BaseException:
+            self._vagas.release()
+            raise
+        # Libera a vaga ao terminar ou ao ser cancelado ainda na fila
+        futuro.add_done_callback(lambda _: self._vagas.release())
+        return futuro
+
+    @staticmethod
+    def _cronometrar(funcao, args, enfileirado_em):
+        inicio = time.perf_counter()
+        resultado = funcao(*args)
+        return resultado, Tempo(inicio - enfileirado_em, time.perf_counter() - inicio)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                workers = getattr(
+                    settings, "TAREFAS_SENHAS_WORKERS", min(4, os.cpu_count() or 1)
+                )
+                fila = getattr(settings, "TAREFAS_SENHAS_FILA_MAXIMA", workers * 8)
+                _pool = PoolSenhas(workers, fila)
+    return _pool
+
+
+def _timeout():
+    return getattr(settings, "TAREFAS_SENHAS_TIMEOUT", TIMEOUT_PADRAO_SEGUNDOS)
+
+
+def _executar(funcao, *args):
+    # O timeout vale só para a espera na fila: no prazo, o que ainda não
+    # começou é cancelado; um hash já em execução não é abandonado.
+    futuro = pool().submeter(funcao, *args)
+    try:
+        return futuro.result(timeout=_timeout())
+    except FutureTimeoutError:
+        if futuro.cancel():
+            raise SenhasSobrecarregadas()
+    return futuro.result()
+
+
+async def _aexecutar(funcao, *args):
+    concorrente = pool().submeter(funcao, *args)
+    futuro = asyncio.wrap_future(concorrente)
+    # asyncio.wait não cancela no timeout (wait_for cancelaria o hash)
+    feitos, _ = await asyncio.wait({futuro}, timeout=_timeout())
+    if not feitos and concorrente.cancel():
+        raise SenhasSobrecarregadas()
+    return await futuro
+
+
+def gerar_hash(senha):
+    """(hash, Tempo) com o hasher padrão."""
+    return _executar(make_password, senha)
+
+
+async def averificar_senha(usuario, senha):
+    """
+    Equivalente a `usuario.check_password`, com o hash no pool. Se o hash
+    gravado usa um hasher antigo ou parâmetros desatualizados, regrava com
+    o hasher padrão, como o Django faz.
+    """
+    valida, tempo = await _aexecutar(check_password, senha, usuario.password)
+    if valida and _precisa_atualizar(usuario.password):
+        usuario.password, _ = await _aexecutar(make_password, senha)
+        await usuario.asave(update_fields=["password"])
+    return valida, tempo
+
+
+def _precisa_atualizar(encoded):
+    preferido = get_hasher("default")
+    try:
+        atual = identify_hasher(encoded)
+    except ValueError:
+        return False
+    return atual.algorithm != preferido.algorithm or preferido.must_update(encoded)
@@ -2,7 +2,12 @@ from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
 
-from .models import Comentario, Tarefa, UsuarioPerfil
+from .models import Comentario, EmailNormalizado, Tarefa, UsuarioPerfil
+from .senhas import gerar_hash
+from .transicoes import TRANSICAO_MAXIMA, transicao_permitida
+
+COMENTARIOS_RECENTES_MAXIMO_TAREFAS = 100
+COMENTARIOS_RECENTES_LIMITE_MAXIMO = 20
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -30,7 +35,9 @@ class UsuarioRegisterSerializer(serializers.Serializer):
         return value
 
     def validate_email(self, value: str) -> str:
-        if User.objects.filter(email__iexact=value).exists():
+        if EmailNormalizado.objects.filter(
+            email=EmailNormalizado.normalizar(value)
+        ).exists():
             raise serializers.ValidationError("E-mail já cadastrado.")
         return value
 
@@ -48,17 +55,36 @@ class UsuarioRegisterSerializer(serializers.Serializer):
         email = validated_data["email"]
         password = validated_data["password"]
 
-        user = User.objects.create_user(
-            username=email,
-            email=email,
-            password=password,
+        # Hash no pool de senhas (limitado; 503 quando sobrecarregado)
+        senha_hash, self.tempo_senha = gerar_hash(password)
+        # Mesmo que create_user, mas com o hash já calculado
+        user = User(
+            username=User.normalize_username(email),
+            email=User.objects.normalize_email(email),
+            password=senha_hash,
         )
+        user.save()
         UsuarioPerfil.objects.create(user=user, nome=nome)
         return user
 
 
+class UsuarioProvisionamentoSerializer(UsuarioRegisterSerializer):
+    """
+    Regras do registro para uma linha do provisionamento em lote. A checagem
+    de e-mail já cadastrado é feita de uma vez para o lote todo.
+    """
+
+    def validate_email(self, value: str) -> str:
+        # O e-mail vira o username, que tem limite menor que o e-mail
+        if len(User.normalize_username(value)) > User._meta.get_field(
+            "username"
+        ).max_length:
+            raise serializers.ValidationError("E-mail muito longo.")
+        return value
+
+
 class TarefaSerializer(serializers.ModelSerializer):
-    usuario = serializers.ReadOnlyField(source="usuario.id")
+    usuario = serializers.ReadOnlyField(source="usuario_id")
 
     class Meta:
         model = Tarefa
@@ -100,27 +126,7 @@ class TarefaSerializer(serializers.ModelSerializer):
         new_status = attrs.get("status")
 
         if instance and new_status and new_status != instance.status:
-            old_status = instance.status
-            allowed_transitions = {
-                Tarefa.Status.PENDENTE: {
-                    Tarefa.Status.PENDENTE,
-                    Tarefa.Status.EM_ANDAMENTO,
-                    Tarefa.Status.CONCLUIDA,
-                },
-                Tarefa.Status.EM_ANDAMENTO: {
-                    Tarefa.Status.EM_ANDAMENTO,
-                    Tarefa.Status.CONCLUIDA,
-                },
-                Tarefa.Status.CONCLUIDA: {
-                    Tarefa.Status.CONCLUIDA,
-                },
-                # CANCELADA não faz parte do fluxo obrigatório, mas se usada é final
-                Tarefa.Status.CANCELADA: {
-                    Tarefa.Status.CANCELADA,
-                },
-            }
-
-            if new_status not in allowed_transitions.get(old_status, {old_status}):
+            if not transicao_permitida(instance.status, new_status):
                 raise serializers.ValidationError(
                     {"status": "Transição de status inválida."}
                 )
@@ -128,8 +134,32 @@ class TarefaSerializer(serializers.ModelSerializer):
         return attrs
 
 
+class TransicaoStatusSerializer(serializers.Serializer):
+    status = serializers.ChoiceField(choices=Tarefa.Status.choices)
+
+
+class TransicaoStatusLoteSerializer(TransicaoStatusSerializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=TRANSICAO_MAXIMA,
+    )
+
+
+class ComentariosRecentesSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=COMENTARIOS_RECENTES_MAXIMO_TAREFAS,
+    )
+    limite = serializers.IntegerField(
+        min_value=1, max_value=COMENTARIOS_RECENTES_LIMITE_MAXIMO, default=3
+    )
+
+
 class ComentarioSerializer(serializers.ModelSerializer):
-    usuario = serializers.ReadOnlyField(source="usuario.id")
+    # O id já está na FK: sem carregar o usuário de cada comentário
+    usuario = serializers.ReadOnlyField(source="usuario_id")
 
     class Meta:
         model = Comentario
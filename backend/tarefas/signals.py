@@ -0,0 +1,197 @@
+import logging
+from collections import Counter
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .contadores import ajustar_contadores, incrementar_versoes
+from .eventos import notificar_comentario, notificar_tarefas
+from .models import Comentario, EmailNormalizado, Tarefa, TarefaRemovida
+from .search import get_search_backend
+
+CAMPOS_INDEXADOS = {"titulo", "descricao", "usuario"}
+
+logger = logging.getLogger(__name__)
+
+
+def _exclusao_de_tarefa(origin):
+    """
+    Se a exclusão partiu de uma tarefa (instância ou queryset). Na cascata da
+    exclusão do próprio usuário não há o que contabilizar, e gravar contador
+    ou versão para ele violaria a FK no fim da transação.
+    """
+    modelo = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(modelo, Tarefa)
+
+
+@receiver(post_save, sender=Tarefa)
+def indexar_tarefa(sender, instance, update_fields=None, **kwargs):
+    # Saves parciais que não tocam em texto/dono (ex.: só status) não mudam o índice
+    if update_fields is not None and not CAMPOS_INDEXADOS & set(update_fields):
+        return
+    get_search_backend().indexar([instance])
+
+
+@receiver(post_save, sender=Tarefa)
+def contar_tarefa_salva(sender, instance, created, **kwargs):
+    anterior = None if created else getattr(instance, "_estado_salvo", None)
+    atual = (instance.usuario_id, instance.status)
+    if anterior == atual:
+        return
+
+    deltas = Counter({atual: 1})
+    if anterior is not None:
+        deltas[anterior] -= 1
+    ajustar_contadores(deltas)
+
+
+@receiver(post_delete, sender=Tarefa)
+def contar_tarefa_removida(sender, instance, origin=None, **kwargs):
+    if not _exclusao_de_tarefa(origin):
+        return
+    ajustar_contadores({(instance.usuario_id, instance.status): -1})
+
+
+@receiver(post_save, sender=Tarefa)
+def versionar_tarefa_salva(sender, instance, created, **kwargs):
+    anterior = None if created else getattr(instance, "_estado_salvo", None)
+    usuarios = {instance.usuario_id}
+    if anterior is not None:
+        usuarios.add(anterior[0])
+    incrementar_versoes(usuarios)
+
+
+@receiver(post_delete, sender=Tarefa)
+def versionar_tarefa_removida(sender, instance, origin=None, **kwargs):
+    if not _exclusao_de_tarefa(origin):
+        return
+    incrementar_versoes([instance.usuario_id])
+
+
+@receiver(post_save, sender=Tarefa)
+def registrar_remocao_por_atribuicao(sender, instance, created, **kwargs):
+    anterior = None if created else getattr(instance, "_estado_salvo", None)
+    if anterior is None or anterior[0] == instance.usuario_id:
+        return
+
+    TarefaRemovida.objects.create(
+        usuario_id=anterior[0],
+        tarefa_id=instance.pk,
+        motivo=TarefaRemovida.Motivo.ATRIBUIDA,
+    )
+    # Se a tarefa volta para quem já a tinha perdido, a lápide antiga some
+    TarefaRemovida.objects.filter(
+        usuario_id=instance.usuario_id, tarefa_id=instance.pk
+    ).delete()
+
+
+@receiver(post_delete, sender=Tarefa)
+def registrar_remocao_por_exclusao(sender, instance, origin=None, **kwargs):
+    if not _exclusao_de_tarefa(origin):
+        return
+    TarefaRemovida.objects.create(
+        usuario_id=instance.usuario_id,
+        tarefa_id=instance.pk,
+        motivo=TarefaRemovida.Motivo.EXCLUIDA,
+    )
+
+
+@receiver(post_save, sender=Tarefa)
+def publicar_tarefa_salva(sender, instance, created, **kwargs):
+    anterior = None if created else getattr(instance, "_estado_salvo", None)
+    notificar_tarefas(instance.usuario_id, "salva", [instance.pk])
+    if anterior is not None and anterior[0] != instance.usuario_id:
+        notificar_tarefas(anterior[0], "removida", [instance.pk])
+
+
+@receiver(post_delete, sender=Tarefa)
+def publicar_tarefa_removida(sender, instance, origin=None, **kwargs):
+    if not _exclusao_de_tarefa(origin):
+        return
+    notificar_tarefas(instance.usuario_id, "removida", [instance.pk])
+
+
+def _exclusao_de_comentario(origin):
+    """
+    Se a exclusão partiu de comentários. Na cascata da exclusão da tarefa,
+    a versão e o evento da própria tarefa já bastam.
+    """
+    modelo = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(modelo, Comentario)
+
+
+def _dono_do_comentario(instance):
+    """Dono da tarefa do comentário removido, consultado uma vez por instância."""
+    if not hasattr(instance, "_dono"):
+        instance._dono = (
+            Tarefa.objects.filter(pk=instance.tarefa_id)
+            .values_list("usuario_id", flat=True)
+            .first()
+        )
+    return instance._dono
+
+
+@receiver(post_save, sender=Comentario)
+def versionar_comentario_criado(sender, instance, created, **kwargs):
+    # A listagem pode trazer o resumo dos comentários (`?incluir=comentarios`)
+    if created:
+        incrementar_versoes([instance.tarefa.usuario_id])
+
+
+@receiver(post_delete, sender=Comentario)
+def versionar_comentario_removido(sender, instance, origin=None, **kwargs):
+    if not _exclusao_de_comentario(origin):
+        return
+    dono = _dono_do_comentario(instance)
+    if dono is not None:
+        incrementar_versoes([dono])
+
+
+@receiver(post_save, sender=Comentario)
+def publicar_comentario_criado(sender, instance, created, **kwargs):
+    if created:
+        notificar_comentario(instance, "criado", instance.tarefa.usuario_id)
+
+
+@receiver(post_delete, sender=Comentario)
+def publicar_comentario_removido(sender, instance, origin=None, **kwargs):
+    if not _exclusao_de_comentario(origin):
+        return
+    dono = _dono_do_comentario(instance)
+    if dono is not None:
+        notificar_comentario(instance, "removido", dono)
+
+
+@receiver(post_save, sender=User)
+def sincronizar_email_normalizado(
+    sender, instance, created, update_fields=None, **kwargs
+):
+    # Saves parciais sem o e-mail (ex.: last_login) não mudam nada
+    if update_fields is not None and "email" not in update_fields:
+        return
+
+    email = EmailNormalizado.normalizar(instance.email)
+    if not email:
+        EmailNormalizado.objects.filter(usuario=instance).delete()
+        return
+
+    try:
+        with transaction.atomic():
+            if created or not EmailNormalizado.objects.filter(
+                usuario=instance
+            ).update(email=email):
+                EmailNormalizado.objects.create(usuario=instance, email=email)
+    except IntegrityError:
+        # Outro usuário já tem esse e-mail (só possível fora do registro da
+        # API, ex.: admin ou shell): ele continua sendo o encontrado nas
+        # buscas por e-mail, e este mantém o e-mail normalizado anterior
+        # (desfeito pelo atomic), para não perder o acesso pelo login.
+        logger.warning(
+            "E-mail %r do usuário %s já pertence a outro usuário; mantido o "
+            "e-mail normalizado anterior.",
+            email,
+            instance.pk,
+        )
@@ -0,0 +1,190 @@
+import base64
+import binascii
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from stratasec.pagination import filtrar_apos
+
+from .leitura import leitura_tarefa
+from .models import Tarefa, TarefaRemovida
+
+LIMITE_SINCRONIZACAO = 500
+RETENCAO_PADRAO_DIAS = 30
+
+# Transações concorrentes podem gravar `atualizado_em`/`removida_em` um pouco
+# antes da emissão de um token e só ficar visíveis depois do commit. Ao
+# retomar de um token "em dia", relemos o que caiu nessa margem antes da
+# emissão; o cliente aplica as alterações de forma idempotente. Uma transação
+# que leve mais que a margem entre gravar `atualizado_em` e o commit não é
+# vista pela sincronização incremental (só pela completa).
+MARGEM_CONCORRENCIA = timedelta(seconds=5)
+
+
+class TokenInvalido(Exception):
+    pass
+
+
+class TokenExpirado(Exception):
+    pass
+
+
+def retencao():
+    dias = getattr(settings, "TAREFAS_SYNC_RETENCAO_DIAS", RETENCAO_PADRAO_DIAS)
+    return timedelta(days=dias)
+
+
+def _gravar_posicao(posicao):
+    return None if posicao is None else [posicao[0].isoformat(), posicao[1]]
+
+
+def codificar_token(token):
+    dados = {
+        "a": _gravar_posicao(token["alteradas"]),
+        "r": _gravar_posicao(token["removidas"]),
+        "c": int(token["em_dia"]),
+        "e": token["emitido_em"].isoformat(),
+    }
+    texto = json.dumps(dados, separators=(",", ":"))
+    return base64.urlsafe_b64encode(texto.encode("ascii")).decode("ascii")
+
+
+def _ler_data(texto):
+    # Sem fuso, a comparação com as datas do servidor levantaria TypeError
+    valor = parse_datetime(texto)
+    if valor is None or timezone.is_naive(valor):
+        raise ValueError(texto)
+    return valor
+
+
+def _ler_posicao(par):
+    return _ler_data(par[0]), int(par[1])
+
+
+def decodificar_token(texto):
+    try:
+        dados = json.loads(base64.urlsafe_b64decode(texto.encode("ascii")))
+        token = {
+            "alteradas": _ler_posicao(dados["a"]) if dados["a"] else None,
+            "removidas": _ler_posicao(dados["r"]),
+            "em_dia": bool(int(dados["c"])),
+            "emitido_em": _ler_data(dados["e"]),
+        }
+    except (
+        TypeError,
+        ValueError,
+        KeyError,
+        IndexError,
+        UnicodeEncodeError,
+        binascii.Error,
+    ):
+        raise TokenInvalido()
+    return token
+
+
+def _pagina(queryset, campo, posicao, corte, limite):
+    """
+    Próximos `limite` registros depois de `posicao` em (campo, id). Com
+    `corte`, a leitura recomeça nele se a posição já estiver dentro da margem.
+    """
+    queryset = queryset.order_by(campo, "id")
+    if posicao is not None:
+        valor, pk = posicao
+        if corte is not None and valor >= corte:
+            queryset = queryset.filter(**{f"{campo}__gte": corte})
+        else:
+            queryset = filtrar_apos(queryset, campo, valor, pk, False)
+    return queryset[: limite + 1]
+
+
+def alteracoes(usuario_id, texto_token=None, limite=None):
+    """
+    Alterações das tarefas do usuário desde o token: tarefas criadas ou
+    atualizadas (por `atualizado_em`, id) e ids removidos do seu conjunto
+    (lápides). Sem token, devolve todas as tarefas atuais e nenhuma lápide.
+
+    O cliente deve aplicar `removidas` antes de `alteradas` e repetir a
+    chamada com `proximo` enquanto `tem_mais` for verdadeiro.
+    """
+    limite = limite or LIMITE_SINCRONIZACAO
+    agora = timezone.now()
+    if texto_token:
+        token = decodificar_token(texto_token)
+        if token["emitido_em"] < agora - retencao():
+            raise TokenExpirado()
+    else:
+        # Sincronização completa: só interessam lápides a partir de agora
+        # (com a margem, para não perder exclusões concorrentes).
+        token = {
+            "alteradas": None,
+            "removidas": (agora - MARGEM_CONCORRENCIA, 0),
+            "em_dia": False,
+            "emitido_em": agora,
+        }
+
+    corte = token["emitido_em"] - MARGEM_CONCORRENCIA if token["em_dia"] else None
+    linhas = list(
+        _pagina(
+            leitura_tarefa.consultar(Tarefa.objects.filter(usuario_id=usuario_id)),
+            "atualizado_em",
+            token["alteradas"],
+            corte,
+            limite,
+        )
+    )
+    lapides = list(
+        _pagina(
+            TarefaRemovida.objects.filter(usuario_id=usuario_id).values(
+                "id", "tarefa_id", "removida_em"
+            ),
+            "removida_em",
+            token["removidas"],
+            corte,
+            limite,
+        )
+    )
+
+    tem_mais = len(linhas) > limite or len(lapides) > limite
+    linhas, lapides = linhas[:limite], lapides[:limite]
+
+    proximo = {
+        "alteradas": (
+            (linhas[-1]["atualizado_em"], linhas[-1]["id"])
+            if linhas
+            else token["alteradas"]
+        ),
+        "removidas": (
+            (lapides[-1]["removida_em"], lapides[-1]["id"])
+            if lapides
+            else token["removidas"]
+        ),
+        "em_dia": not tem_mais,
+        # Enquanto houver páginas, a garantia de retenção continua sendo a
+        # do token original; só avança quando o cliente fica em dia.
+        "emitido_em": token["emitido_em"] if tem_mais else agora,
+    }
+
+    return {
+        "alteradas": leitura_tarefa.serializar(linhas),
+        "removidas": [lapide["tarefa_id"] for lapide in lapides],
+        "proximo": codificar_token(proximo),
+        "tem_mais": tem_mais,
+    }
+
+
+def compactar_remocoes(lote=1000):
+    """Apaga as lápides fora da janela de retenção; devolve quantas apagou."""
+    limite = timezone.now() - retencao()
+    total = 0
+    while True:
+        ids = list(
+            TarefaRemovida.objects.filter(removida_em__lt=limite)
+            .order_by("removida_em")
+            .values_list("id", flat=True)[:lote]
+        )
+        if not ids:
+            return total
+        total += TarefaRemovida.objects.filter(id__in=ids).delete()[0]
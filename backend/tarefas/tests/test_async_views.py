@@ -0,0 +1,94 @@
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tarefas.models import Comentario, Tarefa, UsuarioPerfil
+
+
+class ViewsAssincronasTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="async@test.com",
+            email="async@test.com",
+            password="Teste@123",
+        )
+        UsuarioPerfil.objects.create(user=self.user, nome="Async")
+        self.tarefas = [
+            Tarefa.objects.create(
+                usuario=self.user,
+                titulo=f"Tarefa assíncrona {i}",
+                descricao="Descrição da tarefa assíncrona.",
+            )
+            for i in range(12)
+        ]
+        Comentario.objects.create(
+            tarefa=self.tarefas[0], usuario=self.user, texto="Comentário"
+        )
+
+        token = str(AccessToken.for_user(self.user))
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def _asgi(self, url, **kwargs):
+        return async_to_sync(self.async_client.get)(
+            url, headers={**self.headers, **kwargs.pop("headers", {})}, **kwargs
+        )
+
+    def test_mesmas_respostas_sob_wsgi_e_asgi(self) -> None:
+        urls = [
+            "/api/tarefas/",
+            "/api/tarefas/?page=2&status=PENDENTE",
+            "/api/tarefas/?pagination=cursor&count=true",
+            f"/api/tarefas/{self.tarefas[0].id}/",
+            "/api/dashboard/",
+            "/api/auth/me/",
+            f"/api/tarefas/{self.tarefas[0].id}/comentarios/",
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                wsgi = self.client.get(url)
+                asgi = self._asgi(url)
+
+                self.assertEqual(asgi.status_code, status.HTTP_200_OK)
+                self.assertEqual(asgi.status_code, wsgi.status_code)
+                self.assertEqual(asgi.json(), wsgi.json())
+                self.assertEqual(asgi.get("ETag"), wsgi.get("ETag"))
+
+    def test_erros_sob_asgi(self) -> None:
+        sem_token = async_to_sync(self.async_client.get)("/api/tarefas/")
+        self.assertEqual(sem_token.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("WWW-Authenticate", sem_token)
+
+        token_invalido = async_to_sync(self.async_client.get)(
+            "/api/dashboard/", headers={"Authorization": "Bearer invalido"}
+        )
+        self.assertEqual(token_invalido.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.assertEqual(
+            self._asgi("/api/tarefas/999999/").status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+        self.assertEqual(
+            self._asgi("/api/tarefas/?page=99").status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+
+    def test_get_condicional_sob_asgi(self) -> None:
+        etag = self._asgi("/api/dashboard/")["ETag"]
+
+        response = self._asgi("/api/dashboard/", headers={"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_escritas_continuam_sincronas(self) -> None:
+        response = async_to_sync(self.async_client.post)(
+            "/api/tarefas/",
+            {"titulo": "Criada via ASGI", "descricao": "Descrição criada via ASGI."},
+            content_type="application/json",
+            headers=self.headers,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Tarefa.objects.filter(titulo="Criada via ASGI").exists())
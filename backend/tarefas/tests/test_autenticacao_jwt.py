@@ -0,0 +1,109 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from stratasec.authentication import (
+    JWTUsuarioLeveAuthentication,
+    limpar_cache_ativo,
+)
+from tarefas.models import Tarefa, UsuarioPerfil
+
+
+class JWTUsuarioLeveTests(APITestCase):
+    def setUp(self) -> None:
+        limpar_cache_ativo()
+        self.user = User.objects.create_user(
+            username="leve@test.com",
+            email="leve@test.com",
+            password="Teste@123",
+        )
+        UsuarioPerfil.objects.create(user=self.user, nome="Leve")
+        Tarefa.objects.create(
+            usuario=self.user,
+            titulo="Tarefa do token",
+            descricao="Descrição da tarefa do token.",
+        )
+        self._autenticar(self.user)
+
+    def _autenticar(self, user):
+        token = AccessToken.for_user(user)
+        token["email"] = user.email
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def _consultas_em_auth_user(self, url):
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [q["sql"] for q in consultas if "auth_user" in q["sql"]]
+
+    def test_sem_select_do_usuario_com_cache_quente(self) -> None:
+        # A primeira requisição lê só o is_active; as seguintes, nada
+        primeira = self._consultas_em_auth_user("/api/tarefas/")
+        self.assertEqual(len(primeira), 1)
+        self.assertIn("is_active", primeira[0])
+        self.assertNotIn("password", primeira[0])
+
+        self.assertEqual(self._consultas_em_auth_user("/api/tarefas/"), [])
+        self.assertEqual(self._consultas_em_auth_user("/api/dashboard/"), [])
+
+    def test_usuario_do_token_filtra_e_grava_fks(self) -> None:
+        response = self.client.post(
+            "/api/tarefas/",
+            {"titulo": "Criada pelo token", "descricao": "Descrição criada."},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["usuario"], self.user.id)
+        self.assertEqual(self.client.get("/api/tarefas/").data["count"], 2)
+
+    def test_me_carrega_usuario_completo(self) -> None:
+        self.client.get("/api/dashboard/")  # aquece o cache
+
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/auth/me/")
+
+        self.assertEqual(response.data["user"]["username"], "leve@test.com")
+        self.assertEqual(response.data["perfil"]["nome"], "Leve")
+
+    def test_usuario_desativado_perde_acesso(self) -> None:
+        self.client.get("/api/tarefas/")  # aquece o cache
+
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get("/api/tarefas/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_usuario_excluido_perde_acesso(self) -> None:
+        self.client.get("/api/tarefas/")  # aquece o cache
+
+        self.user.delete()
+
+        response = self.client.get("/api/tarefas/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_obtido_sem_email(self) -> None:
+        token = AccessToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        response = self.client.get("/api/auth/me/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["user"]["email"], "leve@test.com")
+
+    def test_email_do_token_desatualizado_nao_vale(self) -> None:
+        token = AccessToken.for_user(self.user)
+        token["email"] = "antigo@test.com"
+
+        usuario = JWTUsuarioLeveAuthentication().get_user(token)
+
+        self.assertIn("email", usuario.get_deferred_fields())
+        self.assertEqual(usuario.email, "leve@test.com")
+        usuario.first_name = "Leve"
+        usuario.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.email, "leve@test.com")
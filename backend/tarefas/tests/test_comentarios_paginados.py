@@ -0,0 +1,110 @@
+from datetime import timedelta
+from operator import attrgetter
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tarefas.models import Comentario, Tarefa
+
+
+class ComentariosPaginadosTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="fio@test.com", email="fio@test.com"
+        )
+        self.tarefa = Tarefa.objects.create(
+            usuario=self.user,
+            titulo="Tarefa movimentada",
+            descricao="Descrição da tarefa com muitos comentários.",
+        )
+        self.url = f"/api/tarefas/{self.tarefa.id}/comentarios/"
+        self.client.force_authenticate(self.user)
+
+    def _comentar(self, quantidade):
+        base = timezone.now()
+        comentarios = Comentario.objects.bulk_create(
+            [
+                Comentario(tarefa=self.tarefa, usuario=self.user, texto=f"C{i}")
+                for i in range(quantidade)
+            ]
+        )
+        # Pares com o mesmo criado_em exercitam o desempate por id
+        for i, comentario in enumerate(comentarios):
+            comentario.criado_em = base - timedelta(seconds=i // 2)
+        Comentario.objects.bulk_update(comentarios, ["criado_em"])
+        return comentarios
+
+    def _percorrer(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(c["id"] for c in response.data["results"])
+            url = response.data["next"]
+        return ids
+
+    def test_paginas_limitadas_e_mais_recentes_primeiro(self) -> None:
+        comentarios = self._comentar(25)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 10)
+        self.assertIsNotNone(response.data["next"])
+        self.assertIsNone(response.data["previous"])
+        self.assertNotIn("count", response.data)
+
+        posicao = attrgetter("criado_em", "id")
+        esperado = [c.id for c in sorted(comentarios, key=posicao, reverse=True)]
+        self.assertEqual(self._percorrer(self.url), esperado)
+
+    def test_ordem_crescente_e_total_opcional(self) -> None:
+        comentarios = self._comentar(12)
+
+        response = self.client.get(
+            self.url, {"ordering": "criado_em", "page_size": 5, "count": "true"}
+        )
+
+        self.assertEqual(response.data["count"], 12)
+        posicao = attrgetter("criado_em", "id")
+        esperado = [c.id for c in sorted(comentarios, key=posicao)]
+        self.assertEqual(
+            self._percorrer(f"{self.url}?ordering=criado_em&page_size=5"), esperado
+        )
+
+    def test_consultas_constantes_com_fio_longo(self) -> None:
+        self._comentar(5)
+        with CaptureQueriesContext(connection) as curto:
+            self.client.get(self.url)
+
+        self._comentar(200)
+        with CaptureQueriesContext(connection) as longo:
+            response = self.client.get(self.url)
+
+        self.assertEqual(len(longo), len(curto))
+        self.assertEqual(len(response.data["results"]), 10)
+        comentarios = [q["sql"] for q in longo if 'FROM "comentario"' in q["sql"]]
+        self.assertEqual(len(comentarios), 1)
+        self.assertNotIn("JOIN", comentarios[0])
+
+    def test_tarefa_inexistente_ou_alheia_404(self) -> None:
+        outro = User.objects.create_user(username="outro@test.com")
+        alheia = Tarefa.objects.create(
+            usuario=outro,
+            titulo="Tarefa de outro",
+            descricao="Descrição da tarefa de outro usuário.",
+        )
+
+        for tarefa_id in (alheia.id, 999999):
+            with self.subTest(tarefa_id=tarefa_id):
+                response = self.client.get(f"/api/tarefas/{tarefa_id}/comentarios/")
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_invalido(self) -> None:
+        response = self.client.get(self.url, {"cursor": "invalido"})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
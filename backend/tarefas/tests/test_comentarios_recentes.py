@@ -0,0 +1,157 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tarefas.models import Comentario, Tarefa
+
+URL = "/api/tarefas/comentarios/"
+
+
+class ComentariosRecentesTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="quadro@test.com", email="quadro@test.com"
+        )
+        self.outro = User.objects.create_user(username="outro@test.com")
+        self.tarefas = [self._tarefa(self.user, i) for i in range(3)]
+        self.alheia = self._tarefa(self.outro, 99)
+        self.client.force_authenticate(self.user)
+
+    def _tarefa(self, usuario, i):
+        return Tarefa.objects.create(
+            usuario=usuario,
+            titulo=f"Tarefa {i}",
+            descricao="Descrição da tarefa do quadro.",
+        )
+
+    def _comentar(self, tarefa, quantidade):
+        base = timezone.now()
+        comentarios = Comentario.objects.bulk_create(
+            [
+                Comentario(tarefa=tarefa, usuario=tarefa.usuario, texto=f"C{i}")
+                for i in range(quantidade)
+            ]
+        )
+        # Pares com o mesmo criado_em exercitam o desempate por id
+        for i, comentario in enumerate(comentarios):
+            comentario.criado_em = base - timedelta(seconds=i // 2)
+        Comentario.objects.bulk_update(comentarios, ["criado_em"])
+        return sorted(comentarios, key=lambda c: (c.criado_em, c.id), reverse=True)
+
+    def _ids(self, response):
+        return {
+            int(tarefa_id): [c["id"] for c in comentarios]
+            for tarefa_id, comentarios in response.data.items()
+        }
+
+    def test_ultimos_n_por_tarefa_do_usuario(self) -> None:
+        primeira = self._comentar(self.tarefas[0], 6)
+        segunda = self._comentar(self.tarefas[1], 2)
+        self._comentar(self.alheia, 3)
+        ids = [t.id for t in self.tarefas] + [self.alheia.id, 999999]
+
+        response = self.client.get(
+            URL, {"ids": ",".join(map(str, ids)), "limite": 3}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self._ids(response),
+            {
+                self.tarefas[0].id: [c.id for c in primeira[:3]],
+                self.tarefas[1].id: [c.id for c in segunda],
+            },
+        )
+
+    def test_formato_igual_ao_endpoint_de_comentarios(self) -> None:
+        self._comentar(self.tarefas[0], 4)
+        tarefa_id = self.tarefas[0].id
+
+        lote = self.client.get(URL, {"ids": tarefa_id, "limite": 4})
+        individual = self.client.get(f"/api/tarefas/{tarefa_id}/comentarios/")
+
+        self.assertEqual(
+            lote.data[str(tarefa_id)], individual.data["results"][:4]
+        )
+
+    def test_ids_repetidos_no_parametro(self) -> None:
+        self._comentar(self.tarefas[0], 2)
+        self._comentar(self.tarefas[2], 2)
+
+        response = self.client.get(
+            f"{URL}?ids={self.tarefas[0].id}&ids={self.tarefas[2].id}"
+        )
+
+        self.assertEqual(
+            set(self._ids(response)), {self.tarefas[0].id, self.tarefas[2].id}
+        )
+
+    def test_uma_consulta_independente_do_numero_de_tarefas(self) -> None:
+        tarefas = [self._tarefa(self.user, i) for i in range(3, 40)]
+        for tarefa in tarefas:
+            self._comentar(tarefa, 4)
+        ids = ",".join(str(t.id) for t in tarefas)
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(URL, {"ids": ids, "limite": 2})
+
+        self.assertEqual(len(response.data), len(tarefas))
+        em_comentario = [q for q in consultas if 'FROM "comentario"' in q["sql"]]
+        self.assertEqual(len(em_comentario), 1)
+
+    def test_sem_funcoes_de_janela(self) -> None:
+        primeira = self._comentar(self.tarefas[0], 5)
+        self._comentar(self.alheia, 2)
+
+        with mock.patch.object(
+            type(connection.features),
+            "supports_over_clause",
+            new_callable=mock.PropertyMock,
+            return_value=False,
+        ), CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(
+                URL, {"ids": f"{self.tarefas[0].id},{self.alheia.id}", "limite": 3}
+            )
+
+        self.assertEqual(
+            self._ids(response), {self.tarefas[0].id: [c.id for c in primeira[:3]]}
+        )
+        self.assertFalse(any("ROW_NUMBER" in q["sql"] for q in consultas))
+
+    def test_parametros_invalidos(self) -> None:
+        for params in (
+            {},
+            {"ids": "abc"},
+            {"ids": "1", "limite": 0},
+            {"ids": "1", "limite": 21},
+            {"ids": ",".join(str(i) for i in range(1, 102))},
+        ):
+            with self.subTest(params=params):
+                response = self.client.get(URL, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_etag_muda_com_novo_comentario(self) -> None:
+        params = {"ids": self.tarefas[0].id}
+        primeira = self.client.get(URL, params)
+        self.assertEqual(
+            self.client.get(
+                URL, params, HTTP_IF_NONE_MATCH=primeira["ETag"]
+            ).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+
+        self.client.post(
+            f"/api/tarefas/{self.tarefas[0].id}/comentarios/",
+            {"texto": "Novo"},
+            format="json",
+        )
+        segunda = self.client.get(URL, params, HTTP_IF_NONE_MATCH=primeira["ETag"])
+
+        self.assertEqual(segunda.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(segunda.data[str(self.tarefas[0].id)]), 1)
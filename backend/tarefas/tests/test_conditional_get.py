@@ -0,0 +1,164 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tarefas.models import Tarefa, UsuarioPerfil, VersaoTarefas
+
+
+class GetCondicionalTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="etag@test.com",
+            email="etag@test.com",
+            password="Teste@123",
+        )
+        UsuarioPerfil.objects.create(user=self.user, nome="Etag")
+        self.other = User.objects.create_user(
+            username="outro@test.com",
+            email="outro@test.com",
+            password="Teste@123",
+        )
+        self.client.force_authenticate(self.user)
+
+        self.tarefa = Tarefa.objects.create(
+            usuario=self.user,
+            titulo="Tarefa versionada",
+            descricao="Descrição da tarefa versionada.",
+        )
+
+    def _alterar_versao_em(self, atualizado_em):
+        VersaoTarefas.objects.filter(usuario=self.user).update(
+            atualizado_em=atualizado_em
+        )
+
+    def _etag(self, url, params=None):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["ETag"].startswith('W/"'))
+        return response["ETag"]
+
+    def test_listagem_inalterada_retorna_304_sem_consultar_tarefas(self) -> None:
+        self._alterar_versao_em(timezone.now() - timedelta(minutes=1))
+        etag = self._etag("/api/tarefas/")
+
+        # Apenas o lookup da versão do usuário
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/tarefas/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertIn("Last-Modified", response)
+
+    def test_alteracao_muda_etag_da_listagem(self) -> None:
+        etag = self._etag("/api/tarefas/")
+
+        self.tarefa.status = Tarefa.Status.CONCLUIDA
+        self.tarefa.save()
+
+        response = self.client.get("/api/tarefas/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_etag_considera_parametros_da_query(self) -> None:
+        etags = {
+            self._etag("/api/tarefas/"),
+            self._etag("/api/tarefas/", {"status": "PENDENTE"}),
+            self._etag("/api/tarefas/", {"prioridade": "ALTA"}),
+            self._etag("/api/tarefas/", {"search": "versionada"}),
+            self._etag("/api/tarefas/", {"ordering": "criado_em"}),
+            self._etag("/api/tarefas/", {"page_size": 5}),
+        }
+
+        self.assertEqual(len(etags), 6)
+        self.assertEqual(
+            self._etag("/api/tarefas/?status=PENDENTE&ordering=criado_em"),
+            self._etag("/api/tarefas/?ordering=criado_em&status=PENDENTE"),
+        )
+
+    def test_alteracao_de_outro_usuario_nao_invalida(self) -> None:
+        etag = self._etag("/api/dashboard/")
+
+        Tarefa.objects.create(
+            usuario=self.other,
+            titulo="Tarefa alheia",
+            descricao="Não pertence ao usuário autenticado.",
+        )
+
+        response = self.client.get("/api/dashboard/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_atribuir_invalida_origem_e_destino(self) -> None:
+        etag_origem = self._etag("/api/dashboard/")
+        self.client.force_authenticate(self.other)
+        etag_destino = self._etag("/api/dashboard/")
+
+        self.client.force_authenticate(self.user)
+        self.client.post(
+            f"/api/tarefas/{self.tarefa.id}/atribuir/",
+            {"email": self.other.email},
+            format="json",
+        )
+
+        response = self.client.get("/api/dashboard/", HTTP_IF_NONE_MATCH=etag_origem)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.force_authenticate(self.other)
+        response = self.client.get(
+            "/api/dashboard/", HTTP_IF_NONE_MATCH=etag_destino
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_detalhe_condicional(self) -> None:
+        url = f"/api/tarefas/{self.tarefa.id}/"
+        etag = self._etag(url)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.patch(url, {"status": "EM_ANDAMENTO"}, format="json")
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "EM_ANDAMENTO")
+
+    def test_detalhe_de_outro_usuario_continua_404(self) -> None:
+        tarefa = Tarefa.objects.create(
+            usuario=self.other,
+            titulo="Tarefa alheia",
+            descricao="Não pertence ao usuário autenticado.",
+        )
+
+        response = self.client.get(f"/api/tarefas/{tarefa.id}/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn("ETag", response)
+
+    def test_if_modified_since(self) -> None:
+        self._alterar_versao_em(timezone.now() - timedelta(minutes=1))
+        response = self.client.get("/api/dashboard/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(
+            "/api/dashboard/",
+            HTTP_IF_MODIFIED_SINCE=response["Last-Modified"],
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_sem_last_modified_no_segundo_da_alteracao(self) -> None:
+        # Folga para o segundo não virar durante o teste
+        atualizado_em = timezone.now() + timedelta(minutes=1)
+        self._alterar_versao_em(atualizado_em)
+
+        response = self.client.get("/api/dashboard/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("ETag", response)
+        self.assertNotIn("Last-Modified", response)
+
+        # Outra escrita no mesmo segundo não pode virar 304
+        response = self.client.get(
+            "/api/dashboard/",
+            HTTP_IF_MODIFIED_SINCE=http_date(atualizado_em.timestamp()),
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,153 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tarefas.contadores import divergencias
+from tarefas.models import ContadorStatus, Tarefa, TarefaRemovida, UsuarioPerfil
+
+
+class ContadorStatusTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="contador@test.com",
+            email="contador@test.com",
+            password="Teste@123",
+        )
+        UsuarioPerfil.objects.create(user=self.user, nome="Contador")
+        self.other = User.objects.create_user(
+            username="destino@test.com",
+            email="destino@test.com",
+            password="Teste@123",
+        )
+        self.client.force_authenticate(self.user)
+
+        self.tarefa = Tarefa.objects.create(
+            usuario=self.user,
+            titulo="Tarefa contada",
+            descricao="Descrição da tarefa contada.",
+        )
+
+    def _contadores(self, usuario):
+        return dict(
+            ContadorStatus.objects.filter(usuario=usuario, total__gt=0).values_list(
+                "status", "total"
+            )
+        )
+
+    def test_criacao_incrementa_contador(self) -> None:
+        self.assertEqual(self._contadores(self.user), {Tarefa.Status.PENDENTE: 1})
+
+    def test_mudanca_de_status_move_contagem(self) -> None:
+        response = self.client.patch(
+            f"/api/tarefas/{self.tarefa.id}/",
+            {"status": Tarefa.Status.EM_ANDAMENTO},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._contadores(self.user), {Tarefa.Status.EM_ANDAMENTO: 1})
+
+    def test_exclusao_decrementa_contador(self) -> None:
+        response = self.client.delete(f"/api/tarefas/{self.tarefa.id}/")
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self._contadores(self.user), {})
+
+    def test_exclusao_em_lote_decrementa_contador(self) -> None:
+        Tarefa.objects.create(
+            usuario=self.user,
+            titulo="Outra tarefa",
+            descricao="Descrição da outra tarefa.",
+        )
+
+        Tarefa.objects.filter(usuario=self.user).delete()
+
+        self.assertEqual(self._contadores(self.user), {})
+
+    def test_atribuir_transfere_contagem(self) -> None:
+        response = self.client.post(
+            f"/api/tarefas/{self.tarefa.id}/atribuir/",
+            {"email": self.other.email},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._contadores(self.user), {})
+        self.assertEqual(self._contadores(self.other), {Tarefa.Status.PENDENTE: 1})
+
+    def test_save_com_campos_adiados_usa_estado_do_banco(self) -> None:
+        tarefa = Tarefa.objects.only("id", "titulo").get(pk=self.tarefa.pk)
+        tarefa.status = Tarefa.Status.CONCLUIDA
+        tarefa.save()
+
+        self.assertEqual(self._contadores(self.user), {Tarefa.Status.CONCLUIDA: 1})
+
+    def test_saves_de_instancias_desatualizadas(self) -> None:
+        # Duas requisições carregaram a tarefa PENDENTE antes de qualquer save
+        primeira = Tarefa.objects.get(pk=self.tarefa.pk)
+        segunda = Tarefa.objects.get(pk=self.tarefa.pk)
+
+        primeira.status = Tarefa.Status.EM_ANDAMENTO
+        primeira.save()
+        segunda.status = Tarefa.Status.CONCLUIDA
+        segunda.save()
+
+        self.assertEqual(self._contadores(self.user), {Tarefa.Status.CONCLUIDA: 1})
+        self.assertEqual(divergencias(), {})
+
+    def test_atribuicao_e_exclusao_de_instancias_desatualizadas(self) -> None:
+        atribuida = Tarefa.objects.get(pk=self.tarefa.pk)
+        excluida = Tarefa.objects.get(pk=self.tarefa.pk)
+
+        atribuida.usuario = self.other
+        atribuida.status = Tarefa.Status.CONCLUIDA
+        atribuida.save()
+        excluida.delete()
+        excluida.delete()
+
+        self.assertEqual(self._contadores(self.user), {})
+        self.assertEqual(self._contadores(self.other), {})
+        self.assertEqual(divergencias(), {})
+        self.assertEqual(
+            set(
+                TarefaRemovida.objects.filter(tarefa_id=self.tarefa.pk).values_list(
+                    "usuario_id", "motivo"
+                )
+            ),
+            {
+                (self.user.id, TarefaRemovida.Motivo.ATRIBUIDA),
+                (self.other.id, TarefaRemovida.Motivo.EXCLUIDA),
+            },
+        )
+
+    def test_dashboard_sem_count_na_tabela_de_tarefas(self) -> None:
+        # Versão do usuário (GET condicional) + lookup dos contadores
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/dashboard/")
+
+        self.assertEqual(response.data["total"], 1)
+        self.assertEqual(response.data["por_status"], {Tarefa.Status.PENDENTE: 1})
+
+    def test_excluir_usuario_com_tarefas(self) -> None:
+        self.user.delete()
+
+        self.assertFalse(Tarefa.objects.filter(pk=self.tarefa.pk).exists())
+        self.assertFalse(
+            ContadorStatus.objects.filter(usuario_id=self.user.pk).exists()
+        )
+        self.assertEqual(divergencias(), {})
+
+    def test_comando_verifica_e_reconstroi(self) -> None:
+        ContadorStatus.objects.filter(usuario=self.user).update(total=7)
+
+        with self.assertRaises(CommandError):
+            call_command("contadores_status", verificar=True, stdout=StringIO())
+
+        call_command("contadores_status", stdout=StringIO())
+
+        self.assertEqual(self._contadores(self.user), {Tarefa.Status.PENDENTE: 1})
+        call_command("contadores_status", verificar=True, stdout=StringIO())
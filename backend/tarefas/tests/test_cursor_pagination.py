@@ -0,0 +1,111 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tarefas.models import Tarefa, UsuarioPerfil
+
+
+class KeysetPaginationTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="cursor@test.com",
+            email="cursor@test.com",
+            password="Teste@123",
+        )
+        UsuarioPerfil.objects.create(user=self.user, nome="Cursor")
+        self.client.force_authenticate(self.user)
+
+        base = timezone.now()
+        self.tarefas = []
+        for i in range(12):
+            tarefa = Tarefa.objects.create(
+                usuario=self.user,
+                titulo=f"Tarefa {i}",
+                descricao="Descrição para paginação por cursor.",
+            )
+            self.tarefas.append(tarefa)
+
+        # Distribui criado_em com empates para exercitar o desempate por id
+        for i, tarefa in enumerate(self.tarefas):
+            Tarefa.objects.filter(pk=tarefa.pk).update(
+                criado_em=base + timedelta(minutes=i // 3)
+            )
+
+    def _percorrer(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(item["id"] for item in response.data["results"])
+            url = response.data["next"]
+        return ids
+
+    def _esperado(self, descendente):
+        ordenadas = sorted(
+            Tarefa.objects.filter(usuario=self.user),
+            key=lambda t: (t.criado_em, t.id),
+            reverse=descendente,
+        )
+        return [t.id for t in ordenadas]
+
+    def test_percorre_todas_as_paginas_em_ordem_descendente(self) -> None:
+        ids = self._percorrer("/api/tarefas/?pagination=cursor&page_size=5")
+
+        self.assertEqual(ids, self._esperado(descendente=True))
+
+    def test_percorre_todas_as_paginas_em_ordem_ascendente(self) -> None:
+        ids = self._percorrer(
+            "/api/tarefas/?pagination=cursor&page_size=5&ordering=criado_em"
+        )
+
+        self.assertEqual(ids, self._esperado(descendente=False))
+
+    def test_cursor_previous_retorna_pagina_anterior(self) -> None:
+        primeira = self.client.get("/api/tarefas/?pagination=cursor&page_size=5")
+        segunda = self.client.get(primeira.data["next"])
+
+        self.assertIsNone(primeira.data["previous"])
+        anterior = self.client.get(segunda.data["previous"])
+
+        self.assertEqual(
+            [item["id"] for item in anterior.data["results"]],
+            [item["id"] for item in primeira.data["results"]],
+        )
+
+    def test_nao_executa_count_sem_solicitacao(self) -> None:
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/tarefas/?pagination=cursor")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+        self.assertFalse(
+            any("COUNT(" in q["sql"].upper() for q in ctx.captured_queries)
+        )
+
+    def test_count_quando_solicitado(self) -> None:
+        response = self.client.get("/api/tarefas/?pagination=cursor&count=true")
+
+        self.assertEqual(response.data["count"], 12)
+
+    def test_respeita_tamanhos_de_pagina_permitidos(self) -> None:
+        response = self.client.get("/api/tarefas/?pagination=cursor&page_size=7")
+        self.assertEqual(len(response.data["results"]), 10)
+
+        response = self.client.get("/api/tarefas/?pagination=cursor&page_size=5")
+        self.assertEqual(len(response.data["results"]), 5)
+
+    def test_cursor_invalido_retorna_404(self) -> None:
+        response = self.client.get("/api/tarefas/?cursor=invalido")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_sem_opt_in_mantem_paginacao_por_pagina(self) -> None:
+        response = self.client.get("/api/tarefas/")
+
+        self.assertEqual(response.data["count"], 12)
+        self.assertIn("page=2", response.data["next"])
@@ -0,0 +1,118 @@
+import importlib
+from types import SimpleNamespace
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tarefas.models import EmailNormalizado, Tarefa, UsuarioPerfil
+
+
+class EmailNormalizadoTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="Maria@Test.com",
+            email="Maria@Test.com",
+            password="Teste@123",
+        )
+        UsuarioPerfil.objects.create(user=self.user, nome="Maria")
+
+    def _normalizado(self, user):
+        return (
+            EmailNormalizado.objects.filter(usuario=user)
+            .values_list("email", flat=True)
+            .first()
+        )
+
+    def test_mantido_em_sincronia_no_save(self) -> None:
+        self.assertEqual(self._normalizado(self.user), "maria@test.com")
+
+        self.user.email = "Maria.Souza@Test.com"
+        self.user.save()
+        self.assertEqual(self._normalizado(self.user), "maria.souza@test.com")
+
+        self.user.email = ""
+        self.user.save()
+        self.assertIsNone(self._normalizado(self.user))
+
+    def test_email_repetido_fica_com_o_primeiro_usuario(self) -> None:
+        outro = User.objects.create_user(username="outra", email="MARIA@test.com")
+
+        self.assertIsNone(self._normalizado(outro))
+        self.assertEqual(self._normalizado(self.user), "maria@test.com")
+
+    def test_troca_para_email_de_outro_mantem_o_anterior(self) -> None:
+        outro = User.objects.create_user(
+            username="joao@test.com", email="joao@test.com", password="Teste@123"
+        )
+
+        outro.email = "MARIA@test.com"
+        with self.assertLogs("tarefas.signals", "WARNING"):
+            outro.save()
+
+        self.assertEqual(self._normalizado(outro), "joao@test.com")
+        self.assertEqual(self._normalizado(self.user), "maria@test.com")
+        response = self.client.post(
+            "/api/auth/login/",
+            {"email": "joao@test.com", "password": "Teste@123"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_login_por_igualdade_sem_upper(self) -> None:
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.post(
+                "/api/auth/login/",
+                {"email": "MARIA@test.COM", "password": "Teste@123"},
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        busca = consultas[0]["sql"]
+        self.assertIn("usuario_email_normalizado", busca)
+        # Igualdade simples: nem UPPER() nem LIKE, que impedem o uso do índice
+        self.assertNotIn("UPPER(", busca.upper())
+        self.assertNotIn(" LIKE ", busca.upper())
+        self.assertIn("maria@test.com", busca)
+
+    def test_registro_rejeita_email_com_outra_caixa(self) -> None:
+        response = self.client.post(
+            "/api/auth/register/",
+            {"nome": "Outra", "email": "maria@TEST.com", "password": "Teste@123"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("email", response.data)
+
+    def test_atribuir_por_email_normalizado(self) -> None:
+        dono = User.objects.create_user(username="dono", email="dono@test.com")
+        tarefa = Tarefa.objects.create(
+            usuario=dono,
+            titulo="Tarefa para atribuir",
+            descricao="Descrição da tarefa para atribuir.",
+        )
+        self.client.force_authenticate(dono)
+
+        response = self.client.post(
+            f"/api/tarefas/{tarefa.id}/atribuir/",
+            {"email": " maria@test.com"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        tarefa.refresh_from_db()
+        self.assertEqual(tarefa.usuario_id, self.user.id)
+
+    def test_migracao_popula_emails_existentes(self) -> None:
+        repetido = User.objects.create_user(username="rep", email="maria@test.com")
+        sem_email = User.objects.create_user(username="sem-email")
+        EmailNormalizado.objects.all().delete()
+
+        migracao = importlib.import_module("tarefas.migrations.0008_email_normalizado")
+        migracao.popular_emails(apps, SimpleNamespace(connection=connection))
+
+        self.assertEqual(self._normalizado(self.user), "maria@test.com")
+        self.assertIsNone(self._normalizado(repetido))
+        self.assertIsNone(self._normalizado(sem_email))
@@ -0,0 +1,240 @@
+import asyncio
+import json
+import threading
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tarefas.eventos import RESSINCRONIZAR, Broker
+from tarefas.models import Comentario, Tarefa, UsuarioPerfil
+
+URL = "/api/eventos/"
+
+
+class BrokerTests(SimpleTestCase):
+    async def test_entrega_publicacao_de_outra_thread(self) -> None:
+        broker = Broker()
+        assinatura = broker.assinar(1)
+
+        thread = threading.Thread(
+            target=broker.publicar, args=(1, {"tipo": "tarefa", "id": 7})
+        )
+        thread.start()
+        thread.join()
+
+        evento = await assinatura.proximo(1)
+        self.assertEqual(evento["id"], 7)
+        self.assertIn("seq", evento)
+
+    async def test_publica_apenas_para_o_usuario(self) -> None:
+        broker = Broker()
+        assinatura = broker.assinar(1)
+
+        broker.publicar(2, {"tipo": "tarefa", "id": 7})
+
+        self.assertIsNone(await assinatura.proximo(0.01))
+
+    async def test_fila_cheia_pede_ressincronizacao(self) -> None:
+        broker = Broker(capacidade=2)
+        assinatura = broker.assinar(1)
+
+        for tarefa_id in range(3):
+            broker.publicar(1, {"tipo": "tarefa", "id": tarefa_id})
+        await asyncio.sleep(0)
+        # Depois do marcador, a fila volta a receber normalmente
+        broker.publicar(1, {"tipo": "tarefa", "id": 9})
+
+        self.assertEqual(await assinatura.proximo(1), RESSINCRONIZAR)
+        self.assertEqual((await assinatura.proximo(1))["id"], 9)
+
+    async def test_cancelar_remove_assinatura(self) -> None:
+        broker = Broker()
+        assinatura = broker.assinar(1)
+
+        broker.cancelar(assinatura)
+        broker.publicar(1, {"tipo": "tarefa", "id": 7})
+
+        self.assertIsNone(await assinatura.proximo(0.01))
+        self.assertEqual(broker._assinaturas, {})
+
+
+class PublicacaoTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="eventos@test.com",
+            email="eventos@test.com",
+            password="Teste@123",
+        )
+        UsuarioPerfil.objects.create(user=self.user, nome="Eventos")
+        self.other = User.objects.create_user(
+            username="outro@test.com",
+            email="outro@test.com",
+            password="Teste@123",
+        )
+        self.client.force_authenticate(self.user)
+        self.tarefa = Tarefa.objects.create(
+            usuario=self.user,
+            titulo="Tarefa com eventos",
+            descricao="Descrição da tarefa com eventos.",
+        )
+
+        patcher = mock.patch("tarefas.eventos.broker")
+        self.broker = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _publicados(self):
+        return [c.args for c in self.broker.publicar.call_args_list]
+
+    def test_publica_somente_apos_o_commit(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tarefa.titulo = "Título alterado"
+            self.tarefa.save()
+            self.broker.publicar.assert_not_called()
+
+        self.assertEqual(
+            self._publicados(),
+            [(self.user.id, {"tipo": "tarefa", "acao": "salva", "id": self.tarefa.id})],
+        )
+
+    def test_atribuicao_remove_da_lista_do_dono_anterior(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tarefa.usuario = self.other
+            self.tarefa.save()
+
+        self.assertIn(
+            (self.user.id, {"tipo": "tarefa", "acao": "removida", "id": self.tarefa.id}),
+            self._publicados(),
+        )
+        self.assertIn(
+            (self.other.id, {"tipo": "tarefa", "acao": "salva", "id": self.tarefa.id}),
+            self._publicados(),
+        )
+
+    def test_comentarios_criados_e_removidos(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            comentario = Comentario.objects.create(
+                tarefa=self.tarefa, usuario=self.user, texto="Primeiro"
+            )
+            comentario_id = comentario.id
+            comentario.delete()
+
+        evento = {"tipo": "comentario", "id": comentario_id, "tarefa": self.tarefa.id}
+        self.assertEqual(
+            self._publicados(),
+            [
+                (self.user.id, {**evento, "acao": "criado"}),
+                (self.user.id, {**evento, "acao": "removido"}),
+            ],
+        )
+
+    def test_exclusao_da_tarefa_nao_publica_comentarios(self) -> None:
+        Comentario.objects.create(
+            tarefa=self.tarefa, usuario=self.user, texto="Primeiro"
+        )
+        tarefa_id = self.tarefa.id
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tarefa.delete()
+
+        self.assertEqual(
+            self._publicados(),
+            [(self.user.id, {"tipo": "tarefa", "acao": "removida", "id": tarefa_id})],
+        )
+
+    def test_lote_e_transicao_publicam_sem_signals(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/api/tarefas/lote/",
+                {
+                    "operacoes": [
+                        {
+                            "acao": "criar",
+                            "dados": {
+                                "titulo": "Criada em lote",
+                                "descricao": "Descrição criada em lote.",
+                            },
+                        }
+                    ]
+                },
+                format="json",
+            )
+        criada = response.data["resultados"][0]["tarefa"]["id"]
+        self.assertIn(
+            (self.user.id, {"tipo": "tarefa", "acao": "salva", "id": criada}),
+            self._publicados(),
+        )
+
+        self.broker.reset_mock()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                f"/api/tarefas/{self.tarefa.id}/status/",
+                {"status": "CONCLUIDA"},
+                format="json",
+            )
+        self.assertEqual(
+            self._publicados(),
+            [(self.user.id, {"tipo": "tarefa", "acao": "salva", "id": self.tarefa.id})],
+        )
+
+
+class EventosViewTests(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="sse@test.com",
+            email="sse@test.com",
+            password="Teste@123",
+        )
+        self.token = str(AccessToken.for_user(self.user))
+
+        self.broker = Broker()
+        patcher = mock.patch("tarefas.eventos.broker", self.broker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_sem_token_retorna_401(self) -> None:
+        response = await self.async_client.get(URL)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = await self.async_client.get(URL, {"token": "invalido"})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_servidor_wsgi_retorna_501(self) -> None:
+        response = self.client.get(URL, {"token": self.token})
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+
+    async def test_stream_entrega_eventos_do_usuario(self) -> None:
+        response = await self.async_client.get(
+            URL, headers={"Authorization": f"Bearer {self.token}"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        conteudo = response.streaming_content
+        self.assertTrue((await anext(conteudo)).startswith(b"retry: "))
+
+        self.broker.publicar(
+            self.user.id, {"tipo": "tarefa", "acao": "salva", "id": 3}
+        )
+        bloco = (await anext(conteudo)).decode()
+        await conteudo.aclose()
+
+        linhas = bloco.strip().split("\n")
+        self.assertEqual(linhas[0], "id: 1")
+        self.assertEqual(linhas[1], "event: tarefa")
+        self.assertEqual(
+            json.loads(linhas[2].removeprefix("data: ")),
+            {"seq": 1, "tipo": "tarefa", "acao": "salva", "id": 3},
+        )
+
+    @override_settings(TAREFAS_EVENTOS_HEARTBEAT=0.01)
+    async def test_heartbeat_sem_eventos(self) -> None:
+        response = await self.async_client.get(URL, {"token": self.token})
+        conteudo = response.streaming_content
+
+        await anext(conteudo)
+        self.assertEqual(await anext(conteudo), b": ping\n\n")
+        await conteudo.aclose()
@@ -0,0 +1,106 @@
+import csv
+import io
+import json
+from unittest import mock
+
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tarefas.models import Tarefa
+
+URL = "/api/tarefas/exportar/"
+
+
+class ExportacaoTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="exporta@test.com",
+            email="exporta@test.com",
+            password="Teste@123",
+        )
+        self.other = User.objects.create_user(
+            username="outro@test.com",
+            email="outro@test.com",
+            password="Teste@123",
+        )
+        self.client.force_authenticate(self.user)
+
+        for i in range(5):
+            Tarefa.objects.create(
+                usuario=self.user,
+                titulo=f"Tarefa {i}",
+                descricao="Descrição, com vírgula e \"aspas\".",
+                status="CONCLUIDA" if i % 2 else "PENDENTE",
+            )
+        Tarefa.objects.create(
+            usuario=self.other,
+            titulo="Tarefa alheia",
+            descricao="Não pertence ao usuário autenticado.",
+        )
+
+    def _baixar(self, params=None):
+        response = self.client.get(URL, params or {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, b"".join(response.streaming_content).decode("utf-8")
+
+    def test_ndjson_igual_a_listagem(self) -> None:
+        response, corpo = self._baixar()
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        registros = [json.loads(linha) for linha in corpo.splitlines()]
+        listagem = self.client.get("/api/tarefas/", {"page_size": 50}).json()
+        self.assertEqual(registros, listagem["results"])
+
+    def test_csv_com_cabecalho_e_filtros(self) -> None:
+        response, corpo = self._baixar(
+            {"formato": "csv", "status": "CONCLUIDA", "ordering": "criado_em"}
+        )
+
+        self.assertIn('filename="tarefas.csv"', response["Content-Disposition"])
+        linhas = list(csv.DictReader(io.StringIO(corpo)))
+        self.assertEqual([linha["titulo"] for linha in linhas], ["Tarefa 1", "Tarefa 3"])
+        self.assertEqual(linhas[0]["descricao"], "Descrição, com vírgula e \"aspas\".")
+
+    def test_le_o_banco_em_lotes_limitados(self) -> None:
+        with mock.patch("tarefas.exportacao.LOTE_EXPORTACAO", 2):
+            response = self.client.get(URL)
+            # 5 tarefas em lotes de 2: três consultas, feitas durante o stream
+            with self.assertNumQueries(3):
+                corpo = b"".join(response.streaming_content)
+
+        ids = [json.loads(linha)["id"] for linha in corpo.splitlines()]
+        esperado = list(
+            Tarefa.objects.filter(usuario=self.user)
+            .order_by("-criado_em", "-id")
+            .values_list("id", flat=True)
+        )
+        self.assertEqual(ids, esperado)
+
+    def test_formato_invalido(self) -> None:
+        response = self.client.get(URL, {"formato": "xml"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_stream_assincrono_sob_asgi(self) -> None:
+        token = AccessToken.for_user(self.user)
+        with mock.patch("tarefas.exportacao.LOTE_EXPORTACAO", 2):
+            response = await self.async_client.get(
+                URL, headers={"Authorization": f"Bearer {token}"}
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(response.is_async)
+
+            # Um pedaço por lote, lido sob demanda
+            conteudo = response.streaming_content
+            partes = [await anext(conteudo)]
+            self.assertEqual(len(partes[0].splitlines()), 2)
+            partes.extend([parte async for parte in conteudo])
+
+        self.assertEqual([len(p.splitlines()) for p in partes], [2, 2, 1])
+        ids = [json.loads(linha)["id"] for linha in b"".join(partes).splitlines()]
+        self.assertEqual(len(ids), 5)
+
+    def test_stream_sincrono_sob_wsgi(self) -> None:
+        response, _ = self._baixar()
+        self.assertFalse(response.is_async)
@@ -0,0 +1,95 @@
+import datetime
+import io
+from decimal import Decimal
+from unittest import mock
+
+from django.utils.translation import gettext_lazy
+from rest_framework import parsers, renderers
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.test import APITestCase
+
+from stratasec import parsers as parsers_rapidos
+from stratasec import renderers as renderers_rapidos
+from stratasec.parsers import JSONParser
+from stratasec.renderers import JSONRenderer
+
+DADOS = {
+    "id": 1,
+    "titulo": "Revisão “urgente” ✓",
+    "criado_em": datetime.datetime(
+        2024, 5, 6, 7, 8, 9, 123456, tzinfo=datetime.timezone.utc
+    ),
+    "atualizado_em": datetime.datetime(
+        2024, 5, 6, 7, 8, 9, tzinfo=datetime.timezone(datetime.timedelta(hours=-3))
+    ),
+    "prazo": datetime.date(2024, 6, 1),
+    "ingenua": datetime.datetime(2024, 1, 1, 12, 0),
+    "valor": Decimal("10.50"),
+    "por_status": {"PENDENTE": 2, 3: "chave numérica"},
+    "erros": {"status": [ErrorDetail("Transição de status inválida.", code="invalid")]},
+    "rotulo": gettext_lazy("Pendente"),
+    "separadores": "linha paragrafo fim",
+    "nada": None,
+    "lista": [True, False, 1.5],
+}
+
+
+class JSONRendererTests(APITestCase):
+    def test_saida_identica_ao_renderer_padrao(self) -> None:
+        self.assertEqual(
+            JSONRenderer().render(DADOS), renderers.JSONRenderer().render(DADOS)
+        )
+
+    def test_inteiro_grande_usa_fallback(self) -> None:
+        dados = {"n": 2**70}
+        self.assertEqual(
+            JSONRenderer().render(dados), renderers.JSONRenderer().render(dados)
+        )
+
+    def test_nao_finito_levanta_como_o_renderer_padrao(self) -> None:
+        for valor in (float("nan"), float("inf"), Decimal("-Infinity")):
+            dados = {"lista": [{"nada": None, "valor": valor}]}
+            with self.subTest(valor=valor):
+                with self.assertRaises(ValueError):
+                    renderers.JSONRenderer().render(dados)
+                with self.assertRaises(ValueError):
+                    JSONRenderer().render(dados)
+
+    def test_indentacao_usa_renderer_padrao(self) -> None:
+        saida = JSONRenderer().render(
+            DADOS, "application/json; indent=4", {"indent": 4}
+        )
+        self.assertIn(b'\n    "id": 1', saida)
+
+    def test_sem_orjson(self) -> None:
+        with mock.patch.object(renderers_rapidos, "orjson", None):
+            self.assertEqual(
+                JSONRenderer().render(DADOS), renderers.JSONRenderer().render(DADOS)
+            )
+
+    def test_listagem_usa_renderer_configurado(self) -> None:
+        response = self.client.get("/api/tarefas/")
+        self.assertIsInstance(response.accepted_renderer, JSONRenderer)
+
+
+class JSONParserTests(APITestCase):
+    def _parse(self, parser, corpo):
+        return parser.parse(io.BytesIO(corpo), "application/json", {})
+
+    def test_leitura_identica_ao_parser_padrao(self) -> None:
+        corpo = '{"titulo": "Ação", "ids": [1, 2], "n": 12345678901234567890123}'
+        corpo = corpo.encode("utf-8")
+        self.assertEqual(
+            self._parse(JSONParser(), corpo),
+            self._parse(parsers.JSONParser(), corpo),
+        )
+
+    def test_json_invalido_e_nan_geram_parse_error(self) -> None:
+        for corpo in (b'{"a": ', b'{"a": NaN}'):
+            with self.subTest(corpo=corpo):
+                with self.assertRaises(ParseError):
+                    self._parse(JSONParser(), corpo)
+
+    def test_sem_orjson(self) -> None:
+        with mock.patch.object(parsers_rapidos, "orjson", None):
+            self.assertEqual(self._parse(JSONParser(), b'{"a": [1]}'), {"a": [1]})
@@ -0,0 +1,57 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from tarefas.leitura import leitura_tarefa
+from tarefas.models import Tarefa
+from tarefas.serializers import TarefaSerializer
+
+
+class LeituraRapidaTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="leitura@test.com",
+            email="leitura@test.com",
+            password="Teste@123",
+        )
+        self.client.force_authenticate(self.user)
+
+        for i in range(3):
+            Tarefa.objects.create(
+                usuario=self.user,
+                titulo=f"Tarefa {i}",
+                descricao="Descrição com acentuação e “aspas”.",
+                prioridade=Tarefa.Prioridade.values[i],
+            )
+        # Sem microssegundos: isoformat muda de formato
+        Tarefa.objects.filter(titulo="Tarefa 0").update(
+            criado_em=datetime(2024, 1, 2, 3, 4, 5, tzinfo=dt_timezone.utc)
+        )
+
+    def _comparar(self):
+        queryset = Tarefa.objects.filter(usuario=self.user).order_by("id")
+        esperado = JSONRenderer().render(TarefaSerializer(queryset, many=True).data)
+        obtido = JSONRenderer().render(
+            leitura_tarefa.serializar(leitura_tarefa.consultar(queryset))
+        )
+        self.assertEqual(obtido, esperado)
+
+    def test_saida_identica_ao_serializer(self) -> None:
+        self._comparar()
+
+    def test_saida_identica_em_outro_fuso(self) -> None:
+        with timezone.override("America/Sao_Paulo"):
+            self._comparar()
+
+    def test_detalhe_em_uma_consulta(self) -> None:
+        tarefa = Tarefa.objects.filter(usuario=self.user).first()
+
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/api/tarefas/{tarefa.id}/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, TarefaSerializer(tarefa).data)
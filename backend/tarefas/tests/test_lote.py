@@ -0,0 +1,249 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tarefas.contadores import divergencias
+from tarefas.models import Tarefa, TermoTarefa, UsuarioPerfil, VersaoTarefas
+
+URL = "/api/tarefas/lote/"
+
+
+class LoteTarefasTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="lote@test.com",
+            email="lote@test.com",
+            password="Teste@123",
+        )
+        UsuarioPerfil.objects.create(user=self.user, nome="Lote")
+        self.other = User.objects.create_user(
+            username="outro@test.com",
+            email="outro@test.com",
+            password="Teste@123",
+        )
+        self.client.force_authenticate(self.user)
+
+        self.tarefa = Tarefa.objects.create(
+            usuario=self.user,
+            titulo="Tarefa existente",
+            descricao="Descrição da tarefa existente.",
+        )
+        self.removivel = Tarefa.objects.create(
+            usuario=self.user,
+            titulo="Tarefa removível",
+            descricao="Descrição da tarefa removível.",
+        )
+
+    def _criar(self, titulo="Nova tarefa"):
+        return {
+            "acao": "criar",
+            "dados": {"titulo": titulo, "descricao": "Descrição criada em lote."},
+        }
+
+    def test_aplica_criacao_atualizacao_e_exclusao(self) -> None:
+        response = self.client.post(
+            URL,
+            {
+                "operacoes": [
+                    self._criar(),
+                    {
+                        "acao": "atualizar",
+                        "id": self.tarefa.id,
+                        "dados": {"status": "CONCLUIDA"},
+                    },
+                    {"acao": "excluir", "id": self.removivel.id},
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["aplicado"])
+        self.assertEqual(
+            [r["status"] for r in response.data["resultados"]], [201, 200, 204]
+        )
+        criada = response.data["resultados"][0]["tarefa"]
+        self.assertEqual(criada["usuario"], self.user.id)
+        self.assertTrue(Tarefa.objects.filter(id=criada["id"]).exists())
+
+        self.tarefa.refresh_from_db()
+        self.assertEqual(self.tarefa.status, Tarefa.Status.CONCLUIDA)
+        self.assertFalse(Tarefa.objects.filter(id=self.removivel.id).exists())
+        self.assertEqual(divergencias(), {})
+
+    def test_modo_atomico_nao_aplica_nada_com_erro(self) -> None:
+        response = self.client.post(
+            URL,
+            {
+                "modo": "atomico",
+                "operacoes": [
+                    self._criar(),
+                    {"acao": "excluir", "id": self.removivel.id},
+                    {
+                        "acao": "criar",
+                        "dados": {"titulo": "ab", "descricao": "curta"},
+                    },
+                ],
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(response.data["aplicado"])
+        self.assertEqual(
+            [r["status"] for r in response.data["resultados"]], [424, 424, 400]
+        )
+        self.assertIn("titulo", response.data["resultados"][2]["erros"])
+        self.assertEqual(Tarefa.objects.filter(usuario=self.user).count(), 2)
+
+    def test_modo_parcial_aplica_operacoes_validas(self) -> None:
+        response = self.client.post(
+            URL,
+            {
+                "modo": "parcial",
+                "operacoes": [
+                    self._criar("Criada no modo parcial"),
+                    {
+                        "acao": "atualizar",
+                        "id": self.tarefa.id,
+                        "dados": {"status": "CONCLUIDA"},
+                    },
+                    {
+                        "acao": "atualizar",
+                        "id": self.removivel.id,
+                        "dados": {"titulo": "x"},
+                    },
+                ],
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [r["status"] for r in response.data["resultados"]], [201, 200, 400]
+        )
+        self.assertTrue(
+            Tarefa.objects.filter(titulo="Criada no modo parcial").exists()
+        )
+        self.removivel.refresh_from_db()
+        self.assertEqual(self.removivel.titulo, "Tarefa removível")
+
+    def test_transicao_de_status_segue_regras_do_serializer(self) -> None:
+        Tarefa.objects.filter(id=self.tarefa.id).update(status="CONCLUIDA")
+
+        response = self.client.post(
+            URL,
+            {
+                "operacoes": [
+                    {
+                        "acao": "atualizar",
+                        "id": self.tarefa.id,
+                        "dados": {"status": "PENDENTE"},
+                    }
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        resultado = response.data["resultados"][0]
+        self.assertEqual(
+            resultado["erros"]["status"][0], "Transição de status inválida."
+        )
+
+    def test_tarefa_de_outro_usuario_retorna_404_no_item(self) -> None:
+        alheia = Tarefa.objects.create(
+            usuario=self.other,
+            titulo="Tarefa alheia",
+            descricao="Não pertence ao usuário autenticado.",
+        )
+
+        response = self.client.post(
+            URL,
+            {"modo": "parcial", "operacoes": [{"acao": "excluir", "id": alheia.id}]},
+            format="json",
+        )
+
+        self.assertEqual(response.data["resultados"][0]["status"], 404)
+        self.assertTrue(Tarefa.objects.filter(id=alheia.id).exists())
+
+    def test_id_repetido_no_lote(self) -> None:
+        response = self.client.post(
+            URL,
+            {
+                "modo": "parcial",
+                "operacoes": [
+                    {"acao": "excluir", "id": self.tarefa.id},
+                    {"acao": "excluir", "id": self.tarefa.id},
+                ],
+            },
+            format="json",
+        )
+
+        self.assertEqual(
+            [r["status"] for r in response.data["resultados"]], [204, 400]
+        )
+
+    def test_envelope_invalido(self) -> None:
+        for corpo in (
+            {"operacoes": []},
+            {"operacoes": "x"},
+            {"modo": "outro", "operacoes": [self._criar()]},
+        ):
+            with self.subTest(corpo=corpo):
+                response = self.client.post(URL, corpo, format="json")
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_versao_incrementa_uma_vez_por_lote(self) -> None:
+        versao = VersaoTarefas.objects.get(usuario=self.user).versao
+
+        self.client.post(
+            URL,
+            {
+                "operacoes": [
+                    self._criar("Primeira"),
+                    self._criar("Segunda"),
+                    {"acao": "excluir", "id": self.removivel.id},
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(
+            VersaoTarefas.objects.get(usuario=self.user).versao, versao + 1
+        )
+
+    @override_settings(
+        TAREFAS_SEARCH_BACKEND="tarefas.search.IndiceInvertidoBackend"
+    )
+    def test_criadas_em_lote_sao_indexadas(self) -> None:
+        response = self.client.post(
+            URL, {"operacoes": [self._criar("Orçamento anual")]}, format="json"
+        )
+
+        tarefa_id = response.data["resultados"][0]["tarefa"]["id"]
+        self.assertTrue(
+            TermoTarefa.objects.filter(tarefa_id=tarefa_id, termo="orcamento").exists()
+        )
+
+    def test_banco_sem_retorno_de_ids_no_insert_em_lote(self) -> None:
+        # Caminho usado no MySQL: save() por linha, ajustes agrupados
+        with mock.patch.object(
+            type(connection.features),
+            "can_return_rows_from_bulk_insert",
+            new_callable=mock.PropertyMock,
+            return_value=False,
+        ):
+            response = self.client.post(
+                URL,
+                {"operacoes": [self._criar("Primeira"), self._criar("Segunda")]},
+                format="json",
+            )
+
+        ids = [r["tarefa"]["id"] for r in response.data["resultados"]]
+        self.assertEqual(Tarefa.objects.filter(id__in=ids).count(), 2)
+        self.assertEqual(divergencias(), {})
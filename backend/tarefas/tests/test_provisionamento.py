@@ -0,0 +1,284 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tarefas import provisionamento
+from tarefas.models import EmailNormalizado, UsuarioPerfil
+from tarefas.provisionamento import (
+    pool_da_requisicao,
+    pool_de_hash,
+    provisionar_usuarios,
+)
+
+URL = "/api/usuarios/provisionar/"
+
+
+def _csv(*linhas):
+    return "nome,email,password\n" + "".join(f"{linha}\n" for linha in linhas)
+
+
+@override_settings(TAREFAS_PROVISIONAMENTO_PROCESSOS=1)
+class ProvisionamentoUsuariosTests(APITestCase):
+    def setUp(self) -> None:
+        self.admin = User.objects.create_user(
+            username="admin@test.com", email="admin@test.com", is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+
+    def _enviar(self, corpo, content_type="text/csv"):
+        return self.client.generic(
+            "POST", URL, corpo.encode("utf-8"), content_type=content_type
+        )
+
+    def test_cria_usuarios_perfis_e_emails_normalizados(self) -> None:
+        response = self._enviar(
+            _csv(
+                "Ana Souza,Ana@Test.com,Senha1234",
+                "Bruno Lima,bruno@test.com,Senha1234",
+            )
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["criados"], 2)
+        self.assertEqual(response.data["erros"], 0)
+        ana = User.objects.get(username="Ana@Test.com")
+        self.assertEqual(response.data["resultados"][0]["id"], ana.id)
+        self.assertEqual(response.data["resultados"][0]["linha"], 2)
+        self.assertEqual(UsuarioPerfil.objects.get(user=ana).nome, "Ana Souza")
+        self.assertEqual(ana.email_normalizado.email, "ana@test.com")
+
+        self.client.force_authenticate(None)
+        login = self.client.post(
+            "/api/auth/login/", {"email": "ana@test.com", "password": "Senha1234"}
+        )
+        self.assertEqual(login.status_code, status.HTTP_200_OK)
+
+    def test_reporta_erros_por_linha_e_cria_as_validas(self) -> None:
+        User.objects.create_user(username="existe@test.com", email="existe@test.com")
+
+        response = self._enviar(
+            _csv(
+                "Válido,valido@test.com,Senha1234",
+                "Ex,nao-e-email,Senha1234",
+                "Sem Número,fraca@test.com,senhafraca",
+                "Existente,EXISTE@test.com,Senha1234",
+                "Repetido,Valido@Test.com,Senha1234",
+            )
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["criados"], 1)
+        self.assertEqual(response.data["erros"], 4)
+        por_linha = {r["linha"]: r for r in response.data["resultados"]}
+        self.assertEqual(por_linha[2]["status"], 201)
+        self.assertIn("nome", por_linha[3]["erros"])
+        self.assertIn("email", por_linha[3]["erros"])
+        self.assertIn("password", por_linha[4]["erros"])
+        self.assertEqual(por_linha[5]["erros"], {"email": ["E-mail já cadastrado."]})
+        self.assertEqual(
+            por_linha[6]["erros"], {"email": ["E-mail repetido no arquivo."]}
+        )
+        self.assertFalse(User.objects.filter(email="fraca@test.com").exists())
+
+    def test_ndjson_com_linha_malformada(self) -> None:
+        corpo = "\n".join(
+            [
+                json.dumps(
+                    {
+                        "nome": "Carla",
+                        "email": "carla@test.com",
+                        "password": "Senha1234",
+                    }
+                ),
+                "{nao e json",
+                "",
+                "[1, 2]",
+            ]
+        )
+
+        response = self._enviar(corpo, "application/x-ndjson")
+
+        self.assertEqual(response.data["criados"], 1)
+        self.assertEqual(
+            [(r["linha"], r["status"]) for r in response.data["resultados"]],
+            [(1, 201), (2, 400), (4, 400)],
+        )
+
+    def test_dedupe_em_uma_consulta_e_insercoes_em_lote(self) -> None:
+        linhas = [f"Pessoa {i},pessoa{i}@test.com,Senha1234" for i in range(30)]
+
+        # 1 SELECT de e-mails existentes + 1 INSERT para cada tabela
+        # (User, UsuarioPerfil, EmailNormalizado) + SAVEPOINT/RELEASE
+        with self.assertNumQueries(6):
+            response = self._enviar(_csv(*linhas))
+
+        self.assertEqual(response.data["criados"], 30)
+
+    def test_cadastro_concorrente_antes_do_insert(self) -> None:
+        consultar = provisionamento._ja_cadastrados
+
+        def com_registro_concorrente(normalizados, usernames):
+            cadastrados = consultar(normalizados, usernames)
+            # Um registro pela API grava o mesmo e-mail logo após a consulta
+            if not User.objects.filter(username="rafa@test.com").exists():
+                User.objects.create_user(
+                    username="rafa@test.com", email="rafa@test.com"
+                )
+            return cadastrados
+
+        with mock.patch.object(
+            provisionamento, "_ja_cadastrados", com_registro_concorrente
+        ):
+            response = self._enviar(
+                _csv("Rafa,Rafa@Test.com,Senha1234", "Sara,sara@test.com,Senha1234")
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["criados"], 1)
+        self.assertEqual(
+            [r["status"] for r in response.data["resultados"]], [400, 201]
+        )
+        self.assertEqual(
+            response.data["resultados"][0]["erros"],
+            {"email": ["E-mail já cadastrado."]},
+        )
+        self.assertTrue(User.objects.filter(username="sara@test.com").exists())
+        self.assertFalse(User.objects.filter(username="Rafa@Test.com").exists())
+
+    def test_banco_sem_retorno_de_ids_no_insert_em_lote(self) -> None:
+        # Caminho do MySQL: os ids são lidos pelo username após o INSERT
+        with mock.patch.object(
+            type(connection.features),
+            "can_return_rows_from_bulk_insert",
+            new_callable=mock.PropertyMock,
+            return_value=False,
+        ):
+            response = self._enviar(
+                _csv(
+                    "Dora Alves,dora@test.com,Senha1234",
+                    "Eli Costa,eli@test.com,Senha1234",
+                )
+            )
+
+        for resultado in response.data["resultados"]:
+            usuario = User.objects.get(pk=resultado["id"])
+            self.assertEqual(usuario.email, resultado["email"])
+            self.assertTrue(UsuarioPerfil.objects.filter(user=usuario).exists())
+
+    def test_somente_admin(self) -> None:
+        comum = User.objects.create_user(username="comum", email="comum@test.com")
+        self.client.force_authenticate(comum)
+
+        response = self._enviar(_csv("Fulano,fulano@test.com,Senha1234"))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_arquivo_invalido(self) -> None:
+        sem_coluna = self._enviar("nome,email\nFulano,fulano@test.com\n")
+        vazio = self._enviar("nome,email,password\n")
+        json_comum = self.client.post(URL, {"nome": "x"}, format="json")
+
+        self.assertEqual(sem_coluna.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(vazio.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            json_comum.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+        )
+
+    @mock.patch("tarefas.views.PROVISIONAMENTO_MAXIMO", 2)
+    def test_limite_de_registros_por_requisicao(self) -> None:
+        response = self._enviar(
+            _csv(*(f"Pessoa {i},p{i}@test.com,Senha1234" for i in range(3)))
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(User.objects.filter(email="p0@test.com").exists())
+
+
+class PoolDaRequisicaoTests(APITestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch.object(provisionamento, "_pool", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @override_settings(TAREFAS_PROVISIONAMENTO_PROCESSOS=1)
+    def test_um_processo_calcula_na_thread(self) -> None:
+        self.assertIsNone(pool_da_requisicao())
+
+    @override_settings(TAREFAS_PROVISIONAMENTO_PROCESSOS=2)
+    def test_pool_compartilhado_entre_requisicoes(self) -> None:
+        pool = pool_da_requisicao()
+        self.addCleanup(pool.shutdown)
+
+        self.assertIs(pool_da_requisicao(), pool)
+        self.assertEqual(pool._max_workers, 2)
+
+
+class ProvisionamentoComandoTests(APITestCase):
+    def _arquivo(self, extensao, conteudo):
+        descritor, caminho = tempfile.mkstemp(suffix=f".{extensao}")
+        with os.fdopen(descritor, "w", encoding="utf-8") as arquivo:
+            arquivo.write(conteudo)
+        self.addCleanup(os.remove, caminho)
+        return caminho
+
+    def test_comando_grava_em_lotes_e_reporta_erros(self) -> None:
+        caminho = self._arquivo(
+            "csv",
+            _csv(
+                "Ana Souza,ana@test.com,Senha1234",
+                "Inválido,sem-arroba,Senha1234",
+                "Bruno Lima,bruno@test.com,Senha1234",
+                "Ana de Novo,ANA@test.com,Senha1234",
+            ),
+        )
+        saida, erros = StringIO(), StringIO()
+
+        call_command(
+            "provisionar_usuarios",
+            caminho,
+            lote=2,
+            processos=1,
+            stdout=saida,
+            stderr=erros,
+        )
+
+        self.assertIn(
+            "2 usuario(s) criado(s), 2 linha(s) com erro.", saida.getvalue()
+        )
+        self.assertIn("linha 3:", erros.getvalue())
+        self.assertIn("linha 5:", erros.getvalue())
+        self.assertEqual(
+            set(EmailNormalizado.objects.values_list("email", flat=True)),
+            {"ana@test.com", "bruno@test.com"},
+        )
+
+    def test_hash_em_processos(self) -> None:
+        # Acima de HASHES_POR_ENVIO, os hashes vão de fato para os processos
+        registros = [
+            (
+                i,
+                {
+                    "nome": f"Pessoa {i}",
+                    "email": f"p{i}@test.com",
+                    "password": "Senha1234",
+                },
+                None,
+            )
+            for i in range(40)
+        ]
+
+        with pool_de_hash(2) as pool:
+            criados, _ = provisionar_usuarios(registros, pool)
+
+        self.assertEqual(criados, 40)
+        usuario = User.objects.get(username="p39@test.com")
+        self.assertTrue(usuario.check_password("Senha1234"))
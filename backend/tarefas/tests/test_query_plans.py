@@ -0,0 +1,169 @@
+import json
+import re
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tarefas.contadores import reconstruir_contadores
+from tarefas.models import Comentario, Tarefa
+
+TABELAS = ("tarefa", "tarefa_contador_status", "comentario")
+TABELA_ANALISADA = re.compile(r'FROM [`"](%s)[`"]' % "|".join(TABELAS))
+
+
+def _planos_sqlite(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        detalhes = [row[-1] for row in cursor.fetchall()]
+
+    problemas = []
+    for detalhe in detalhes:
+        if re.match(r"SCAN (%s)\b" % "|".join(TABELAS), detalhe):
+            problemas.append(f"full scan: {detalhe}")
+        if "USE TEMP B-TREE" in detalhe:
+            problemas.append(f"filesort: {detalhe}")
+    return detalhes, problemas
+
+
+def _planos_mysql(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN FORMAT=JSON {sql}")
+        plano = json.loads(cursor.fetchone()[0])
+
+    problemas = []
+
+    def visitar(no):
+        if isinstance(no, dict):
+            if no.get("table_name") in TABELAS and no.get("access_type") in (
+                "ALL",
+                "index",
+            ):
+                problemas.append(f"full scan: {no.get('access_type')}")
+            if no.get("using_filesort"):
+                problemas.append("filesort")
+            if no.get("using_temporary_table"):
+                problemas.append("temporary table")
+            for valor in no.values():
+                visitar(valor)
+        elif isinstance(no, list):
+            for valor in no:
+                visitar(valor)
+
+    visitar(plano)
+    return plano, problemas
+
+
+class QueryPlanRegressionTests(APITestCase):
+    """
+    Roda EXPLAIN em cada consulta que as variantes de listagem, filtro,
+    sincronização, dashboard e comentários emitem contra `tarefa`,
+    `tarefa_contador_status` e `comentario` e falha se
+    alguma delas cair em full scan ou filesort. A busca textual (`search`)
+    fica de fora: ela ordena pela relevância calculada, o que sempre exige
+    ordenar o conjunto encontrado.
+    """
+
+    VARIANTES = [
+        "/api/tarefas/",
+        "/api/tarefas/?ordering=criado_em",
+        "/api/tarefas/?ordering=-criado_em&page=2",
+        "/api/tarefas/?status=PENDENTE",
+        "/api/tarefas/?status=CONCLUIDA&ordering=criado_em",
+        "/api/tarefas/?prioridade=ALTA",
+        "/api/tarefas/?prioridade=BAIXA&ordering=criado_em",
+        "/api/tarefas/?status=PENDENTE&prioridade=MEDIA",
+        "/api/tarefas/?status=PENDENTE&prioridade=MEDIA&ordering=criado_em",
+        "/api/tarefas/?pagination=cursor",
+        "/api/tarefas/?pagination=cursor&ordering=criado_em&count=true",
+        "/api/tarefas/?pagination=cursor&status=EM_ANDAMENTO",
+        "/api/tarefas/changes/",
+        "/api/dashboard/",
+    ]
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.usuarios = [
+            User.objects.create_user(
+                username=f"plano{i}@test.com",
+                email=f"plano{i}@test.com",
+                password="Teste@123",
+            )
+            for i in range(3)
+        ]
+        status_choices = list(Tarefa.Status.values)
+        prioridade_choices = list(Tarefa.Prioridade.values)
+        Tarefa.objects.bulk_create(
+            [
+                Tarefa(
+                    usuario=usuario,
+                    titulo=f"Tarefa {i}",
+                    descricao="Descrição para análise de planos.",
+                    status=status_choices[i % len(status_choices)],
+                    prioridade=prioridade_choices[i % len(prioridade_choices)],
+                )
+                for usuario in cls.usuarios
+                for i in range(200)
+            ]
+        )
+        reconstruir_contadores()
+        tarefas = list(Tarefa.objects.filter(usuario=cls.usuarios[0])[:3])
+        Comentario.objects.bulk_create(
+            [
+                Comentario(tarefa=tarefa, usuario=cls.usuarios[0], texto=f"C{i}")
+                for tarefa in tarefas
+                for i in range(100)
+            ]
+        )
+        cls.tarefa_comentada = tarefas[0]
+        if connection.vendor == "mysql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "ANALYZE TABLE tarefa, tarefa_contador_status, comentario"
+                )
+
+    def setUp(self) -> None:
+        if connection.vendor == "sqlite":
+            self.explicar = _planos_sqlite
+        elif connection.vendor == "mysql":
+            self.explicar = _planos_mysql
+        else:
+            self.skipTest(f"EXPLAIN não suportado para {connection.vendor}.")
+
+        self.client.force_authenticate(self.usuarios[0])
+
+    def _consultas_tarefa(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            # Segue o cursor para também cobrir a consulta com posição
+            proxima = response.data.get("next") if "cursor" in url else None
+            if proxima and "cursor=" in proxima:
+                self.client.get(proxima)
+
+        return [
+            q["sql"]
+            for q in ctx.captured_queries
+            if TABELA_ANALISADA.search(q["sql"])
+        ]
+
+    def test_variantes_usam_indice_sem_filesort(self) -> None:
+        self._verificar(self.VARIANTES)
+
+    def test_comentarios_usam_indice_sem_filesort(self) -> None:
+        url = f"/api/tarefas/{self.tarefa_comentada.id}/comentarios/"
+        # `cursor` na URL só para seguir o `next` (a paginação já é keyset)
+        self._verificar(
+            [f"{url}?cursor=", f"{url}?cursor=&ordering=criado_em&count=true"]
+        )
+
+    def _verificar(self, urls):
+        for url in urls:
+            consultas = self._consultas_tarefa(url)
+            self.assertTrue(consultas, url)
+            for sql in consultas:
+                with self.subTest(url=url, sql=sql):
+                    plano, problemas = self.explicar(sql)
+                    self.assertEqual(problemas, [], f"{url}\n{sql}\n{plano}")
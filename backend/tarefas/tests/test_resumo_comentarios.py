@@ -0,0 +1,134 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tarefas.models import Comentario, Tarefa
+
+URL = "/api/tarefas/"
+
+
+class ResumoComentariosTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="resumo@test.com", email="resumo@test.com"
+        )
+        self.client.force_authenticate(self.user)
+
+    def _tarefa(self, titulo="Tarefa com comentários"):
+        return Tarefa.objects.create(
+            usuario=self.user,
+            titulo=titulo,
+            descricao="Descrição da tarefa com comentários.",
+        )
+
+    def _comentar(self, tarefa, texto, minutos_atras=0):
+        comentario = Comentario.objects.create(
+            tarefa=tarefa, usuario=self.user, texto=texto
+        )
+        # auto_now_add ignora o valor passado no create
+        Comentario.objects.filter(pk=comentario.pk).update(
+            criado_em=timezone.now() - timedelta(minutes=minutos_atras)
+        )
+        return comentario
+
+    def _por_id(self, response):
+        return {registro["id"]: registro for registro in response.data["results"]}
+
+    def test_total_e_ultimo_comentario_por_tarefa(self) -> None:
+        comentada = self._tarefa()
+        sem_comentarios = self._tarefa("Tarefa sem comentários")
+        self._comentar(comentada, "Mais antigo", minutos_atras=10)
+        recente = self._comentar(comentada, "Mais recente", minutos_atras=1)
+        self._comentar(comentada, "Intermediário", minutos_atras=5)
+
+        response = self.client.get(URL, {"incluir": "comentarios"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        registros = self._por_id(response)
+        self.assertEqual(registros[comentada.id]["comentarios_count"], 3)
+        ultimo = registros[comentada.id]["ultimo_comentario"]
+        self.assertEqual(ultimo["id"], recente.id)
+        self.assertEqual(ultimo["texto"], "Mais recente")
+        self.assertEqual(ultimo["tarefa"], comentada.id)
+        self.assertEqual(ultimo["usuario"], self.user.id)
+        self.assertEqual(registros[sem_comentarios.id]["comentarios_count"], 0)
+        self.assertIsNone(registros[sem_comentarios.id]["ultimo_comentario"])
+
+    def test_campos_so_com_o_parametro(self) -> None:
+        self._comentar(self._tarefa(), "Comentário")
+
+        registro = self.client.get(URL).data["results"][0]
+
+        self.assertNotIn("comentarios_count", registro)
+        self.assertNotIn("ultimo_comentario", registro)
+
+    def test_formato_igual_ao_endpoint_de_comentarios(self) -> None:
+        tarefa = self._tarefa()
+        self._comentar(tarefa, "Único comentário")
+
+        listagem = self.client.get(URL, {"incluir": "comentarios"})
+        comentarios = self.client.get(f"{URL}{tarefa.id}/comentarios/")
+
+        self.assertEqual(
+            listagem.data["results"][0]["ultimo_comentario"],
+            comentarios.data["results"][0],
+        )
+
+    def _consultas(self, params):
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(URL, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(consultas)
+
+    def test_numero_de_consultas_nao_depende_das_tarefas(self) -> None:
+        for i in range(2):
+            self._comentar(self._tarefa(f"Tarefa {i}"), f"Comentário {i}")
+        poucas = self._consultas({"incluir": "comentarios"})
+        sem_resumo = self._consultas({})
+
+        for i in range(2, 12):
+            tarefa = self._tarefa(f"Tarefa {i}")
+            for j in range(3):
+                self._comentar(tarefa, f"Comentário {i}.{j}")
+
+        self.assertEqual(self._consultas({"incluir": "comentarios"}), poucas)
+        self.assertEqual(poucas, sem_resumo + 1)
+        self.assertEqual(
+            self._consultas({"incluir": "comentarios", "pagination": "cursor"}),
+            self._consultas({"pagination": "cursor"}) + 1,
+        )
+
+    def test_novo_comentario_invalida_o_etag(self) -> None:
+        tarefa = self._tarefa()
+        primeira = self.client.get(URL, {"incluir": "comentarios"})
+
+        self.client.post(
+            f"{URL}{tarefa.id}/comentarios/", {"texto": "Novo"}, format="json"
+        )
+        segunda = self.client.get(
+            URL,
+            {"incluir": "comentarios"},
+            HTTP_IF_NONE_MATCH=primeira["ETag"],
+        )
+
+        self.assertEqual(segunda.status_code, status.HTTP_200_OK)
+        self.assertEqual(segunda.data["results"][0]["comentarios_count"], 1)
+
+    def test_comentario_removido_invalida_o_etag(self) -> None:
+        comentario = self._comentar(self._tarefa(), "Vai sair")
+        primeira = self.client.get(URL, {"incluir": "comentarios"})
+
+        comentario.delete()
+        segunda = self.client.get(
+            URL,
+            {"incluir": "comentarios"},
+            HTTP_IF_NONE_MATCH=primeira["ETag"],
+        )
+
+        self.assertEqual(segunda.status_code, status.HTTP_200_OK)
+        self.assertEqual(segunda.data["results"][0]["comentarios_count"], 0)
@@ -0,0 +1,171 @@
+from importlib import import_module
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tarefas.models import Tarefa, TermoTarefa, UsuarioPerfil
+from tarefas.search import expressao_fulltext, termos_da_tarefa, tokenizar
+
+
+class TokenizacaoTests(TestCase):
+    def test_remove_acentos_caixa_e_stopwords(self) -> None:
+        self.assertEqual(tokenizar("Revisão da AÇÃO"), ["revisao", "acao"])
+
+    def test_reduz_plural(self) -> None:
+        self.assertEqual(
+            tokenizar("tarefas relatórios ações"),
+            ["tarefa", "relatorio", "acao"],
+        )
+
+    def test_titulo_pesa_mais_que_descricao(self) -> None:
+        pesos = termos_da_tarefa("Relatório", "relatório mensal")
+
+        self.assertEqual(pesos["relatorio"], 4)
+        self.assertEqual(pesos["mensal"], 1)
+
+    def test_copia_da_migracao_indexa_como_o_app(self) -> None:
+        # Se falhar, o tokenizador mudou: crie uma migração que reindexe
+        migracao = import_module("tarefas.migrations.0004_busca_textual")
+        for titulo, descricao in (
+            ("Revisão da AÇÃO", "relatórios, ações e 3 papéis"),
+            ("Ir à reunião", "a b 7 " + "x" * 80),
+        ):
+            with self.subTest(titulo=titulo):
+                self.assertEqual(
+                    migracao.termos_da_tarefa(titulo, descricao),
+                    termos_da_tarefa(titulo, descricao),
+                )
+
+
+class ExpressaoFullTextTests(TestCase):
+    def test_termos_obrigatorios_e_ultimo_por_prefixo(self) -> None:
+        self.assertEqual(
+            expressao_fulltext("revisão contrato"), "+revisão +contrato*"
+        )
+
+    def test_descarta_stopwords_e_termos_curtos(self) -> None:
+        self.assertEqual(
+            expressao_fulltext("revisão de um contrato do cliente"),
+            "+revisão +contrato +cliente*",
+        )
+
+    def test_sem_termo_indexavel(self) -> None:
+        for consulta in ("", "a", "de", "o de"):
+            with self.subTest(consulta=consulta):
+                self.assertEqual(expressao_fulltext(consulta), "")
+
+
+@override_settings(TAREFAS_SEARCH_BACKEND="tarefas.search.IndiceInvertidoBackend")
+class IndiceInvertidoTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="busca@test.com",
+            email="busca@test.com",
+            password="Teste@123",
+        )
+        UsuarioPerfil.objects.create(user=self.user, nome="Busca")
+        self.other = User.objects.create_user(
+            username="outro@test.com",
+            email="outro@test.com",
+            password="Teste@123",
+        )
+        self.client.force_authenticate(self.user)
+
+        self.no_titulo = Tarefa.objects.create(
+            usuario=self.user,
+            titulo="Revisão da ação judicial",
+            descricao="Conferir prazos com o escritório.",
+        )
+        self.na_descricao = Tarefa.objects.create(
+            usuario=self.user,
+            titulo="Reunião semanal",
+            descricao="Levar a revisão do contrato para a reunião.",
+        )
+        self.sem_relacao = Tarefa.objects.create(
+            usuario=self.user,
+            titulo="Comprar materiais",
+            descricao="Papel, canetas e grampeador.",
+        )
+
+    def _buscar(self, termo):
+        response = self.client.get("/api/tarefas/", {"search": termo})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item["id"] for item in response.data["results"]]
+
+    def test_busca_ignora_acentos(self) -> None:
+        self.assertEqual(self._buscar("acao"), [self.no_titulo.id])
+        self.assertEqual(self._buscar("AÇÃO"), [self.no_titulo.id])
+
+    def test_ordena_por_relevancia(self) -> None:
+        self.assertEqual(
+            self._buscar("revisão"), [self.no_titulo.id, self.na_descricao.id]
+        )
+
+    def test_ordering_explicito_tem_precedencia(self) -> None:
+        response = self.client.get(
+            "/api/tarefas/", {"search": "revisao", "ordering": "-criado_em"}
+        )
+
+        ids = [item["id"] for item in response.data["results"]]
+        self.assertEqual(ids, [self.na_descricao.id, self.no_titulo.id])
+
+    def test_consulta_sem_termo_indexavel_usa_icontains(self) -> None:
+        # "de" é stopword e "z" é curto demais: nenhum dos dois vai ao índice
+        self.assertEqual(self._buscar("de"), [])
+        self.assertEqual(self._buscar("z"), [self.no_titulo.id])
+
+    def test_todos_os_termos_precisam_casar(self) -> None:
+        self.assertEqual(self._buscar("revisão contrato"), [self.na_descricao.id])
+
+    def test_ultimo_termo_casa_por_prefixo(self) -> None:
+        self.assertEqual(self._buscar("grampe"), [self.sem_relacao.id])
+
+    def test_nao_retorna_tarefas_de_outro_usuario(self) -> None:
+        Tarefa.objects.create(
+            usuario=self.other,
+            titulo="Revisão de outro usuário",
+            descricao="Não deve aparecer na busca.",
+        )
+
+        self.assertEqual(
+            self._buscar("revisao"), [self.no_titulo.id, self.na_descricao.id]
+        )
+
+    def test_atualizacao_reindexa_tarefa(self) -> None:
+        self.sem_relacao.titulo = "Comprar toner"
+        self.sem_relacao.save()
+
+        self.assertEqual(self._buscar("toner"), [self.sem_relacao.id])
+        self.assertEqual(self._buscar("materiais"), [])
+
+    def test_exclusao_remove_termos(self) -> None:
+        tarefa_id = self.no_titulo.id
+        self.no_titulo.delete()
+
+        self.assertFalse(TermoTarefa.objects.filter(tarefa_id=tarefa_id).exists())
+
+    def test_atribuir_move_termos_para_novo_dono(self) -> None:
+        response = self.client.post(
+            f"/api/tarefas/{self.no_titulo.id}/atribuir/",
+            {"email": self.other.email},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self._buscar("judicial"), [])
+        self.assertTrue(
+            TermoTarefa.objects.filter(
+                tarefa=self.no_titulo, usuario=self.other
+            ).exists()
+        )
+
+    def test_comando_reindexar_busca(self) -> None:
+        TermoTarefa.objects.all().delete()
+
+        call_command("reindexar_busca", stdout=StringIO())
+
+        self.assertEqual(self._buscar("grampeador"), [self.sem_relacao.id])
@@ -0,0 +1,140 @@
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth.hashers import check_password, make_password
+from django.contrib.auth.models import User
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tarefas.senhas import PoolSenhas
+
+LOGIN = "/api/auth/login/"
+REGISTRO = "/api/auth/register/"
+
+
+class PoolSenhasTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="senha@test.com",
+            email="senha@test.com",
+            password="Teste@123",
+        )
+        self.liberar = threading.Event()
+        self.addCleanup(self.liberar.set)
+
+    def _pool(self, workers=1, fila=0):
+        pool = PoolSenhas(workers, fila)
+        patcher = mock.patch("tarefas.senhas._pool", pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return pool
+
+    def _ocupar(self, pool):
+        """Ocupa um worker até o fim do teste."""
+        return pool.submeter(self.liberar.wait)
+
+    def test_login_expoe_tempo_do_hash(self) -> None:
+        response = self.client.post(
+            LOGIN, {"email": "senha@test.com", "password": "Teste@123"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertRegex(
+            response["Server-Timing"], r"^senha-fila;dur=[\d.]+, senha;dur=[\d.]+$"
+        )
+
+    def test_pool_cheio_recusa_login_com_503(self) -> None:
+        self._ocupar(self._pool(workers=1, fila=0))
+
+        response = self.client.post(
+            LOGIN, {"email": "senha@test.com", "password": "Teste@123"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response["Retry-After"], "1")
+
+    def test_pool_cheio_recusa_registro_sem_criar_usuario(self) -> None:
+        self._ocupar(self._pool(workers=1, fila=0))
+
+        response = self.client.post(
+            REGISTRO,
+            {"nome": "Novo", "email": "novo@test.com", "password": "Teste@123"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertFalse(User.objects.filter(email="novo@test.com").exists())
+
+    @override_settings(TAREFAS_SENHAS_TIMEOUT=0.05)
+    def test_espera_longa_na_fila_vira_503_e_libera_vaga(self) -> None:
+        pool = self._pool(workers=1, fila=1)
+        ocupado = self._ocupar(pool)
+
+        response = self.client.post(
+            LOGIN, {"email": "senha@test.com", "password": "Teste@123"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        self.liberar.set()
+        ocupado.result(timeout=5)
+        response = self.client.post(
+            LOGIN, {"email": "senha@test.com", "password": "Teste@123"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(TAREFAS_SENHAS_TIMEOUT=0.05)
+    def test_hash_em_execucao_nao_e_abandonado_no_timeout(self) -> None:
+        self._pool(workers=1, fila=1)
+
+        def devagar(funcao):
+            # Já em execução quando o prazo da fila vence
+            def executar(*args):
+                time.sleep(0.2)
+                return funcao(*args)
+
+            return executar
+
+        with mock.patch("tarefas.senhas.check_password", devagar(check_password)):
+            login = self.client.post(
+                LOGIN, {"email": "senha@test.com", "password": "Teste@123"}
+            )
+        with mock.patch("tarefas.senhas.make_password", devagar(make_password)):
+            registro = self.client.post(
+                REGISTRO,
+                {"nome": "Novo", "email": "novo@test.com", "password": "Teste@123"},
+            )
+
+        self.assertEqual(login.status_code, status.HTTP_200_OK)
+        self.assertEqual(registro.status_code, status.HTTP_201_CREATED)
+
+    @override_settings(
+        PASSWORD_HASHERS=[
+            "django.contrib.auth.hashers.MD5PasswordHasher",
+            "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+        ]
+    )
+    def test_login_atualiza_hash_antigo(self) -> None:
+        self.user.password = make_password("Teste@123", hasher="pbkdf2_sha256")
+        self.user.save()
+
+        response = self.client.post(
+            LOGIN, {"email": "senha@test.com", "password": "Teste@123"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("md5$"))
+        self.assertTrue(self.user.check_password("Teste@123"))
+
+    def test_registro_grava_hash_do_pool(self) -> None:
+        response = self.client.post(
+            REGISTRO,
+            {"nome": "Novo", "email": "Novo@Test.com", "password": "Teste@123"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn("Server-Timing", response)
+        user = User.objects.get(username="Novo@Test.com")
+        self.assertTrue(user.check_password("Teste@123"))
+        self.assertEqual(user.email, "Novo@test.com")
@@ -0,0 +1,164 @@
+import base64
+import json
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tarefas.models import Tarefa, TarefaRemovida
+
+URL = "/api/tarefas/changes/"
+
+
+class SincronizacaoTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="sync@test.com",
+            email="sync@test.com",
+            password="Teste@123",
+        )
+        self.other = User.objects.create_user(
+            username="outro@test.com",
+            email="outro@test.com",
+            password="Teste@123",
+        )
+        self.client.force_authenticate(self.user)
+
+        self.tarefas = [self._criar(f"Tarefa {i}") for i in range(3)]
+        # Fora da margem de concorrência, para não serem relidas
+        for minutos, tarefa in enumerate(self.tarefas):
+            Tarefa.objects.filter(pk=tarefa.pk).update(
+                atualizado_em=timezone.now() - timedelta(hours=1, minutes=-minutos)
+            )
+
+    def _criar(self, titulo, usuario=None):
+        return Tarefa.objects.create(
+            usuario=usuario or self.user,
+            titulo=titulo,
+            descricao="Descrição da tarefa sincronizada.",
+        )
+
+    def _sincronizar(self, since=None):
+        response = self.client.get(URL, {"since": since} if since else {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def _avancar_relogio(self, segundos=60):
+        agora = timezone.now() + timedelta(seconds=segundos)
+        return mock.patch("django.utils.timezone.now", return_value=agora)
+
+    def test_sincronizacao_completa(self) -> None:
+        dados = self._sincronizar()
+
+        self.assertEqual(
+            [t["id"] for t in dados["alteradas"]], [t.id for t in self.tarefas]
+        )
+        self.assertEqual(dados["removidas"], [])
+        self.assertFalse(dados["tem_mais"])
+
+    def test_retorna_apenas_alteracoes_desde_o_token(self) -> None:
+        token = self._sincronizar()["proximo"]
+
+        with self._avancar_relogio():
+            self.tarefas[1].titulo = "Tarefa renomeada"
+            self.tarefas[1].save()
+            nova = self._criar("Tarefa nova")
+            dados = self._sincronizar(token)
+
+        self.assertEqual(
+            [t["id"] for t in dados["alteradas"]], [self.tarefas[1].id, nova.id]
+        )
+        self.assertEqual(dados["alteradas"][0]["titulo"], "Tarefa renomeada")
+
+    def test_exclusao_e_atribuicao_geram_lapides(self) -> None:
+        token = self._sincronizar()["proximo"]
+        excluida_id = self.tarefas[0].id
+
+        with self._avancar_relogio():
+            self.tarefas[0].delete()
+            self.client.post(
+                f"/api/tarefas/{self.tarefas[2].id}/atribuir/",
+                {"email": self.other.email},
+                format="json",
+            )
+            dados = self._sincronizar(token)
+
+        self.assertEqual(dados["alteradas"], [])
+        self.assertEqual(dados["removidas"], [excluida_id, self.tarefas[2].id])
+        self.assertEqual(
+            TarefaRemovida.objects.get(tarefa_id=self.tarefas[2].id).motivo,
+            TarefaRemovida.Motivo.ATRIBUIDA,
+        )
+
+        # Quem recebeu a tarefa a vê como alteração
+        self.client.force_authenticate(self.other)
+        dados = self._sincronizar()
+        self.assertEqual([t["id"] for t in dados["alteradas"]], [self.tarefas[2].id])
+
+    def test_rele_commits_atrasados_dentro_da_margem(self) -> None:
+        token = self._sincronizar()["proximo"]
+        # Gravada um instante antes da emissão do token, mas só visível depois
+        Tarefa.objects.filter(pk=self.tarefas[0].pk).update(
+            titulo="Commit atrasado",
+            atualizado_em=timezone.now() - timedelta(seconds=1),
+        )
+
+        dados = self._sincronizar(token)
+
+        self.assertEqual([t["titulo"] for t in dados["alteradas"]], ["Commit atrasado"])
+
+    def test_paginacao_por_limite(self) -> None:
+        with mock.patch("tarefas.sincronizacao.LIMITE_SINCRONIZACAO", 2):
+            primeira = self._sincronizar()
+            segunda = self._sincronizar(primeira["proximo"])
+
+        self.assertTrue(primeira["tem_mais"])
+        self.assertFalse(segunda["tem_mais"])
+        ids = [t["id"] for t in primeira["alteradas"] + segunda["alteradas"]]
+        self.assertEqual(ids, [t.id for t in self.tarefas])
+
+    def test_token_invalido(self) -> None:
+        response = self.client.get(URL, {"since": "nao-e-um-token"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_token_com_data_sem_fuso(self) -> None:
+        ingenuo = "2026-01-01T00:00:00"
+        for dados in (
+            {"a": None, "r": ["2026-01-01T00:00:00+00:00", 0], "c": 1, "e": ingenuo},
+            {"a": None, "r": [ingenuo, 0], "c": 1, "e": "2026-01-01T00:00:00Z"},
+        ):
+            with self.subTest(dados=dados):
+                token = base64.urlsafe_b64encode(json.dumps(dados).encode()).decode()
+                response = self.client.get(URL, {"since": token})
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(TAREFAS_SYNC_RETENCAO_DIAS=7)
+    def test_token_fora_da_retencao_retorna_410(self) -> None:
+        token = self._sincronizar()["proximo"]
+
+        with self._avancar_relogio(segundos=8 * 24 * 3600):
+            response = self.client.get(URL, {"since": token})
+
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+    @override_settings(TAREFAS_SYNC_RETENCAO_DIAS=7)
+    def test_comando_compacta_lapides_antigas(self) -> None:
+        antiga_id, recente_id = self.tarefas[0].id, self.tarefas[1].id
+        self.tarefas[0].delete()
+        self.tarefas[1].delete()
+        TarefaRemovida.objects.filter(tarefa_id=antiga_id).update(
+            removida_em=timezone.now() - timedelta(days=8)
+        )
+
+        call_command("compactar_remocoes", stdout=StringIO())
+
+        self.assertEqual(
+            list(TarefaRemovida.objects.values_list("tarefa_id", flat=True)),
+            [recente_id],
+        )
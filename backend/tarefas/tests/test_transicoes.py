@@ -0,0 +1,146 @@
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tarefas.contadores import divergencias
+from tarefas.models import Tarefa, UsuarioPerfil
+from tarefas.transicoes import PREDECESSORES_STATUS
+
+
+class TransicaoStatusTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="cas@test.com",
+            email="cas@test.com",
+            password="Teste@123",
+        )
+        UsuarioPerfil.objects.create(user=self.user, nome="Cas")
+        self.other = User.objects.create_user(
+            username="outro@test.com",
+            email="outro@test.com",
+            password="Teste@123",
+        )
+        self.client.force_authenticate(self.user)
+
+        self.pendente = self._tarefa(Tarefa.Status.PENDENTE)
+        self.andamento = self._tarefa(Tarefa.Status.EM_ANDAMENTO)
+        self.concluida = self._tarefa(Tarefa.Status.CONCLUIDA)
+
+    def _tarefa(self, status_inicial, usuario=None):
+        return Tarefa.objects.create(
+            usuario=usuario or self.user,
+            titulo=f"Tarefa {status_inicial}",
+            descricao="Descrição da tarefa de transição.",
+            status=status_inicial,
+        )
+
+    def test_predecessores_derivados_do_fluxo(self) -> None:
+        self.assertEqual(
+            set(PREDECESSORES_STATUS[Tarefa.Status.CONCLUIDA]),
+            {Tarefa.Status.PENDENTE, Tarefa.Status.EM_ANDAMENTO},
+        )
+        self.assertEqual(PREDECESSORES_STATUS[Tarefa.Status.PENDENTE], ())
+
+    def test_transicao_valida_em_um_update(self) -> None:
+        url = f"/api/tarefas/{self.pendente.id}/status/"
+
+        # EM_ANDAMENTO tem um único predecessor: savepoint, o UPDATE da
+        # tarefa, dois contadores, a versão e o release; nenhum SELECT.
+        with self.assertNumQueries(6):
+            response = self.client.post(
+                url, {"status": "EM_ANDAMENTO"}, format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data, {"id": self.pendente.id, "status": "EM_ANDAMENTO"}
+        )
+        self.pendente.refresh_from_db()
+        self.assertEqual(self.pendente.status, Tarefa.Status.EM_ANDAMENTO)
+        self.assertEqual(divergencias(), {})
+
+    def test_transicao_invalida_retorna_400(self) -> None:
+        response = self.client.post(
+            f"/api/tarefas/{self.concluida.id}/status/",
+            {"status": "PENDENTE"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["status"], "Transição de status inválida.")
+        self.concluida.refresh_from_db()
+        self.assertEqual(self.concluida.status, Tarefa.Status.CONCLUIDA)
+
+    def test_tarefa_de_outro_usuario_retorna_404(self) -> None:
+        alheia = self._tarefa(Tarefa.Status.PENDENTE, usuario=self.other)
+
+        response = self.client.post(
+            f"/api/tarefas/{alheia.id}/status/",
+            {"status": "CONCLUIDA"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        alheia.refresh_from_db()
+        self.assertEqual(alheia.status, Tarefa.Status.PENDENTE)
+
+    def test_id_nao_numerico_retorna_404(self) -> None:
+        for pk in ("abc", "²"):
+            with self.subTest(pk=pk):
+                response = self.client.post(
+                    f"/api/tarefas/{pk}/status/",
+                    {"status": "CONCLUIDA"},
+                    format="json",
+                )
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_status_desconhecido(self) -> None:
+        response = self.client.post(
+            f"/api/tarefas/{self.pendente.id}/status/",
+            {"status": "ARQUIVADA"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_transicao_em_lote_separa_resultados(self) -> None:
+        alheia = self._tarefa(Tarefa.Status.PENDENTE, usuario=self.other)
+        cancelada = self._tarefa(Tarefa.Status.CANCELADA)
+
+        response = self.client.post(
+            "/api/tarefas/status/",
+            {
+                "status": "CONCLUIDA",
+                "ids": [
+                    self.pendente.id,
+                    self.andamento.id,
+                    self.concluida.id,
+                    cancelada.id,
+                    alheia.id,
+                ],
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["atualizadas"],
+            sorted([self.pendente.id, self.andamento.id]),
+        )
+        self.assertEqual(response.data["inalteradas"], [self.concluida.id])
+        self.assertEqual(response.data["invalidas"], [cancelada.id])
+        self.assertEqual(response.data["nao_encontradas"], [alheia.id])
+        self.assertEqual(divergencias(), {})
+
+    def test_transicao_atualiza_etag_do_dashboard(self) -> None:
+        etag = self.client.get("/api/dashboard/")["ETag"]
+
+        self.client.post(
+            f"/api/tarefas/{self.pendente.id}/status/",
+            {"status": "CONCLUIDA"},
+            format="json",
+        )
+
+        response = self.client.get("/api/dashboard/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["por_status"][Tarefa.Status.CONCLUIDA], 2)
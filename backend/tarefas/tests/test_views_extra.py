@@ -169,19 +169,18 @@ class ComentarioViewTests(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         # deve retornar apenas os comentários ligados à tarefa do usuário logado
-        self.assertEqual(len(response.data), 2)
-        ids = {c["id"] for c in response.data}
+        self.assertEqual(len(response.data["results"]), 2)
+        ids = {c["id"] for c in response.data["results"]}
         self.assertIn(self.comentario1.id, ids)
         self.assertIn(self.comentario2.id, ids)
 
-    def test_lista_comentarios_para_tarefa_de_outro_usuario_vazia(self) -> None:
+    def test_lista_comentarios_para_tarefa_de_outro_usuario_404(self) -> None:
         url = f"/api/tarefas/{self.tarefa_other.id}/comentarios/"
 
         response = self.client.get(url)
 
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
-        # filtro em get_queryset garante que tarefa__usuario seja o usuário logado
-        self.assertEqual(len(response.data), 0)
+        # a posse da tarefa é conferida antes de listar, como na criação
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
     def test_cria_comentario_para_tarefa_do_usuario(self) -> None:
         url = f"/api/tarefas/{self.tarefa_user.id}/comentarios/"
@@ -0,0 +1,98 @@
+from collections import Counter
+
+from django.db import transaction
+from django.utils import timezone
+
+from .contadores import ajustar_contadores, incrementar_versoes
+from .eventos import notificar_tarefas
+from .models import Tarefa
+
+Status = Tarefa.Status
+
+# Fluxo de status: destinos permitidos a partir de cada status
+TRANSICOES_STATUS = {
+    Status.PENDENTE: frozenset(
+        {Status.PENDENTE, Status.EM_ANDAMENTO, Status.CONCLUIDA}
+    ),
+    Status.EM_ANDAMENTO: frozenset({Status.EM_ANDAMENTO, Status.CONCLUIDA}),
+    Status.CONCLUIDA: frozenset({Status.CONCLUIDA}),
+    # CANCELADA não faz parte do fluxo obrigatório, mas se usada é final
+    Status.CANCELADA: frozenset({Status.CANCELADA}),
+}
+
+# Inverso do fluxo: status de origem (diferentes do destino) que podem chegar
+# em cada destino. É o `status IN (...)` do UPDATE condicional.
+PREDECESSORES_STATUS = {
+    destino: tuple(
+        origem
+        for origem, destinos in TRANSICOES_STATUS.items()
+        if destino in destinos and origem != destino
+    )
+    for destino in Status.values
+}
+
+TRANSICAO_MAXIMA = 1000
+
+
+def transicao_permitida(origem, destino):
+    return destino in TRANSICOES_STATUS.get(origem, {origem})
+
+
+def transicionar_status(usuario_id, ids, destino):
+    """
+    Aplica `destino` às tarefas `ids` do usuário com UPDATEs condicionais
+    (compare-and-set): `WHERE id IN (...) AND usuario_id = ? AND status = ?`,
+    sem ler as tarefas antes. Retorna os ids separados em `atualizadas`,
+    `inalteradas` (já estavam no destino), `invalidas` e `nao_encontradas`.
+    """
+    ids = set(ids)
+    deltas = Counter()
+
+    with transaction.atomic():
+        agora = timezone.now()
+        # Um UPDATE por status de origem (no máximo dois), para saber quantas
+        # tarefas saíram de cada status e manter os contadores exatos.
+        for origem in PREDECESSORES_STATUS[destino]:
+            alterou = Tarefa.objects.filter(
+                pk__in=ids, usuario_id=usuario_id, status=origem
+            ).update(status=destino, atualizado_em=agora)
+            if alterou:
+                deltas[(usuario_id, origem)] -= alterou
+                deltas[(usuario_id, destino)] += alterou
+
+        total = deltas[(usuario_id, destino)]
+        if total:
+            ajustar_contadores(deltas)
+            incrementar_versoes([usuario_id])
+
+        if total == len(ids):
+            # Caso comum (ex.: uma única tarefa): o rowcount já responde
+            notificar_tarefas(usuario_id, "salva", sorted(ids))
+            return {
+                "atualizadas": sorted(ids),
+                "inalteradas": [],
+                "invalidas": [],
+                "nao_encontradas": [],
+            }
+
+        # As linhas alteradas seguem bloqueadas por esta transação, então
+        # `atualizado_em = agora` identifica exatamente quem mudou agora.
+        atuais = {
+            pk: (st, atualizado_em == agora)
+            for pk, st, atualizado_em in Tarefa.objects.filter(
+                pk__in=ids, usuario_id=usuario_id
+            ).values_list("pk", "status", "atualizado_em")
+        }
+        atualizadas = sorted(
+            pk for pk, (st, mudou) in atuais.items() if st == destino and mudou
+        )
+        notificar_tarefas(usuario_id, "salva", atualizadas)
+
+    return {
+        "atualizadas": atualizadas,
+        "inalteradas": sorted(
+            pk for pk, (st, mudou) in atuais.items() if st == destino and not mudou
+        ),
+        "invalidas": sorted(pk for pk, (st, _) in atuais.items() if st != destino),
+        "nao_encontradas": sorted(ids - atuais.keys()),
+    }
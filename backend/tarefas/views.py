@@ -1,21 +1,73 @@
+from functools import partial
+
+from asgiref.sync import sync_to_async
 from django.contrib.auth.models import User
-from django.db.models import Count, Q
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.views import View
 from rest_framework import generics, serializers, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from .models import Comentario, Tarefa
+from stratasec.authentication import JWTUsuarioLeveAuthentication
+from stratasec.pagination import KeysetPagination
+from stratasec.views import AsyncAPIViewMixin
+from usuarios.papeis import aclaims_de_papel
+
+from .condicional import (
+    assinatura_parametros,
+    etag_fraco,
+    responder_condicional,
+    responder_condicional_async,
+)
+from .eventos import fluxo_eventos
+from .exportacao import (
+    FORMATOS,
+    GERADORES,
+    em_fluxo_assincrono,
+    tarefas_em_lotes,
+)
+from .leitura import (
+    agrupar_comentarios_recentes,
+    anexar_comentarios,
+    leitura_comentario,
+    leitura_tarefa,
+)
+from .lote import processar_lote, validar_envelope
+from .models import (
+    Comentario,
+    ContadorStatus,
+    EmailNormalizado,
+    Tarefa,
+    VersaoTarefas,
+)
+from .provisionamento import (
+    PROVISIONAMENTO_MAXIMO,
+    CSVParser,
+    NDJSONParser,
+    pool_da_requisicao,
+    provisionar_usuarios,
+)
+from .search import get_search_backend
+from .senhas import averificar_senha
 from .serializers import (
     ComentarioSerializer,
+    ComentariosRecentesSerializer,
     TarefaSerializer,
+    TransicaoStatusLoteSerializer,
+    TransicaoStatusSerializer,
     UserSerializer,
     UsuarioPerfilSerializer,
     UsuarioRegisterSerializer,
 )
+from .sincronizacao import TokenExpirado, TokenInvalido, alteracoes
+from .transicoes import transicionar_status
 
 
 class RegisterView(APIView):
@@ -25,7 +77,7 @@ class RegisterView(APIView):
         serializer = UsuarioRegisterSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
-        return Response(
+        response = Response(
             {
                 "id": user.id,
                 "nome": user.perfil.nome if hasattr(user, "perfil") else "",
@@ -33,6 +85,8 @@ class RegisterView(APIView):
             },
             status=status.HTTP_201_CREATED,
         )
+        response["Server-Timing"] = serializer.tempo_senha.server_timing()
+        return response
 
 
 class LoginSerializer(serializers.Serializer):
@@ -40,27 +94,32 @@ class LoginSerializer(serializers.Serializer):
     password = serializers.CharField(write_only=True, trim_whitespace=False)
 
 
-class LoginView(APIView):
+class LoginView(AsyncAPIViewMixin, APIView):
     permission_classes = [AllowAny]
 
-    def post(self, request):
+    async def post(self, request):
         serializer = LoginSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         email = serializer.validated_data["email"]
         password = serializer.validated_data["password"]
 
         try:
-            user = User.objects.get(email__iexact=email)
+            user = await User.objects.aget(
+                email_normalizado__email=EmailNormalizado.normalizar(email)
+            )
         except User.DoesNotExist:
             return Response(
                 {"detail": "Credenciais inválidas."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        if not user.check_password(password):
+        # O bcrypt roda no pool de senhas; a requisição só espera
+        senha_valida, tempo = await averificar_senha(user, password)
+        if not senha_valida:
             return Response(
                 {"detail": "Credenciais inválidas."},
                 status=status.HTTP_400_BAD_REQUEST,
+                headers={"Server-Timing": tempo.server_timing()},
             )
 
         if not user.is_active:
@@ -73,20 +132,26 @@ class LoginView(APIView):
         # Garantir que o token contenha id e e-mail conforme escopo
         refresh["id"] = user.id
         refresh["email"] = user.email
+        # Papel (aluno) e versão: o IsAluno do painel não consulta o banco
+        for claim, valor in (await aclaims_de_papel(user)).items():
+            refresh[claim] = valor
 
         return Response(
             {
                 "access": str(refresh.access_token),
                 "refresh": str(refresh),
-            }
+            },
+            headers={"Server-Timing": tempo.server_timing()},
         )
 
 
-class MeView(APIView):
+class MeView(AsyncAPIViewMixin, APIView):
     permission_classes = [IsAuthenticated]
 
-    def get(self, request):
-        user = request.user
+    async def get(self, request):
+        # O request.user do JWT só traz o id; aqui precisamos de todos
+        # os campos, então usuário e perfil vêm juntos em uma consulta.
+        user = await User.objects.select_related("perfil").aget(pk=request.user.pk)
         perfil = getattr(user, "perfil", None)
         return Response(
             {
@@ -98,10 +163,63 @@ class MeView(APIView):
         )
 
 
-class TarefaViewSet(viewsets.ModelViewSet):
+class ProvisionamentoUsuariosView(APIView):
+    """
+    Cria usuários em lote a partir de um CSV (`text/csv`) ou NDJSON
+    (`application/x-ndjson`). Arquivos maiores que o limite devem ir pelo
+    comando `provisionar_usuarios`.
+    """
+
+    permission_classes = [IsAdminUser]
+    parser_classes = [CSVParser, NDJSONParser]
+
+    def post(self, request):
+        registros = request.data
+        if not registros:
+            return Response(
+                {"detail": "Arquivo sem registros."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(registros) > PROVISIONAMENTO_MAXIMO:
+            return Response(
+                {
+                    "detail": f"O arquivo aceita no máximo {PROVISIONAMENTO_MAXIMO} "
+                    "registros por requisição."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        criados, resultados = provisionar_usuarios(registros, pool_da_requisicao())
+        return Response(
+            {
+                "criados": criados,
+                "erros": len(resultados) - criados,
+                "resultados": resultados,
+            }
+        )
+
+
+async def versao_do_usuario(usuario):
+    """(versao, atualizado_em) das tarefas do usuário; (0, None) se nunca mudou."""
+    return await VersaoTarefas.objects.filter(usuario=usuario).values_list(
+        "versao", "atualizado_em"
+    ).afirst() or (0, None)
+
+
+class TarefaViewSet(AsyncAPIViewMixin, viewsets.ModelViewSet):
     serializer_class = TarefaSerializer
     permission_classes = [IsAuthenticated]
 
+    @property
+    def paginator(self):
+        # Modo cursor e opt-in: `?pagination=cursor` ou um `cursor` recebido
+        # em `next`/`previous` troca o PageNumberPagination padrao pelo keyset.
+        if not hasattr(self, "_paginator") and KeysetPagination.is_requested(
+            self.request
+        ):
+            self._paginator = KeysetPagination()
+        return super().paginator
+
     def get_queryset(self):
         queryset = Tarefa.objects.filter(usuario=self.request.user)
 
@@ -117,8 +235,8 @@ class TarefaViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(prioridade=prioridade_param)
 
         if search:
-            queryset = queryset.filter(
-                Q(titulo__icontains=search) | Q(descricao__icontains=search)
+            queryset = get_search_backend().buscar(
+                queryset, search, self.request.user.id
             )
 
         if ordering in ("criado_em", "-criado_em"):
@@ -126,9 +244,197 @@ class TarefaViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    async def list(self, request, *args, **kwargs):
+        # GET condicional: a versão do usuário muda a cada alteração nas suas
+        # tarefas, então basta ela (e a query string) para responder 304.
+        versao, atualizado_em = await versao_do_usuario(request.user)
+        etag = etag_fraco(
+            "tarefas", request.user.id, versao, assinatura_parametros(request)
+        )
+        return await responder_condicional_async(
+            request, etag, atualizado_em, partial(self._listar, request)
+        )
+
+    async def _listar(self, request):
+        # Leitura rápida: só as colunas expostas, sem instanciar models
+        queryset = leitura_tarefa.consultar(self.filter_queryset(self.get_queryset()))
+
+        page = await self.apaginate_queryset(queryset)
+        linhas = page if page is not None else [linha async for linha in queryset]
+        registros = leitura_tarefa.serializar(linhas)
+        # `?incluir=comentarios`: total e último comentário de cada tarefa,
+        # com uma consulta a mais por página
+        if "comentarios" in request.query_params.get("incluir", "").split(","):
+            await anexar_comentarios(registros)
+
+        if page is not None:
+            return self.get_paginated_response(registros)
+        return Response(registros)
+
+    async def retrieve(self, request, *args, **kwargs):
+        # Uma única consulta serve ao ETag e, se preciso, à resposta
+        try:
+            linha = (
+                await leitura_tarefa.consultar(self.get_queryset())
+                .filter(pk=kwargs.get("pk"))
+                .afirst()
+            )
+        except (TypeError, ValueError):
+            linha = None
+        if linha is None:
+            # Inexistente, de outro usuário ou id inválido: fluxo normal (404)
+            return await sync_to_async(super().retrieve)(request, *args, **kwargs)
+
+        atualizado_em = linha["atualizado_em"]
+        etag = etag_fraco(
+            "tarefa", linha["id"], int(atualizado_em.timestamp() * 1_000_000)
+        )
+        return responder_condicional(
+            request,
+            etag,
+            atualizado_em,
+            lambda: Response(leitura_tarefa.serializar([linha])[0]),
+        )
+
     def perform_create(self, serializer):
         serializer.save(usuario=self.request.user)
 
+    @action(detail=False, methods=["get"], url_path="changes")
+    def sincronizar(self, request):
+        """
+        Sincronização incremental a partir do token `since` (ver
+        `tarefas.sincronizacao.alteracoes`).
+
+        A retomada relê os últimos `MARGEM_CONCORRENCIA` (5 s) antes da
+        emissão do token, para pegar transações que gravaram antes e só
+        commitaram depois. Essa é a folga tolerada: uma escrita que leve mais
+        que isso entre gravar `atualizado_em`/`removida_em` e o commit não
+        aparece nas sincronizações incrementais seguintes, só numa completa.
+        """
+        try:
+            dados = alteracoes(request.user.id, request.query_params.get("since"))
+        except TokenInvalido:
+            return Response(
+                {"since": "Token de sincronização inválido."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except TokenExpirado:
+            return Response(
+                {
+                    "detail": "Token de sincronização expirado. "
+                    "Faça uma sincronização completa (sem `since`)."
+                },
+                status=status.HTTP_410_GONE,
+            )
+        return Response(dados)
+
+    @action(detail=False, methods=["get"], url_path="comentarios")
+    async def comentarios_recentes(self, request):
+        """
+        Os `limite` comentários mais recentes de várias tarefas de uma vez
+        (`?ids=1,2,3&limite=3`). Tarefas sem comentários, inexistentes ou de
+        outro usuário ficam de fora do resultado.
+        """
+        ids = [
+            parte
+            for valor in request.query_params.getlist("ids")
+            for parte in valor.split(",")
+            if parte.strip()
+        ]
+        dados = {"ids": ids}
+        if "limite" in request.query_params:
+            dados["limite"] = request.query_params["limite"]
+        serializer = ComentariosRecentesSerializer(data=dados)
+        serializer.is_valid(raise_exception=True)
+        tarefa_ids = serializer.validated_data["ids"]
+        limite = serializer.validated_data["limite"]
+
+        async def responder():
+            agrupados = await agrupar_comentarios_recentes(
+                request.user.id, tarefa_ids, limite
+            )
+            return Response(
+                {str(tarefa_id): itens for tarefa_id, itens in agrupados.items()}
+            )
+
+        # Comentários criados ou removidos incrementam a versão do dono
+        versao, atualizado_em = await versao_do_usuario(request.user)
+        etag = etag_fraco(
+            "comentarios", request.user.id, versao, assinatura_parametros(request)
+        )
+        return await responder_condicional_async(
+            request, etag, atualizado_em, responder
+        )
+
+    @action(detail=False, methods=["get"], url_path="exportar")
+    def exportar(self, request):
+        # `formato` e não `format`: este último é a sufixação de formato do DRF
+        formato = request.query_params.get("formato", "ndjson")
+        if formato not in FORMATOS:
+            return Response(
+                {"formato": f"Formato inválido. Use: {', '.join(FORMATOS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        descendente = request.query_params.get("ordering") != "criado_em"
+        queryset = self.filter_queryset(self.get_queryset())
+        lotes = tarefas_em_lotes(queryset, descendente)
+
+        content_type, nome_arquivo = FORMATOS[formato]
+        conteudo = GERADORES[formato](lotes)
+        if isinstance(request._request, ASGIRequest):
+            conteudo = em_fluxo_assincrono(conteudo)
+        response = StreamingHttpResponse(conteudo, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{nome_arquivo}"'
+        return response
+
+    @action(detail=False, methods=["post"], url_path="lote")
+    def lote(self, request):
+        modo, operacoes, erros = validar_envelope(request.data)
+        if erros:
+            return Response(erros, status=status.HTTP_400_BAD_REQUEST)
+
+        aplicado, resultados = processar_lote(
+            request.user, operacoes, atomico=modo == "atomico"
+        )
+        return Response(
+            {"modo": modo, "aplicado": aplicado, "resultados": resultados},
+            status=status.HTTP_200_OK if aplicado else status.HTTP_400_BAD_REQUEST,
+        )
+
+    @action(detail=True, methods=["post"], url_path="status")
+    def alterar_status(self, request, pk=None):
+        serializer = TransicaoStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        destino = serializer.validated_data["status"]
+        # isdigit aceitaria "²", que o int() recusa
+        if not str(pk).isdecimal():
+            raise NotFound()
+
+        resultado = transicionar_status(request.user.id, [int(pk)], destino)
+        if resultado["nao_encontradas"]:
+            raise NotFound()
+        if resultado["invalidas"]:
+            return Response(
+                {"status": "Transição de status inválida."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response({"id": int(pk), "status": destino})
+
+    @action(
+        detail=False, methods=["post"], url_path="status", url_name="status-lote"
+    )
+    def alterar_status_lote(self, request):
+        serializer = TransicaoStatusLoteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        resultado = transicionar_status(
+            request.user.id,
+            serializer.validated_data["ids"],
+            serializer.validated_data["status"],
+        )
+        return Response({"status": serializer.validated_data["status"], **resultado})
+
     @action(detail=True, methods=["post"], url_path="atribuir")
     def atribuir(self, request, pk=None):
         tarefa = self.get_object()
@@ -140,7 +446,9 @@ class TarefaViewSet(viewsets.ModelViewSet):
             )
 
         try:
-            novo_usuario = User.objects.get(email__iexact=email)
+            novo_usuario = User.objects.get(
+                email_normalizado__email=EmailNormalizado.normalizar(email)
+            )
         except User.DoesNotExist:
             return Response(
                 {"email": "Usuário não encontrado."},
@@ -148,45 +456,116 @@ class TarefaViewSet(viewsets.ModelViewSet):
             )
 
         tarefa.usuario = novo_usuario
-        tarefa.save(update_fields=["usuario"])
+        tarefa.save(update_fields=["usuario", "atualizado_em"])
 
         return Response(TarefaSerializer(tarefa).data)
 
 
-class DashboardView(APIView):
+class DashboardView(AsyncAPIViewMixin, APIView):
     permission_classes = [IsAuthenticated]
 
-    def get(self, request):
-        queryset = Tarefa.objects.filter(usuario=request.user)
+    async def get(self, request):
+        versao, atualizado_em = await versao_do_usuario(request.user)
+        etag = etag_fraco("dashboard", request.user.id, versao)
+        return await responder_condicional_async(
+            request, etag, atualizado_em, partial(self._contagem, request)
+        )
 
-        total = queryset.count()
-        por_status = (
-            queryset.values("status")
-            .annotate(total=Count("id"))
+    async def _contagem(self, request):
+        # Contadores mantidos incrementalmente: um único lookup em
+        # (usuario, status), sem COUNT sobre a tabela de tarefas.
+        por_status = {
+            status_tarefa: total
+            async for status_tarefa, total in ContadorStatus.objects.filter(
+                usuario=request.user, total__gt=0
+            )
             .order_by("status")
-        )
+            .values_list("status", "total")
+        }
 
         return Response(
             {
-                "total": total,
-                "por_status": {item["status"]: item["total"] for item in por_status},
+                "total": sum(por_status.values()),
+                "por_status": por_status,
             }
         )
 
 
-class ComentarioListCreateView(generics.ListCreateAPIView):
+class ComentarioListCreateView(AsyncAPIViewMixin, generics.ListCreateAPIView):
     serializer_class = ComentarioSerializer
     permission_classes = [IsAuthenticated]
-    pagination_class = None
+    # Keyset sobre (criado_em, id), mais recentes primeiro: tamanho e tempo
+    # de cada página não dependem de quantos comentários a tarefa tem
+    pagination_class = KeysetPagination
+
+    async def get(self, request, *args, **kwargs):
+        # Posse conferida uma vez, pela PK da tarefa; a página em si lê só
+        # `comentario` pelo índice (tarefa, criado_em), sem JOIN
+        if not await Tarefa.objects.filter(
+            pk=self.kwargs.get("tarefa_pk"), usuario=request.user
+        ).aexists():
+            raise NotFound()
+
+        queryset = leitura_comentario.consultar(self.get_queryset())
+        page = await self.apaginate_queryset(queryset)
+        return self.get_paginated_response(leitura_comentario.serializar(page))
 
     def get_queryset(self):
-        tarefa_id = self.kwargs.get("tarefa_pk")
-        return Comentario.objects.filter(
-            tarefa__id=tarefa_id,
-            tarefa__usuario=self.request.user,
-        ).order_by("-criado_em")
+        # Sem filtro de dono: `get` e `perform_create` conferem a tarefa antes
+        return Comentario.objects.filter(tarefa_id=self.kwargs.get("tarefa_pk"))
 
     def perform_create(self, serializer):
         tarefa_id = self.kwargs.get("tarefa_pk")
         tarefa = get_object_or_404(Tarefa, id=tarefa_id, usuario=self.request.user)
         serializer.save(usuario=self.request.user, tarefa=tarefa)
+
+
+async def _autenticar_jwt(request):
+    """
+    Usuário do access token do header Authorization ou, como o EventSource
+    do navegador não envia headers, do parâmetro `?token=`.
+    """
+    autenticacao = JWTUsuarioLeveAuthentication()
+    try:
+        header = autenticacao.get_header(request)
+        if header is not None:
+            bruto = autenticacao.get_raw_token(header)
+        else:
+            bruto = request.GET.get("token", "").encode() or None
+        if bruto is None:
+            return None
+        return await autenticacao.aget_user(autenticacao.get_validated_token(bruto))
+    except AuthenticationFailed:
+        return None
+
+
+class EventosView(View):
+    """
+    Feed em tempo real (Server-Sent Events) das alterações de tarefas e
+    comentários do usuário autenticado. Eventos trazem só ids: o cliente
+    busca o detalhe ou, ao receber `ressincronizar`, chama /changes/.
+    """
+
+    async def get(self, request):
+        # Sob WSGI o Django consumiria o gerador inteiro antes de responder
+        if not isinstance(request, ASGIRequest):
+            return JsonResponse(
+                {"detail": "O feed de eventos requer um servidor ASGI."},
+                status=501,
+            )
+
+        usuario = await _autenticar_jwt(request)
+        if usuario is None:
+            return JsonResponse(
+                {"detail": "As credenciais de autenticação não foram fornecidas."},
+                status=401,
+                headers={"WWW-Authenticate": 'Bearer realm="api"'},
+            )
+
+        response = StreamingHttpResponse(
+            fluxo_eventos(usuario.id), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        # Evita que o nginx acumule o stream em buffer
+        response["X-Accel-Buffering"] = "no"
+        return response
@@ -0,0 +1,188 @@
+"""
+Matrícula em lote de alunos em uma turma, a partir de CSV ou NDJSON (uma
+linha por aluno, com `email` ou `aluno_id`).
+
+Em vez de um POST por matrícula, o lote resolve e-mails e ids de alunos em
+consultas agrupadas, descobre quem já está matriculado e grava as novas
+matrículas com bulk_create. Se outra importação matricular o mesmo aluno
+antes do INSERT, a restrição única de (turma, aluno) desfaz o lote e só
+essas linhas passam a "já matriculado". Linhas inválidas não impedem as
+demais: cada uma recebe seu resultado.
+"""
+
+import csv
+from itertools import islice
+
+from django.db import IntegrityError, transaction
+from rest_framework.exceptions import ParseError
+
+from tarefas import provisionamento
+from tarefas.models import EmailNormalizado
+from usuarios.matriculas import limpar_cache_do_aluno
+from usuarios.models import Aluno
+
+from .models import Matricula
+
+IMPORTACAO_MAXIMA = 5000
+TAMANHO_LOTE_SQL = 500
+
+COLUNAS = ('email', 'aluno_id')
+
+
+def ler_csv(linhas):
+    """
+    Lê CSV com cabeçalho contendo `email`, `aluno_id` ou as duas colunas.
+    Devolve (linha, dados, erros) por registro, como em
+    `tarefas.provisionamento`.
+    """
+    leitor = csv.DictReader(linhas)
+    cabecalho = leitor.fieldnames or ()
+    if not any(coluna in cabecalho for coluna in COLUNAS):
+        raise ParseError("Cabeçalho sem a coluna email ou aluno_id.")
+
+    for registro in leitor:
+        dados = {coluna: registro.get(coluna) or '' for coluna in COLUNAS}
+        yield leitor.line_num, dados, None
+
+
+LEITORES = {'csv': ler_csv, 'ndjson': provisionamento.ler_ndjson}
+
+
+class CSVParser(provisionamento.CSVParser):
+    leitores = LEITORES
+
+
+class NDJSONParser(provisionamento.NDJSONParser):
+    leitores = LEITORES
+
+
+def _erro(linha, mensagem):
+    return {'linha': linha, 'status': 400, 'erros': {'detail': mensagem}}
+
+
+def _identificar(dados):
+    """('id', int) ou ('email', normalizado); None se a linha não traz nenhum."""
+    aluno_id = str(dados.get('aluno_id') or '').strip()
+    if aluno_id:
+        return ('id', int(aluno_id)) if aluno_id.isdecimal() else None
+    email = EmailNormalizado.normalizar(str(dados.get('email') or ''))
+    return ('email', email) if email else None
+
+
+def _em_lotes(valores):
+    valores = iter(valores)
+    while lote := list(islice(valores, TAMANHO_LOTE_SQL)):
+        yield lote
+
+
+def _resolver(chaves):
+    """Chave de cada linha -> aluno_id, com no máximo 500 valores por IN."""
+    emails = {valor for tipo, valor in chaves if tipo == 'email'}
+    ids = {valor for tipo, valor in chaves if tipo == 'id'}
+    resolvidos = {}
+    for lote in _em_lotes(emails):
+        resolvidos.update(
+            (('email', email), aluno_id)
+            for email, aluno_id in Aluno.objects.filter(
+                user__email_normalizado__email__in=lote
+            ).values_list('user__email_normalizado__email', 'id')
+        )
+    for lote in _em_lotes(ids):
+        resolvidos.update(
+            (('id', aluno_id), aluno_id)
+            for aluno_id in Aluno.objects.filter(id__in=lote).values_list(
+                'id', flat=True
+            )
+        )
+    return resolvidos
+
+
+def _ja_matriculados(turma, alunos):
+    matriculados = set()
+    for lote in _em_lotes(alunos):
+        matriculados.update(
+            Matricula.objects.filter(turma=turma, aluno_id__in=lote).values_list(
+                'aluno_id', flat=True
+            )
+        )
+    return matriculados
+
+
+def matricular_alunos(turma, registros):
+    """
+    Matricula na `turma` os alunos de `registros` ((linha, dados, erros),
+    como os devolvidos pelos `LEITORES`). Retorna (matriculados, resultados),
+    com um resultado por registro, na ordem recebida: 201 para matrícula
+    nova, 200 para aluno que já estava na turma e 400 para linha inválida.
+    """
+    resultados = []
+    pendentes = []
+    for linha, dados, erros in registros:
+        chave = _identificar(dados) if erros is None else None
+        if erros is not None:
+            resultados.append({'linha': linha, 'status': 400, 'erros': erros})
+        elif chave is None:
+            resultados.append(_erro(linha, 'Informe email ou aluno_id válido.'))
+        else:
+            resultados.append(None)
+            pendentes.append((len(resultados) - 1, linha, chave))
+
+    resolvidos = _resolver({chave for _, _, chave in pendentes})
+    matriculados = _ja_matriculados(turma, set(resolvidos.values()))
+
+    novos = []
+    vistos = set()
+    for indice, linha, chave in pendentes:
+        aluno_id = resolvidos.get(chave)
+        if aluno_id is None:
+            resultados[indice] = _erro(linha, 'Aluno não encontrado.')
+        elif aluno_id in vistos:
+            resultados[indice] = _erro(linha, 'Aluno repetido no arquivo.')
+        else:
+            vistos.add(aluno_id)
+            ja_estava = aluno_id in matriculados
+            resultados[indice] = {
+                'linha': linha,
+                'status': 200 if ja_estava else 201,
+                'aluno': aluno_id,
+            }
+            if not ja_estava:
+                novos.append((indice, aluno_id))
+
+    novos = _gravar_sem_conflito(turma, novos, resultados)
+    # bulk_create não dispara o post_save que invalidaria o cache
+    for _, aluno_id in novos:
+        limpar_cache_do_aluno(aluno_id)
+
+    return len(novos), resultados
+
+
+def _gravar_sem_conflito(turma, novos, resultados):
+    """
+    Grava as matrículas de `novos` ((indice, aluno_id)). Se uma importação
+    concorrente matriculou algum desses alunos depois de `_ja_matriculados`,
+    o lote é desfeito, essas linhas viram 200 e as demais são gravadas de
+    novo. Devolve as matrículas de fato criadas.
+    """
+    while novos:
+        try:
+            with transaction.atomic():
+                Matricula.objects.bulk_create(
+                    [
+                        Matricula(turma=turma, aluno_id=aluno_id)
+                        for _, aluno_id in novos
+                    ],
+                    batch_size=TAMANHO_LOTE_SQL,
+                )
+            return novos
+        except IntegrityError:
+            matriculados = _ja_matriculados(
+                turma, {aluno_id for _, aluno_id in novos}
+            )
+            if not matriculados:
+                raise
+            for indice, aluno_id in novos:
+                if aluno_id in matriculados:
+                    resultados[indice]['status'] = 200
+            novos = [item for item in novos if item[1] not in matriculados]
+    return novos
@@ -0,0 +1,71 @@
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ParseError
+
+from treinamentos.importacao import IMPORTACAO_MAXIMA, LEITORES, matricular_alunos
+from treinamentos.models import Turma
+
+
+class Command(BaseCommand):
+    help = (
+        'Matricula alunos em lote em uma turma a partir de um arquivo CSV ou '
+        'NDJSON com email ou aluno_id. Alunos ja matriculados sao mantidos e '
+        'linhas invalidas sao reportadas sem impedir as demais.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('turma', type=int, help='Id da turma.')
+        parser.add_argument('arquivo', help='Caminho do arquivo .csv ou .ndjson.')
+        parser.add_argument(
+            '--formato',
+            choices=sorted(LEITORES),
+            help='Formato do arquivo (padrao: pela extensao).',
+        )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=IMPORTACAO_MAXIMA,
+            help='Registros gravados por transacao.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            turma = Turma.objects.get(pk=options['turma'])
+        except Turma.DoesNotExist:
+            raise CommandError(f"Turma {options['turma']} nao encontrada.")
+
+        arquivo = options['arquivo']
+        formato = options['formato'] or arquivo.rsplit('.', 1)[-1].lower()
+        if formato not in LEITORES:
+            raise CommandError(
+                'Formato nao reconhecido; informe --formato '
+                f"({', '.join(sorted(LEITORES))})."
+            )
+
+        matriculados = existentes = erros = 0
+        try:
+            with open(arquivo, encoding='utf-8-sig', newline='') as linhas:
+                registros = LEITORES[formato](linhas)
+                while lote := list(islice(registros, options['lote'])):
+                    novos, resultados = matricular_alunos(turma, lote)
+                    matriculados += novos
+                    for resultado in resultados:
+                        if resultado['status'] == 200:
+                            existentes += 1
+                        elif resultado['status'] != 201:
+                            erros += 1
+                            self.stderr.write(
+                                f"linha {resultado['linha']}: {resultado['erros']}"
+                            )
+        except OSError as exc:
+            raise CommandError(f'Nao foi possivel ler {arquivo}: {exc}')
+        except ParseError as exc:
+            raise CommandError(str(exc.detail))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{matriculados} matricula(s) criada(s), {existentes} aluno(s) '
+                f'ja matriculado(s), {erros} linha(s) com erro.'
+            )
+        )
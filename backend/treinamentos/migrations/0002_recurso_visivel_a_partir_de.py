@@ -0,0 +1,43 @@
+import datetime
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def calcular_visibilidade(apps, schema_editor):
+    Recurso = apps.get_model('treinamentos', 'Recurso')
+    Turma = apps.get_model('treinamentos', 'Turma')
+    db_alias = schema_editor.connection.alias
+    recursos = Recurso.objects.using(db_alias).filter(draft=False)
+
+    recursos.filter(acesso_previo=True).update(
+        visivel_a_partir_de=datetime.date(1000, 1, 1)
+    )
+    recursos.filter(acesso_previo=False).update(
+        visivel_a_partir_de=Subquery(
+            Turma.objects.filter(pk=OuterRef('turma_id')).values('data_inicio')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('treinamentos', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recurso',
+            name='visivel_a_partir_de',
+            field=models.DateField(editable=False, null=True),
+        ),
+        migrations.RunPython(calcular_visibilidade, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='recurso',
+            index=models.Index(
+                fields=['turma', 'visivel_a_partir_de'],
+                name='recurso_turma_visivel_idx',
+            ),
+        ),
+    ]
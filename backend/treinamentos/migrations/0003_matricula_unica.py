@@ -0,0 +1,42 @@
+from django.db import migrations, models
+
+
+def remover_duplicadas(apps, schema_editor):
+    Matricula = apps.get_model('treinamentos', 'Matricula')
+    db_alias = schema_editor.connection.alias
+
+    # Fica a matrícula mais antiga de cada (turma, aluno)
+    vistas = set()
+    duplicadas = []
+    for matricula_id, turma_id, aluno_id in (
+        Matricula.objects.using(db_alias)
+        .order_by('id')
+        .values_list('id', 'turma_id', 'aluno_id')
+        .iterator(chunk_size=1000)
+    ):
+        if (turma_id, aluno_id) in vistas:
+            duplicadas.append(matricula_id)
+        else:
+            vistas.add((turma_id, aluno_id))
+
+    for inicio in range(0, len(duplicadas), 1000):
+        Matricula.objects.using(db_alias).filter(
+            id__in=duplicadas[inicio:inicio + 1000]
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('treinamentos', '0002_recurso_visivel_a_partir_de'),
+    ]
+
+    operations = [
+        migrations.RunPython(remover_duplicadas, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='matricula',
+            constraint=models.UniqueConstraint(
+                fields=('turma', 'aluno'), name='matricula_turma_aluno_unica'
+            ),
+        ),
+    ]
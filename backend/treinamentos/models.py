@@ -1,6 +1,12 @@
-from django.db import models
+from datetime import date
+
+from django.db import models, transaction
 from usuarios.models import Aluno
 
+# Visibilidade de recursos com acesso prévio: desde sempre (o DATE do MySQL
+# só garante datas a partir do ano 1000)
+VISIVEL_DESDE_SEMPRE = date(1000, 1, 1)
+
 # Create your models here.
 class Treinamento(models.Model):
     nome = models.CharField(max_length=100)
@@ -16,6 +22,21 @@ class Turma(models.Model):
     def __str__(self):
         return self.nome
 
+    def save(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+            # Recursos sem acesso prévio acompanham a data de início
+            Recurso.objects.filter(
+                turma=self, draft=False, acesso_previo=False
+            ).exclude(visivel_a_partir_de=self.data_inicio).update(
+                visivel_a_partir_de=self.data_inicio
+            )
+
+class RecursoQuerySet(models.QuerySet):
+    def visiveis(self, turmas_ids, hoje):
+        # Um intervalo sobre o índice (turma, visivel_a_partir_de)
+        return self.filter(turma_id__in=turmas_ids, visivel_a_partir_de__lte=hoje)
+
 class Recurso(models.Model):
     turma = models.ForeignKey(Turma, on_delete=models.CASCADE)
     tipo = models.CharField(max_length=100)
@@ -23,8 +44,43 @@ class Recurso(models.Model):
     nome = models.CharField(max_length=100)
     descricao = models.TextField()
     draft = models.BooleanField()
+    # A partir de quando o recurso aparece no painel; nulo para rascunhos.
+    # Derivado de draft, acesso_previo e turma.data_inicio pelo save do
+    # Recurso e da Turma (update() e bulk_create não recalculam)
+    visivel_a_partir_de = models.DateField(null=True, editable=False)
+
+    objects = RecursoQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['turma', 'visivel_a_partir_de'],
+                name='recurso_turma_visivel_idx',
+            ),
+        ]
+
+    def calcular_visibilidade(self):
+        if self.draft:
+            return None
+        if self.acesso_previo:
+            return VISIVEL_DESDE_SEMPRE
+        return self.turma.data_inicio
+
+    def save(self, *args, **kwargs):
+        self.visivel_a_partir_de = self.calcular_visibilidade()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'visivel_a_partir_de'}
+        super().save(*args, **kwargs)
 
 class Matricula(models.Model):
     turma = models.ForeignKey(Turma, on_delete=models.CASCADE)
     aluno = models.ForeignKey(Aluno, on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['turma', 'aluno'], name='matricula_turma_aluno_unica'
+            ),
+        ]
     
\ No newline at end of file
@@ -58,6 +58,17 @@ class PainelTurmaSerializer(serializers.ModelSerializer):
             'nome', 
             'data_inicio', 
             'data_fim',
-            'link_acesso',
             'treinamento',
-        ]
\ No newline at end of file
+        ]
+
+
+class PainelResumoTurmaSerializer(PainelTurmaSerializer):
+    recursos_visiveis = serializers.IntegerField(read_only=True)
+
+    class Meta(PainelTurmaSerializer.Meta):
+        fields = PainelTurmaSerializer.Meta.fields + ['recursos_visiveis']
+
+
+class PainelSerializer(serializers.Serializer):
+    turmas = PainelResumoTurmaSerializer(many=True)
+    proximo_inicio = serializers.DateField(allow_null=True)
@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from usuarios.matriculas import limpar_cache_do_aluno, limpar_cache_matriculas
+
+from .models import Matricula
+
+
+@receiver(post_save, sender=Matricula)
+def invalidar_matricula_salva(sender, instance, created, **kwargs):
+    if created:
+        limpar_cache_do_aluno(instance.aluno_id)
+    else:
+        # Uma edição pode ter trocado o aluno, e o anterior não é conhecido
+        limpar_cache_matriculas()
+
+
+@receiver(post_delete, sender=Matricula)
+def invalidar_matricula_removida(sender, instance, **kwargs):
+    limpar_cache_do_aluno(instance.aluno_id)
@@ -1,3 +1,512 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+from datetime import timedelta
+from importlib import import_module
+from io import StringIO
+from itertools import product
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from treinamentos import importacao
+from treinamentos.models import Matricula, Recurso, Treinamento, Turma
+from usuarios.matriculas import limpar_cache_matriculas
+from usuarios.models import Aluno
+
+TURMAS_URL = '/api/painel/turmas/'
+RECURSOS_URL = '/api/painel/recursos/'
+PAINEL_URL = '/api/painel/'
+
+
+class PainelBaseTests(APITestCase):
+    def setUp(self) -> None:
+        limpar_cache_matriculas()
+        self.addCleanup(limpar_cache_matriculas)
+        self.user = User.objects.create_user(username='aluno@test.com')
+        self.aluno = Aluno.objects.create(user=self.user, telefone='11999999999')
+        self.treinamento = Treinamento.objects.create(
+            nome='Python', descricao='Treinamento de Python.'
+        )
+        self.client.force_authenticate(self.user)
+
+    def _turma(self, nome='Turma', inicio_em_dias=-1):
+        inicio = timezone.now().date() + timedelta(days=inicio_em_dias)
+        return Turma.objects.create(
+            treinamento=self.treinamento,
+            nome=nome,
+            data_inicio=inicio,
+            data_fim=inicio + timedelta(days=30),
+        )
+
+    def _recurso(self, turma, nome='Aula', acesso_previo=False, draft=False):
+        return Recurso.objects.create(
+            turma=turma,
+            tipo='video',
+            nome=nome,
+            descricao='Descrição do recurso.',
+            acesso_previo=acesso_previo,
+            draft=draft,
+        )
+
+    def _matricular(self, turma, aluno=None):
+        return Matricula.objects.create(turma=turma, aluno=aluno or self.aluno)
+
+
+class CacheMatriculasTests(PainelBaseTests):
+    def _tabelas(self, consultas):
+        return [
+            q['sql']
+            for q in consultas
+            if 'usuarios_aluno' in q['sql'] or 'treinamentos_matricula' in q['sql']
+        ]
+
+    def test_uma_consulta_de_matriculas_e_depois_nenhuma(self) -> None:
+        turma = self._turma()
+        self._recurso(turma)
+        self._matricular(turma)
+
+        with CaptureQueriesContext(connection) as fria:
+            response = self.client.get(RECURSOS_URL)
+        with CaptureQueriesContext(connection) as quente:
+            self.client.get(RECURSOS_URL)
+            self.client.get(TURMAS_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(self._tabelas(fria)), 1)
+        self.assertEqual(len(fria), 2)
+        self.assertEqual(self._tabelas(quente), [])
+
+    def test_sem_matriculas_nao_consulta_dados(self) -> None:
+        self.client.get(TURMAS_URL)
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(TURMAS_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [])
+        self.assertEqual(len(consultas), 0)
+
+    def test_nova_matricula_e_remocao_invalidam(self) -> None:
+        turma = self._turma()
+        self.assertEqual(self.client.get(TURMAS_URL).data, [])
+
+        matricula = self._matricular(turma)
+        ids = [t['id'] for t in self.client.get(TURMAS_URL).data]
+        self.assertEqual(ids, [turma.id])
+
+        matricula.delete()
+        self.assertEqual(self.client.get(TURMAS_URL).data, [])
+
+    def test_troca_de_aluno_na_matricula_invalida(self) -> None:
+        turma = self._turma()
+        matricula = self._matricular(turma)
+        self.assertEqual(len(self.client.get(TURMAS_URL).data), 1)
+
+        outro = Aluno.objects.create(
+            user=User.objects.create_user(username='outro@test.com'),
+            telefone='11888888888',
+        )
+        matricula.aluno = outro
+        matricula.save()
+
+        self.assertEqual(self.client.get(TURMAS_URL).data, [])
+
+    def test_quem_nao_e_aluno_e_barrado_ate_virar_aluno(self) -> None:
+        visitante = User.objects.create_user(username='visitante@test.com')
+        self.client.force_authenticate(visitante)
+        self.assertEqual(
+            self.client.get(TURMAS_URL).status_code, status.HTTP_403_FORBIDDEN
+        )
+
+        Aluno.objects.create(user=visitante, telefone='11777777777')
+
+        self.assertEqual(self.client.get(TURMAS_URL).status_code, status.HTTP_200_OK)
+
+    def test_aluno_removido_perde_acesso(self) -> None:
+        self.assertEqual(self.client.get(TURMAS_URL).status_code, status.HTTP_200_OK)
+
+        self.aluno.delete()
+
+        self.assertEqual(
+            self.client.get(TURMAS_URL).status_code, status.HTTP_403_FORBIDDEN
+        )
+
+
+class MeusRecursosTests(PainelBaseTests):
+    def test_visibilidade_e_filtro_por_turma(self) -> None:
+        iniciada = self._turma('Iniciada')
+        futura = self._turma('Futura', inicio_em_dias=10)
+        alheia = self._turma('Alheia')
+        self._matricular(iniciada)
+        self._matricular(futura)
+        aula = self._recurso(iniciada, 'Aula')
+        self._recurso(iniciada, 'Rascunho', draft=True)
+        previa = self._recurso(futura, 'Prévia', acesso_previo=True)
+        self._recurso(futura, 'Fechada')
+        self._recurso(alheia, 'De outra turma')
+
+        todos = self.client.get(RECURSOS_URL)
+        da_futura = self.client.get(RECURSOS_URL, {'turma': futura.id})
+        de_alheia = self.client.get(RECURSOS_URL, {'turma': alheia.id})
+        invalidos = [
+            self.client.get(RECURSOS_URL, {'turma': valor}) for valor in ('x', '²')
+        ]
+
+        self.assertEqual({r['id'] for r in todos.data}, {aula.id, previa.id})
+        self.assertEqual([r['id'] for r in da_futura.data], [previa.id])
+        self.assertEqual(de_alheia.data, [])
+        for response in invalidos:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data, [])
+
+
+class VisibilidadeRecursosTests(PainelBaseTests):
+    """
+    A coluna visivel_a_partir_de deve selecionar os mesmos recursos que a
+    regra original, com as condições de data avaliadas pela turma.
+    """
+
+    DESLOCAMENTOS = (-20, -1, 0, 1, 20)
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.turmas = [self._turma(f'Turma {d}', d) for d in (-10, 0, 10)]
+        self.recursos = [
+            self._recurso(turma, acesso_previo=previo, draft=draft)
+            for turma, previo, draft in product(
+                self.turmas, (False, True), (False, True)
+            )
+        ]
+        self.turmas_ids = {t.id for t in self.turmas}
+
+    def _por_q(self, hoje):
+        base_query = Q(turma_id__in=self.turmas_ids) & Q(draft=False)
+        antes_inicio = Q(turma__data_inicio__gt=hoje) & Q(acesso_previo=True)
+        apos_inicio = Q(turma__data_inicio__lte=hoje)
+        return set(
+            Recurso.objects.filter(
+                base_query & (antes_inicio | apos_inicio)
+            ).values_list('id', flat=True)
+        )
+
+    def _por_coluna(self, hoje):
+        return set(
+            Recurso.objects.visiveis(self.turmas_ids, hoje).values_list(
+                'id', flat=True
+            )
+        )
+
+    def _assert_equivalente(self):
+        hoje = timezone.now().date()
+        for deslocamento in self.DESLOCAMENTOS:
+            dia = hoje + timedelta(days=deslocamento)
+            with self.subTest(dia=dia):
+                self.assertEqual(self._por_coluna(dia), self._por_q(dia))
+
+    def test_equivalente_a_regra_original(self) -> None:
+        self._assert_equivalente()
+
+    def test_turma_remarcada(self) -> None:
+        for turma, dias in zip(self.turmas, (15, -15, 0)):
+            turma.data_inicio = timezone.now().date() + timedelta(days=dias)
+            turma.save()
+
+        self._assert_equivalente()
+
+    def test_flags_e_turma_do_recurso_alterados(self) -> None:
+        for recurso in self.recursos:
+            recurso.draft = not recurso.draft
+            recurso.save(update_fields=['draft'])
+        for recurso in self.recursos[::2]:
+            recurso.acesso_previo = not recurso.acesso_previo
+            recurso.turma = self.turmas[(self.recursos.index(recurso) + 1) % 3]
+            recurso.save()
+
+        self._assert_equivalente()
+
+    def test_migracao_preenche_recursos_existentes(self) -> None:
+        Recurso.objects.update(visivel_a_partir_de=None)
+        migracao = import_module(
+            'treinamentos.migrations.0002_recurso_visivel_a_partir_de'
+        )
+
+        migracao.calcular_visibilidade(apps, SimpleNamespace(connection=connection))
+
+        self._assert_equivalente()
+
+    def test_consulta_sem_join_com_turma(self) -> None:
+        self._matricular(self.turmas[0])
+
+        with CaptureQueriesContext(connection) as consultas:
+            self.client.get(RECURSOS_URL)
+
+        recursos = [q['sql'] for q in consultas if 'treinamentos_recurso' in q['sql']]
+        self.assertEqual(len(recursos), 1)
+        self.assertNotIn('JOIN', recursos[0])
+
+
+class PainelResumoTests(PainelBaseTests):
+    def _consultas(self, url):
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(consultas)
+
+    def test_turmas_com_treinamento_total_e_proximo_inicio(self) -> None:
+        encerrada = self._turma('Encerrada', -40)
+        futura = self._turma('Futura', 10)
+        seguinte = self._turma('Seguinte', 20)
+        for turma in (encerrada, futura, seguinte):
+            self._matricular(turma)
+        self._recurso(encerrada, 'Aula')
+        self._recurso(encerrada, 'Rascunho', draft=True)
+        self._recurso(futura, 'Prévia', acesso_previo=True)
+        self._recurso(futura, 'Fechada')
+        self._recurso(self._turma('Alheia'), 'De outra turma')
+
+        response = self.client.get(PAINEL_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['proximo_inicio'], str(futura.data_inicio))
+        turmas = response.data['turmas']
+        self.assertEqual(
+            [(t['id'], t['recursos_visiveis']) for t in turmas],
+            [(encerrada.id, 1), (futura.id, 1), (seguinte.id, 0)],
+        )
+        self.assertEqual(
+            turmas[0]['treinamento'],
+            {
+                'id': self.treinamento.id,
+                'nome': 'Python',
+                'descricao': 'Treinamento de Python.',
+            },
+        )
+
+    def test_sem_turmas_futuras_ou_sem_matriculas(self) -> None:
+        self.assertEqual(
+            self.client.get(PAINEL_URL).data, {'turmas': [], 'proximo_inicio': None}
+        )
+
+        self._matricular(self._turma('Encerrada', -40))
+
+        self.assertIsNone(self.client.get(PAINEL_URL).data['proximo_inicio'])
+
+    def test_consultas_constantes(self) -> None:
+        for i in range(2):
+            turma = self._turma(f'Turma {i}')
+            self._matricular(turma)
+            self._recurso(turma)
+        poucas = {url: self._consultas(url) for url in (PAINEL_URL, TURMAS_URL)}
+
+        for i in range(2, 12):
+            outro = Treinamento.objects.create(nome=f'T{i}', descricao='Outro.')
+            turma = Turma.objects.create(
+                treinamento=outro,
+                nome=f'Turma {i}',
+                data_inicio=timezone.now().date(),
+                data_fim=timezone.now().date(),
+            )
+            self._matricular(turma)
+            for j in range(3):
+                self._recurso(turma, f'Aula {j}')
+
+        for url, total in poucas.items():
+            with self.subTest(url=url):
+                self.assertEqual(total, 1)
+                self.assertEqual(self._consultas(url), total)
+
+
+class ImportacaoMatriculasTests(PainelBaseTests):
+    def setUp(self) -> None:
+        super().setUp()
+        self.turma = self._turma()
+        self.url = f'/api/turmas/{self.turma.id}/matriculas/'
+        self.admin = User.objects.create_user(
+            username='admin@test.com', email='admin@test.com', is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+
+    def _aluno(self, email):
+        user = User.objects.create_user(username=email, email=email)
+        return Aluno.objects.create(user=user, telefone='11999999999')
+
+    def _enviar(self, corpo, content_type='text/csv', url=None):
+        return self.client.generic(
+            'POST', url or self.url, corpo.encode('utf-8'), content_type=content_type
+        )
+
+    def test_csv_por_email_ou_id_com_resultado_por_linha(self) -> None:
+        ana = self._aluno('ana@test.com')
+        bruno = self._aluno('bruno@test.com')
+        self._matricular(self.turma, self.aluno)
+
+        response = self._enviar(
+            'email,aluno_id\n'
+            'ANA@Test.com,\n'
+            f',{bruno.id}\n'
+            f',{self.aluno.id}\n'
+            'ninguem@test.com,\n'
+            ',abc\n'
+            ',²\n'
+            f',{ana.id}\n'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [response.data[chave] for chave in ('matriculados', 'existentes', 'erros')],
+            [2, 1, 4],
+        )
+        self.assertEqual(
+            [(r['linha'], r['status']) for r in response.data['resultados']],
+            [(2, 201), (3, 201), (4, 200), (5, 400), (6, 400), (7, 400), (8, 400)],
+        )
+        self.assertEqual(
+            set(
+                Matricula.objects.filter(turma=self.turma).values_list(
+                    'aluno_id', flat=True
+                )
+            ),
+            {self.aluno.id, ana.id, bruno.id},
+        )
+
+    def test_ndjson(self) -> None:
+        ana = self._aluno('ana@test.com')
+
+        response = self._enviar(
+            '\n'.join(
+                [json.dumps({'email': 'ana@test.com'}), '[1]', '{invalido'],
+            ),
+            content_type='application/x-ndjson',
+        )
+
+        self.assertEqual(response.data['matriculados'], 1)
+        self.assertEqual(response.data['erros'], 2)
+        self.assertTrue(Matricula.objects.filter(aluno=ana).exists())
+
+    def test_consultas_nao_dependem_do_numero_de_alunos(self) -> None:
+        def consultas(alunos):
+            corpo = 'email,aluno_id\n' + ''.join(
+                f'{a.user.email},\n' if i % 2 else f',{a.id}\n'
+                for i, a in enumerate(alunos)
+            )
+            with CaptureQueriesContext(connection) as capturadas:
+                self.assertEqual(
+                    self._enviar(corpo).data['matriculados'], len(alunos)
+                )
+            return len(capturadas)
+
+        poucos = [self._aluno(f'p{i}@test.com') for i in range(2)]
+        muitos = [self._aluno(f'm{i}@test.com') for i in range(60)]
+
+        self.assertEqual(consultas(muitos), consultas(poucos))
+
+    def test_matricula_concorrente_antes_do_insert(self) -> None:
+        ana = self._aluno('ana@test.com')
+        bruno = self._aluno('bruno@test.com')
+        consultar = importacao._ja_matriculados
+
+        def com_importacao_concorrente(turma, alunos):
+            matriculados = consultar(turma, alunos)
+            # Outra importação matricula o Bruno logo após a consulta
+            Matricula.objects.get_or_create(turma=turma, aluno=bruno)
+            return matriculados
+
+        with mock.patch.object(
+            importacao, '_ja_matriculados', com_importacao_concorrente
+        ):
+            response = self._enviar(f'aluno_id\n{ana.id}\n{bruno.id}\n')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [response.data[chave] for chave in ('matriculados', 'existentes', 'erros')],
+            [1, 1, 0],
+        )
+        self.assertEqual(
+            [(r['aluno'], r['status']) for r in response.data['resultados']],
+            [(ana.id, 201), (bruno.id, 200)],
+        )
+        self.assertEqual(Matricula.objects.filter(turma=self.turma).count(), 2)
+
+    def test_aluno_passa_a_ver_a_turma(self) -> None:
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get(TURMAS_URL).data, [])
+
+        self.client.force_authenticate(self.admin)
+        self._enviar(f'aluno_id\n{self.aluno.id}\n')
+
+        self.client.force_authenticate(self.user)
+        self.assertEqual(
+            [t['id'] for t in self.client.get(TURMAS_URL).data], [self.turma.id]
+        )
+
+    def test_permissao_turma_e_arquivo(self) -> None:
+        self.assertEqual(
+            self._enviar('nome\nx\n').status_code, status.HTTP_400_BAD_REQUEST
+        )
+        self.assertEqual(
+            self._enviar('email,aluno_id\n').status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+        self.assertEqual(
+            self._enviar('aluno_id\n1\n', url='/api/turmas/999999/matriculas/')
+            .status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+        self.client.force_authenticate(self.user)
+        self.assertEqual(
+            self._enviar('aluno_id\n1\n').status_code, status.HTTP_403_FORBIDDEN
+        )
+
+    def test_matricula_unica_por_turma_e_aluno(self) -> None:
+        self._matricular(self.turma)
+
+        response = self.client.post(
+            '/api/matriculas/',
+            {'turma': self.turma.id, 'aluno_id': self.aluno.id},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        with self.assertRaises(IntegrityError):
+            self._matricular(self.turma)
+
+    def test_comando_grava_em_lotes_e_reporta_erros(self) -> None:
+        ana = self._aluno('ana@test.com')
+        self._aluno('bruno@test.com')
+        self._matricular(self.turma, ana)
+        descritor, caminho = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(descritor, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(
+                'email\nana@test.com\nbruno@test.com\nninguem@test.com\n'
+            )
+        self.addCleanup(os.remove, caminho)
+        saida, erros = StringIO(), StringIO()
+
+        call_command(
+            'matricular_alunos',
+            self.turma.id,
+            caminho,
+            lote=2,
+            stdout=saida,
+            stderr=erros,
+        )
+
+        self.assertIn(
+            '1 matricula(s) criada(s), 1 aluno(s) ja matriculado(s), '
+            '1 linha(s) com erro.',
+            saida.getvalue(),
+        )
+        self.assertIn('linha 4:', erros.getvalue())
+        self.assertEqual(Matricula.objects.filter(turma=self.turma).count(), 2)
@@ -1,17 +1,26 @@
 from django.shortcuts import render
-from rest_framework import viewsets
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
 from .models import Treinamento, Turma, Recurso, Matricula
 from .serializers import (
     TreinamentoSerializer, TurmaSerializer, 
     RecursoSerializer, MatriculaSerializer
 )
 from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.viewsets import ReadOnlyModelViewSet
+from django.db.models import Count, Q
 from django.utils import timezone
-from django.db.models import Q
 from usuarios.permissions import IsAluno
-from .serializers import PainelTurmaSerializer, RecursoSerializer 
-from usuarios.models import Aluno
+from .serializers import PainelSerializer, PainelTurmaSerializer, RecursoSerializer 
+from usuarios.matriculas import matriculas_do_usuario
+from .importacao import (
+    IMPORTACAO_MAXIMA,
+    CSVParser,
+    NDJSONParser,
+    matricular_alunos,
+)
 
 # Create your views here.
 class TreinamentoViewSet(viewsets.ModelViewSet):
@@ -22,6 +31,46 @@ class TurmaViewSet(viewsets.ModelViewSet):
     queryset = Turma.objects.all()
     serializer_class = TurmaSerializer
     permission_classes = [IsAdminUser]
+
+    @action(
+        detail=True,
+        methods=['post'],
+        url_path='matriculas',
+        parser_classes=[CSVParser, NDJSONParser],
+    )
+    def matriculas(self, request, pk=None):
+        """
+        Matricula na turma, em lote, os alunos de um CSV (`text/csv`) ou
+        NDJSON (`application/x-ndjson`) com `email` ou `aluno_id`. Arquivos
+        maiores que o limite devem ir pelo comando `matricular_alunos`.
+        """
+        turma = self.get_object()
+        registros = request.data
+        if not registros:
+            return Response(
+                {'detail': 'Arquivo sem registros.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(registros) > IMPORTACAO_MAXIMA:
+            return Response(
+                {
+                    'detail': f'O arquivo aceita no máximo {IMPORTACAO_MAXIMA} '
+                    'registros por requisição.'
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        matriculados, resultados = matricular_alunos(turma, registros)
+        existentes = sum(1 for r in resultados if r['status'] == 200)
+        return Response(
+            {
+                'matriculados': matriculados,
+                'existentes': existentes,
+                'erros': len(resultados) - matriculados - existentes,
+                'resultados': resultados,
+            }
+        )
+
 class RecursoViewSet(viewsets.ModelViewSet):
     queryset = Recurso.objects.all()
     serializer_class = RecursoSerializer
@@ -33,27 +82,66 @@ class MatriculaViewSet(viewsets.ModelViewSet):
 class MinhasTurmasViewSet(ReadOnlyModelViewSet):
     serializer_class = PainelTurmaSerializer
     permission_classes = [IsAluno]
+    # O painel do frontend espera a lista inteira
+    pagination_class = None
 
     def get_queryset(self):
-        aluno = Aluno.objects.get(user=self.request.user)
-        
-        turmas_ids = Matricula.objects.filter(aluno=aluno).values_list('turma_id', flat=True)
-        return Turma.objects.filter(id__in=turmas_ids)
+        # Turmas do cache de matrículas, já preenchido pelo IsAluno
+        turmas_ids = matriculas_do_usuario(self.request.user).turmas
+        if not turmas_ids:
+            return Turma.objects.none()
+        return Turma.objects.filter(id__in=turmas_ids).select_related('treinamento')
 
 
 class MeusRecursosViewSet(ReadOnlyModelViewSet):
     serializer_class = RecursoSerializer
     permission_classes = [IsAluno]
-    filterset_fields = ['turma'] 
+    pagination_class = None
 
     def get_queryset(self):
         hoje = timezone.now().date()
-        aluno = Aluno.objects.get(user=self.request.user)
-        
-        turmas_ids = Matricula.objects.filter(aluno=aluno).values_list('turma_id', flat=True)
+        turmas_ids = matriculas_do_usuario(self.request.user).turmas
+        # ?turma=<id> restringe a uma das turmas do aluno
+        turma = self.request.query_params.get('turma')
+        if turma is not None:
+            turmas_ids = turmas_ids & {int(turma)} if turma.isdecimal() else set()
+        if not turmas_ids:
+            return Recurso.objects.none()
+
+        return Recurso.objects.visiveis(turmas_ids, hoje)
 
-        base_query = Q(turma_id__in=turmas_ids) & Q(draft=False)
-        antes_inicio = Q(turma__data_inicio__gt=hoje) & Q(acesso_previo=True)
-        apos_inicio = Q(turma__data_inicio__lte=hoje)
 
-        return Recurso.objects.filter(base_query & (antes_inicio | apos_inicio))
\ No newline at end of file
+class PainelView(APIView):
+    """
+    Resumo do painel do aluno: turmas com o treinamento, o total de
+    recursos visíveis de cada uma e a próxima data de início. Uma consulta,
+    qualquer que seja o número de turmas.
+    """
+
+    permission_classes = [IsAluno]
+
+    def get(self, request):
+        hoje = timezone.now().date()
+        turmas_ids = matriculas_do_usuario(request.user).turmas
+        turmas = []
+        if turmas_ids:
+            turmas = list(
+                Turma.objects.filter(id__in=turmas_ids)
+                .select_related('treinamento')
+                .annotate(
+                    recursos_visiveis=Count(
+                        'recurso',
+                        filter=Q(recurso__visivel_a_partir_de__lte=hoje),
+                    )
+                )
+                .order_by('data_inicio', 'id')
+            )
+        proximo_inicio = next(
+            (turma.data_inicio for turma in turmas if turma.data_inicio >= hoje),
+            None,
+        )
+        return Response(
+            PainelSerializer(
+                {'turmas': turmas, 'proximo_inicio': proximo_inicio}
+            ).data
+        )
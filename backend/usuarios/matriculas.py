@@ -0,0 +1,102 @@
+"""
+Cache por processo das matrículas de cada usuário: o id do aluno e o
+conjunto de turmas em que está matriculado, além da versão do papel
+(`VersaoPapel`). O `IsAluno` e as views do painel leem daqui, então uma
+requisição com o cache quente não consulta `usuarios_aluno` nem
+`treinamentos_matricula`.
+
+Entradas expiram em `PAINEL_CACHE_MATRICULAS_SEGUNDOS` (padrão 60).
+Alterações em `Aluno` e `Matricula` invalidam o cache do processo que fez a
+alteração; os demais percebem em até um TTL.
+"""
+
+import time
+from typing import FrozenSet, NamedTuple
+
+from django.conf import settings
+from django.contrib.auth.models import User
+
+CACHE_MATRICULAS_PADRAO_SEGUNDOS = 60
+CACHE_MATRICULAS_MAXIMO = 10000
+
+
+class Matriculas(NamedTuple):
+    aluno_id: int
+    turmas: FrozenSet[int]
+
+
+# usuario_id -> (versao do papel, Matriculas ou None, expira_em); por processo
+_cache_matriculas = {}
+# aluno_id -> usuario_id, para invalidar a partir de uma Matricula
+_usuario_do_aluno = {}
+
+
+def limpar_cache_matriculas(usuario_id=None):
+    if usuario_id is None:
+        _cache_matriculas.clear()
+        _usuario_do_aluno.clear()
+    else:
+        entrada = _cache_matriculas.pop(usuario_id, None)
+        if entrada is not None and entrada[1] is not None:
+            _usuario_do_aluno.pop(entrada[1].aluno_id, None)
+
+
+def limpar_cache_do_aluno(aluno_id):
+    usuario_id = _usuario_do_aluno.get(aluno_id)
+    if usuario_id is not None:
+        limpar_cache_matriculas(usuario_id)
+
+
+def _ttl():
+    return getattr(
+        settings,
+        'PAINEL_CACHE_MATRICULAS_SEGUNDOS',
+        CACHE_MATRICULAS_PADRAO_SEGUNDOS,
+    )
+
+
+def _consultar(usuario_id):
+    # Uma consulta: versão do papel e aluno com as matrículas, em LEFT JOINs
+    # (nulos quando não há); aluno nulo, o usuário não é aluno
+    linhas = list(
+        User.objects.filter(pk=usuario_id).values_list(
+            'versao_papel__versao', 'aluno__id', 'aluno__matricula__turma_id'
+        )
+    )
+    if not linhas:
+        return 0, None
+    versao, aluno_id, _ = linhas[0]
+    if aluno_id is None:
+        return versao or 0, None
+    return versao or 0, Matriculas(
+        aluno_id,
+        frozenset(turma_id for _, _, turma_id in linhas if turma_id is not None),
+    )
+
+
+def _entrada(usuario_id):
+    entrada = _cache_matriculas.get(usuario_id)
+    if entrada is not None and entrada[2] >= time.monotonic():
+        return entrada
+
+    versao, matriculas = _consultar(usuario_id)
+    if len(_cache_matriculas) >= CACHE_MATRICULAS_MAXIMO:
+        limpar_cache_matriculas()
+    entrada = (versao, matriculas, time.monotonic() + _ttl())
+    _cache_matriculas[usuario_id] = entrada
+    if matriculas is not None:
+        _usuario_do_aluno[matriculas.aluno_id] = usuario_id
+    return entrada
+
+
+def matriculas_do_usuario(usuario):
+    """
+    `Matriculas` do usuário, ou None se ele não for aluno (também guardado
+    em cache). Só o id do usuário é usado: funciona com o User montado a
+    partir do token.
+    """
+    return _entrada(usuario.pk)[1]
+
+
+def versao_do_papel(usuario):
+    return _entrada(usuario.pk)[0]
@@ -8,6 +8,26 @@ class Aluno (models.Model):
     telefone = models.CharField(max_length=20)
     def __str__(self):
         return f"{self.user.username} - {self.user.email}" 
-    
 
-    
\ No newline at end of file
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Usuário como estava no banco: trocar o dono muda o papel de dois
+        instance._user_salvo = instance.__dict__.get('user_id')
+        return instance
+
+
+class VersaoPapel(models.Model):
+    """
+    Versão do papel do usuário (aluno ou não), gravada no token no login.
+    Incrementada quando o usuário ganha ou perde o papel: tokens com a
+    versão anterior deixam de valer no painel.
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='versao_papel',
+    )
+    versao = models.PositiveIntegerField(default=0)
@@ -0,0 +1,48 @@
+"""
+Papel do usuário nos claims do token. O login grava `papel`, `aluno_id` e
+`papel_versao`; o `IsAluno` confia nos claims e só compara a versão com a
+do cache de matrículas, sem consulta com o cache quente. Ganhar ou perder
+o papel incrementa a `VersaoPapel`, e o token antigo passa a exigir novo
+login no painel.
+"""
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .matriculas import limpar_cache_matriculas
+from .models import VersaoPapel
+
+PAPEL_ALUNO = 'aluno'
+
+CLAIM_PAPEL = 'papel'
+CLAIM_ALUNO_ID = 'aluno_id'
+CLAIM_VERSAO = 'papel_versao'
+
+
+async def aclaims_de_papel(user):
+    """Claims de papel do usuário, em uma consulta."""
+    aluno_id, versao = await User.objects.filter(pk=user.pk).values_list(
+        'aluno__id', 'versao_papel__versao'
+    ).aget()
+    return {
+        CLAIM_PAPEL: PAPEL_ALUNO if aluno_id is not None else None,
+        CLAIM_ALUNO_ID: aluno_id,
+        CLAIM_VERSAO: versao or 0,
+    }
+
+
+def incrementar_versao_papel(usuario_id):
+    atualizados = VersaoPapel.objects.filter(user_id=usuario_id).update(
+        versao=F('versao') + 1
+    )
+    if not atualizados:
+        try:
+            with transaction.atomic():
+                VersaoPapel.objects.create(user_id=usuario_id, versao=1)
+        except IntegrityError:
+            # Outra transação criou a linha entre o UPDATE e o INSERT
+            VersaoPapel.objects.filter(user_id=usuario_id).update(
+                versao=F('versao') + 1
+            )
+    limpar_cache_matriculas(usuario_id)
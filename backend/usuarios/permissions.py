@@ -1,10 +1,31 @@
-from rest_framework import permissions
-from .models import Aluno
+from rest_framework import exceptions, permissions
+
+from .matriculas import (
+    limpar_cache_matriculas,
+    matriculas_do_usuario,
+    versao_do_papel,
+)
+from .papeis import CLAIM_PAPEL, CLAIM_VERSAO, PAPEL_ALUNO
+
 
 class IsAluno(permissions.BasePermission):
     message = "Acesso permitido apenas para alunos."
 
     def has_permission(self, request, view):
-        return request.user and \
-               request.user.is_authenticated and \
-               Aluno.objects.filter(user=request.user).exists()
\ No newline at end of file
+        if not (request.user and request.user.is_authenticated):
+            return False
+
+        claims = getattr(request.auth, 'payload', None)
+        if claims is None or CLAIM_PAPEL not in claims:
+            # Sessão ou token sem os claims de papel: mesmo cache das views
+            return matriculas_do_usuario(request.user) is not None
+
+        if claims.get(CLAIM_VERSAO) != versao_do_papel(request.user):
+            # O cache deste processo pode estar atrás de um login recente
+            limpar_cache_matriculas(request.user.pk)
+            if claims.get(CLAIM_VERSAO) != versao_do_papel(request.user):
+                raise exceptions.AuthenticationFailed(
+                    "Papel do usuário alterado. Faça login novamente.",
+                    code='papel_alterado',
+                )
+        return claims[CLAIM_PAPEL] == PAPEL_ALUNO
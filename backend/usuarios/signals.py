@@ -0,0 +1,39 @@
+from django.contrib.auth.models import User
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .matriculas import limpar_cache_do_aluno, limpar_cache_matriculas
+from .models import Aluno
+from .papeis import incrementar_versao_papel
+
+
+def _exclusao_de_usuario(origin):
+    # Na cascata da exclusão do usuário não há token para invalidar, e gravar
+    # a versão dele violaria a FK no fim da transação
+    modelo = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(modelo, User)
+
+
+@receiver(post_save, sender=Aluno)
+@receiver(post_delete, sender=Aluno)
+def invalidar_matriculas_do_aluno(sender, instance, **kwargs):
+    # O aluno pode ter trocado de usuário: limpa o antigo e o atual
+    limpar_cache_do_aluno(instance.pk)
+    limpar_cache_matriculas(instance.user_id)
+
+
+@receiver(post_save, sender=Aluno)
+def versionar_aluno_salvo(sender, instance, created, **kwargs):
+    anterior = None if created else getattr(instance, '_user_salvo', None)
+    if anterior != instance.user_id:
+        incrementar_versao_papel(instance.user_id)
+        if anterior is not None:
+            incrementar_versao_papel(anterior)
+    instance._user_salvo = instance.user_id
+
+
+@receiver(post_delete, sender=Aluno)
+def versionar_aluno_removido(sender, instance, origin=None, **kwargs):
+    if not _exclusao_de_usuario(origin):
+        incrementar_versao_papel(instance.user_id)
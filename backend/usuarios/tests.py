@@ -1,3 +1,130 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+from stratasec.authentication import limpar_cache_ativo
+from usuarios.matriculas import limpar_cache_matriculas
+from usuarios.models import Aluno, VersaoPapel
+
+LOGIN_URL = '/api/auth/login/'
+PAINEL_URL = '/api/painel/turmas/'
+SENHA = 'Senha1234'
+
+
+class ClaimsDePapelTests(APITestCase):
+    def setUp(self) -> None:
+        limpar_cache_matriculas()
+        limpar_cache_ativo()
+        self.addCleanup(limpar_cache_matriculas)
+        self.user = User.objects.create_user(
+            username='aluno@test.com', email='aluno@test.com', password=SENHA
+        )
+        self.aluno = Aluno.objects.create(user=self.user, telefone='11999999999')
+
+    def _login(self, user=None):
+        user = user or self.user
+        response = self.client.post(
+            LOGIN_URL, {'email': user.email, 'password': SENHA}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def _painel(self, access):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        return self.client.get(PAINEL_URL)
+
+    def test_login_grava_papel_no_token(self) -> None:
+        visitante = User.objects.create_user(
+            username='visitante@test.com', email='visitante@test.com', password=SENHA
+        )
+
+        aluno = AccessToken(self._login()['access'])
+        outro = AccessToken(self._login(visitante)['access'])
+
+        self.assertEqual(aluno['papel'], 'aluno')
+        self.assertEqual(aluno['aluno_id'], self.aluno.id)
+        self.assertEqual(aluno['papel_versao'], 1)
+        self.assertIsNone(outro['papel'])
+        self.assertIsNone(outro['aluno_id'])
+        self.assertEqual(outro['papel_versao'], 0)
+
+    def test_painel_sem_consulta_de_papel_com_cache_quente(self) -> None:
+        access = self._login()['access']
+        self._painel(access)
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = self._painel(access)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(consultas), 0)
+
+    def test_papel_revogado_exige_novo_login(self) -> None:
+        tokens = self._login()
+        self.assertEqual(
+            self._painel(tokens['access']).status_code, status.HTTP_200_OK
+        )
+
+        self.aluno.delete()
+        response = self._painel(tokens['access'])
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.data['detail'].code, 'papel_alterado')
+
+        # O refresh copia os claims antigos: continua exigindo login
+        self.client.credentials()
+        refresh = self.client.post(
+            '/api/auth/token/refresh/', {'refresh': tokens['refresh']}, format='json'
+        )
+        self.assertEqual(
+            self._painel(refresh.data['access']).status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+
+        self.client.credentials()
+        self.assertEqual(
+            self._painel(self._login()['access']).status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+    def test_papel_concedido_apos_o_login(self) -> None:
+        visitante = User.objects.create_user(
+            username='novo@test.com', email='novo@test.com', password=SENHA
+        )
+        access = self._login(visitante)['access']
+        self.assertEqual(self._painel(access).status_code, status.HTTP_403_FORBIDDEN)
+
+        Aluno.objects.create(user=visitante, telefone='11888888888')
+
+        self.assertEqual(
+            self._painel(access).status_code, status.HTTP_401_UNAUTHORIZED
+        )
+        self.client.credentials()
+        self.assertEqual(
+            self._painel(self._login(visitante)['access']).status_code,
+            status.HTTP_200_OK,
+        )
+
+    def test_troca_de_usuario_do_aluno_versiona_os_dois(self) -> None:
+        outro = User.objects.create_user(username='outro@test.com')
+        aluno = Aluno.objects.get(pk=self.aluno.pk)
+
+        aluno.user = outro
+        aluno.save()
+        aluno.telefone = '11777777777'
+        aluno.save()
+
+        versoes = dict(VersaoPapel.objects.values_list('user_id', 'versao'))
+        self.assertEqual(versoes, {self.user.id: 2, outro.id: 1})
+
+    def test_token_sem_claims_de_papel_consulta_o_cache(self) -> None:
+        access = AccessToken.for_user(self.user)
+
+        self.assertEqual(self._painel(access).status_code, status.HTTP_200_OK)
+
+    def test_exclusao_do_usuario_aluno(self) -> None:
+        self.user.delete()
+
+        self.assertFalse(VersaoPapel.objects.exists())
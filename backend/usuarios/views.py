@@ -1,5 +1,6 @@
 from django.shortcuts import render
 from rest_framework import viewsets
+from rest_framework.permissions import IsAdminUser
 from .models import Aluno
 from .serializers import AlunoSerializer
 
@@ -7,4 +8,4 @@ from .serializers import AlunoSerializer
 class AlunoViewSet(viewsets.ModelViewSet):
     queryset = Aluno.objects.all()
     serializer_class = AlunoSerializer
-    # permission_classes = [IsAdminUser] # Adicione segurança aqui
\ No newline at end of file
+    permission_classes = [IsAdminUser]
@@ -25,6 +25,12 @@ interface Comentario {
   criado_em: string;
 }
 
+interface ComentarioListResponse {
+  next: string | null;
+  previous: string | null;
+  results: Comentario[];
+}
+
 @Component({
   selector: 'app-task-detail',
   standalone: true,
@@ -47,6 +53,7 @@ export class TaskDetailComponent implements OnInit {
   saving = false;
 
   comentarios: Comentario[] = [];
+  comentariosNext: string | null = null;
   loadingComentarios = false;
   addingComentario = false;
   comentarioTexto = '';
@@ -151,9 +158,23 @@ export class TaskDetailComponent implements OnInit {
   }
 
   carregarComentarios(tarefaId: number | string): void {
+    // O `next` devolvido pela API já preserva o page_size
+    this.buscarComentarios(
+      `${this.apiUrl}/tarefas/${tarefaId}/comentarios/?page_size=50`,
+      false,
+    );
+  }
+
+  carregarMaisComentarios(): void {
+    if (this.comentariosNext && !this.loadingComentarios) {
+      this.buscarComentarios(this.comentariosNext, true);
+    }
+  }
+
+  private buscarComentarios(url: string, anexar: boolean): void {
     this.loadingComentarios = true;
     this.http
-      .get<Comentario[]>(`${this.apiUrl}/tarefas/${tarefaId}/comentarios/`)
+      .get<ComentarioListResponse>(url)
       .pipe(
         finalize(() => {
           this.loadingComentarios = false;
@@ -161,8 +182,11 @@ export class TaskDetailComponent implements OnInit {
         }),
       )
       .subscribe({
-        next: (comentarios) => {
-          this.comentarios = comentarios;
+        next: (res) => {
+          this.comentarios = anexar
+            ? [...this.comentarios, ...res.results]
+            : res.results;
+          this.comentariosNext = res.next;
         },
         error: (err) => {
           console.error('Erro ao carregar comentarios', err);